@@ -0,0 +1,58 @@
+"""Startup cost of the analytics frame: books.json vs the binary catalog.
+
+Generates a catalog with book_generator_service_V2, exports it with
+json_to_binary and times building a BookFrame each way, plus one
+average_price call and one book lookup on top of it.
+
+    python -m benchmarks.binary_catalog_benchmark --count 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+from src.repositories.binary_catalog import BinaryCatalog, json_to_binary
+from src.repositories.book_repository import BookRepository
+from src.services.book_analytics_service import BookAnalyticsService
+from src.services.book_frame import BookFrame
+from src.services.book_generator_service_V2 import generate_books_json
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    analytics = BookAnalyticsService()
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "books.json")
+        bin_path = os.path.join(tmp, "books.bin")
+        generate_books_json(json_path, count=args.count, seed=args.seed)
+        _, export = timed(lambda: json_to_binary(json_path, bin_path))
+        print(f"{args.count} books; json {os.path.getsize(json_path) / 1e6:.1f} MB, "
+              f"binary {os.path.getsize(bin_path) / 1e6:.1f} MB, export {export:.3f}s")
+
+        frame, load = timed(lambda: BookFrame.from_books(BookRepository(json_path).get_all_books()))
+        _, avg = timed(lambda: analytics.average_price(frame))
+        _, lookup = timed(lambda: frame.book_at(args.count // 2))
+        print(f"{'json':<8} frame {load:.3f}s  average_price {avg:.4f}s  book_at {lookup * 1e6:.0f}us")
+
+        catalog = BinaryCatalog(bin_path)
+        frame, load = timed(lambda: BookFrame.from_binary_catalog(catalog))
+        _, avg = timed(lambda: analytics.average_price(frame))
+        _, lookup = timed(lambda: frame.book_at(args.count // 2))
+        book_id = frame.book_ids[args.count // 3]
+        _, by_id = timed(lambda: catalog.get_book_by_id(book_id))
+        print(f"{'binary':<8} frame {load:.3f}s  average_price {avg:.4f}s  book_at {lookup * 1e6:.0f}us"
+              f"  get_book_by_id {by_id * 1e6:.0f}us")
+        del frame
+
+
+if __name__ == "__main__":
+    main()
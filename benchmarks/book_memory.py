@@ -0,0 +1,63 @@
+"""Bytes per book for the in-memory Book representations.
+
+Generates a catalog with book_generator_service_V2, then loads it once per
+representation under tracemalloc and reports the retained bytes per book
+(parsed strings included, the JSON text itself excluded).
+
+    python -m benchmarks.book_memory --count 100000
+"""
+import argparse
+import dataclasses
+import gc
+import json
+import os
+import tempfile
+import tracemalloc
+from src.domain.book import Book
+from src.domain.compact_book import CompactBook
+from src.services.book_generator_service_V2 import generate_books_json
+
+# what Book looked like before: a plain dataclass with a per-instance
+# __dict__ and no interning
+LegacyBook = dataclasses.make_dataclass(
+    "LegacyBook", [(f.name, object, None) for f in dataclasses.fields(Book)]
+)
+
+
+def measure(text: str, build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    objects = build(json.loads(text))
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "books.json")
+        generate_books_json(path, count=args.count, seed=args.seed)
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+
+    representations = {
+        "dict (json.load)": lambda data: data,
+        "LegacyBook (@dataclass)": lambda data: [LegacyBook(**d) for d in data],
+        "Book (slots, interned)": lambda data: [Book.from_dict(d) for d in data],
+        "CompactBook (16-byte id)": lambda data: [CompactBook.from_dict(d) for d in data],
+    }
+    print(f"{args.count} books")
+    for name, build in representations.items():
+        total = measure(text, build)
+        print(f"{name:<28} {total / args.count:8.0f} bytes/book")
+
+
+if __name__ == "__main__":
+    main()
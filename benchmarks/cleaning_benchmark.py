@@ -0,0 +1,60 @@
+"""Throughput of BookCleaningService.clean_file on a large dirty catalog.
+
+Builds the file by repeating records from book_generator_bad_data_service
+(with fresh book ids) and times one streamed clean of it.
+
+    python -m benchmarks.cleaning_benchmark --count 1000000
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import uuid
+from src.services import book_generator_bad_data_service
+from src.services.book_cleaning_service import BookCleaningService
+
+
+def write_dirty_file(path: str, count: int, seed: int) -> None:
+    random.seed(seed)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        # generate_books always writes books_dirty.json in the cwd
+        os.chdir(tmp)
+        try:
+            book_generator_bad_data_service.generate_books()
+            with open("books_dirty.json", "r", encoding="utf-8") as f:
+                sample = json.load(f)
+        finally:
+            os.chdir(cwd)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for i in range(count):
+            record = dict(sample[i % len(sample)], book_id=str(uuid.UUID(int=random.getrandbits(128))))
+            f.write(("," if i else "") + json.dumps(record))
+        f.write("]")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "books_dirty.json")
+        dest = os.path.join(tmp, "books_clean.json")
+        write_dirty_file(src, args.count, args.seed)
+
+        start = time.perf_counter()
+        report = BookCleaningService().clean_file(src, dest, args.chunk_size)
+        elapsed = time.perf_counter() - start
+
+    print(report.summary())
+    print(f"cleaned {args.count} records in {elapsed:.2f}s ({args.count / elapsed:,.0f} records/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Encode/decode time and file size for the repository JSON codecs.
+
+Generates a catalog with book_generator_service_V2, decodes it once into
+Book objects and then, per codec, times encode_books/decode_books
+(best of --repeat runs) on the encoded bytes.
+
+    python -m benchmarks.codec_benchmark --count 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+from src.domain.book import Book
+from src.repositories import codecs
+from src.repositories.codecs import CODECS, JsonCodec
+from src.services.book_generator_service_V2 import generate_books_json
+
+
+def best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "books.json")
+        generate_books_json(path, count=args.count, seed=args.seed)
+        with open(path, "rb") as f:
+            raw = f.read()
+
+    books = JsonCodec().decode_books(raw, Book)
+    print(f"{args.count} books; orjson={'yes' if codecs.orjson else 'no'}, "
+          f"msgspec={'yes' if codecs.msgspec else 'no'}")
+    print(f"{'codec':<10} {'size MB':>8} {'encode s':>9} {'decode s':>9}")
+    for name, codec_cls in CODECS.items():
+        codec = codec_cls()
+        data = codec.encode_books(books)
+        encode = best_of(args.repeat, lambda: codec.encode_books(books))
+        decode = best_of(args.repeat, lambda: codec.decode_books(data, Book))
+        print(f"{name:<10} {len(data) / 1e6:8.1f} {encode:9.3f} {decode:9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Records per second of BookIngestService for 1, 2, 4 and 8 workers.
+
+Builds a dirty dump with cleaning_benchmark.write_dirty_file (converted
+to JSONL with --format jsonl) and ingests it into a fresh books.json for
+each worker count. Scaling is bounded by os.cpu_count().
+
+    python -m benchmarks.ingest_benchmark --count 1000000
+"""
+import argparse
+import json
+import os
+import tempfile
+from benchmarks.cleaning_benchmark import write_dirty_file
+from src.repositories.cached_book_repository import CachedBookRepository
+from src.repositories.codecs import FastJsonCodec
+from src.services.book_ingest_service import BookIngestService
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--format", choices=["json", "jsonl"], default="jsonl")
+    parser.add_argument("--chunk-size", type=int, default=4 * 1024 * 1024)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "dump.json")
+        write_dirty_file(src, args.count, args.seed)
+        if args.format == "jsonl":
+            with open(src, "r", encoding="utf-8") as f:
+                records = json.load(f)
+            src = os.path.join(tmp, "dump.jsonl")
+            with open(src, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(r) + "\n" for r in records)
+            del records
+
+        print(f"{args.count} records ({args.format}), {os.cpu_count()} CPUs")
+        for workers in args.workers:
+            dest = os.path.join(tmp, f"books_{workers}.json")
+            repo = CachedBookRepository(dest, codec=FastJsonCodec())
+            report = BookIngestService(repo, workers, args.chunk_size).ingest_file(src)
+            print(
+                f"  {workers} workers: {report.seconds:.2f}s "
+                f"({report.records_per_second:,.0f} records/s, {report.books_added} added)"
+            )
+            os.remove(dest)
+
+
+if __name__ == "__main__":
+    main()
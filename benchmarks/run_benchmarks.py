@@ -0,0 +1,403 @@
+"""Repository, checkout, history and analytics hot paths at several catalog sizes.
+
+Fixtures come from book_generator_service_V2 (books) and the checkout
+history generator. Every case reports its best wall time over --repeat
+runs plus the tracemalloc peak of one extra run. Results are saved as
+JSON. --compare flags cases that got slower or hungrier than in an
+earlier results file and exits non-zero if any did.
+
+    python -m benchmarks.run_benchmarks --sizes 10000 100000
+    python -m benchmarks.run_benchmarks --compare benchmark_results.json --output new.json
+"""
+import argparse
+import copy
+import datetime
+import gc
+import inspect
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable
+from src.repositories.book_repository import BookRepository
+from src.repositories.cached_book_repository import CachedBookRepository
+from src.repositories.checkout_history_repository import CheckoutHistoryRepository
+from src.repositories.codecs import FastJsonCodec
+from src.repositories.indexed_checkout_history_repository import IndexedCheckoutHistoryRepository
+from src.repositories.jsonl_checkout_history_repository import JsonlCheckoutHistoryRepository, convert_json_history
+from src.repositories.logged_book_repository import LoggedBookRepository
+from src.services.book_analytics_service import BookAnalyticsService
+from src.services.book_frame import BookFrame
+from src.services.book_generator_service_V2 import generate_books_json
+from src.services.checkout_history_generator_service import generate_checkout_history
+from src.services.checkout_service import CheckoutService
+
+LOOKUPS = 1000
+BATCH = 100
+
+
+class Fixture:
+    """One generated catalog plus its checkout history, in a temp directory."""
+
+    def __init__(self, root: str, count: int, seed: int, history_days: int):
+        self.count = count
+        self._set_root(root)
+
+        generate_books_json(self.books_path, count, seed)
+        repo = CachedBookRepository(self.books_path, codec=FastJsonCodec())
+        self.events = generate_checkout_history(
+            repo, CheckoutHistoryRepository(self.history_json_path), days=history_days, seed=seed, chunk_size=None
+        )
+        convert_json_history(self.history_json_path, self.history_jsonl_path)
+
+        books = repo.get_all_books()
+        sample = random.Random(seed).sample(books, min(LOOKUPS, count))
+        self.sample_ids = [b.book_id for b in sample]
+        self.sample_titles = [b.title for b in sample]
+        self.frame = BookFrame.from_books(books)
+
+    def _set_root(self, root: str) -> None:
+        self.root = root
+        self.books_path = os.path.join(root, "books.json")
+        self.history_json_path = os.path.join(root, "checkout_history.json")
+        self.history_jsonl_path = os.path.join(root, "checkout_history.jsonl")
+
+    def copy_to(self, root: str) -> 'Fixture':
+        """The same fixture backed by fresh copies of its files under root,
+        so a writing case leaves the shared files untouched."""
+        fx = copy.copy(self)
+        fx._set_root(root)
+        for src, dest in [
+            (self.books_path, fx.books_path),
+            (self.history_json_path, fx.history_json_path),
+            (self.history_jsonl_path, fx.history_jsonl_path),
+        ]:
+            shutil.copyfile(src, dest)
+        return fx
+
+    def cached_repo(self) -> CachedBookRepository:
+        repo = CachedBookRepository(self.books_path, codec=FastJsonCodec())
+        repo.get_book_by_id(self.sample_ids[0])  # load outside the timing
+        return repo
+
+    def available_ids(self, repo, n: int) -> list[str]:
+        ids = []
+        for book_id in self.sample_ids:
+            if repo.get_book_by_id(book_id).available:
+                ids.append(book_id)
+                if len(ids) == n:
+                    break
+        return ids
+
+
+@dataclass
+class Case:
+    name: str
+    # builds the state a run needs (untimed) and returns the timed call
+    prepare: Callable[[Fixture], Callable[[], object]]
+    ops: int = 1
+    # writes to the fixture files, so every run gets its own copy of them
+    writes: bool = False
+
+
+CASES: list[Case] = []
+
+
+def case(name: str, ops: int = 1, writes: bool = False):
+    def register(prepare):
+        CASES.append(Case(name, prepare, ops, writes))
+        return prepare
+    return register
+
+
+# -- book repositories ------------------------------------------------------
+
+@case("repo.load")
+def _(fx):
+    return BookRepository(fx.books_path).get_all_books
+
+@case("repo.load[fast codec]")
+def _(fx):
+    return BookRepository(fx.books_path, codec=FastJsonCodec()).get_all_books
+
+@case("repo.get_book_by_id[scan]")
+def _(fx):
+    repo = BookRepository(fx.books_path, codec=FastJsonCodec())
+    return lambda: repo.get_book_by_id(fx.sample_ids[-1])
+
+@case("repo.update_book", writes=True)
+def _(fx):
+    repo = BookRepository(fx.books_path, codec=FastJsonCodec())
+    book = CachedBookRepository(fx.books_path).get_book_by_id(fx.sample_ids[0])
+    book.price_usd = 9.99
+    return lambda: repo.update_book(book)
+
+@case("cached.load")
+def _(fx):
+    return CachedBookRepository(fx.books_path, codec=FastJsonCodec()).get_all_books
+
+@case("cached.get_book_by_id", ops=LOOKUPS)
+def _(fx):
+    repo = fx.cached_repo()
+    return lambda: [repo.get_book_by_id(i) for i in fx.sample_ids]
+
+@case("cached.find_book_by_name", ops=LOOKUPS)
+def _(fx):
+    repo = fx.cached_repo()
+    return lambda: [repo.find_book_by_name(t) for t in fx.sample_titles]
+
+@case("cached.update_books", ops=BATCH, writes=True)
+def _(fx):
+    repo = fx.cached_repo()
+    books = [repo.get_book_by_id(i) for i in fx.sample_ids[:BATCH]]
+    for b in books:
+        b.price_usd = 9.99
+    return lambda: repo.update_books(books)
+
+@case("logged.update_book", writes=True)
+def _(fx):
+    repo = LoggedBookRepository(fx.books_path, fsync=False, codec=FastJsonCodec())
+    book = repo.get_book_by_id(fx.sample_ids[0])
+    book.price_usd = 9.99
+    return lambda: repo.update_book(book)
+
+
+# -- checkout ---------------------------------------------------------------
+
+def _checkout_service(fx, book_repo):
+    history = IndexedCheckoutHistoryRepository(fx.history_jsonl_path)
+    history.get_history_for_book(fx.sample_ids[0])  # build the index untimed
+    return CheckoutService(book_repo, history)
+
+@case("checkout.out_and_in[cached]", writes=True)
+def _(fx):
+    svc = _checkout_service(fx, fx.cached_repo())
+    (book_id,) = fx.available_ids(svc.book_repo, 1)
+    return lambda: (svc.check_out(book_id), svc.check_in(book_id))
+
+@case("checkout.out_and_in[logged]", writes=True)
+def _(fx):
+    repo = LoggedBookRepository(fx.books_path, fsync=False, codec=FastJsonCodec())
+    svc = _checkout_service(fx, repo)
+    (book_id,) = fx.available_ids(repo, 1)
+    return lambda: (svc.check_out(book_id), svc.check_in(book_id))
+
+@case("checkout.out_and_in_many[cached]", ops=BATCH, writes=True)
+def _(fx):
+    svc = _checkout_service(fx, fx.cached_repo())
+    ids = fx.available_ids(svc.book_repo, BATCH)
+    return lambda: (svc.check_out_many(ids), svc.check_in_many(ids))
+
+
+# -- checkout history -------------------------------------------------------
+
+@case("history.json.get_history_all")
+def _(fx):
+    return CheckoutHistoryRepository(fx.history_json_path).get_history_all
+
+@case("history.json.get_history_for_book")
+def _(fx):
+    repo = CheckoutHistoryRepository(fx.history_json_path)
+    return lambda: repo.get_history_for_book(fx.sample_ids[0])
+
+@case("history.jsonl.get_history_all")
+def _(fx):
+    return JsonlCheckoutHistoryRepository(fx.history_jsonl_path).get_history_all
+
+@case("history.indexed.get_history_for_book", ops=LOOKUPS)
+def _(fx):
+    repo = IndexedCheckoutHistoryRepository(fx.history_jsonl_path)
+    repo.get_history_for_book(fx.sample_ids[0])
+    return lambda: [repo.get_history_for_book(i) for i in fx.sample_ids]
+
+
+# -- analytics --------------------------------------------------------------
+
+@case("frame.from_books")
+def _(fx):
+    books = BookRepository(fx.books_path, codec=FastJsonCodec()).get_all_books()
+    return lambda: BookFrame.from_books(books)
+
+ANALYTICS_ARGS = {
+    "average_price": {},
+    "top_rated": {"min_ratings": 1000, "limit": 10},
+    "value_scores": {},
+    "top_value_scores": {"limit": 10},
+    "top_rated_with_pandas": {"min_ratings": 1000, "limit": 10},
+    "value_scores_with_pandas": {"limit": 10},
+    "median_price_by_genre": {},
+    "median_genre_current_year": {},
+    "genre_counts": {},
+    "mean_rating_by_genre": {},
+    "median_ratings_count_by_genre": {},
+    "grouped_stats": {"keys": ["genre", "format"], "field": "price_usd", "aggs": ["mean", "max"]},
+}
+
+
+def _analytics_case(method: str, kwargs: dict):
+    def prepare(fx):
+        fn = getattr(BookAnalyticsService(), method)
+        return lambda: fn(fx.frame, **kwargs)
+    return prepare
+
+
+for _method, _kwargs in ANALYTICS_ARGS.items():
+    CASES.append(Case(f"analytics.{_method}", _analytics_case(_method, _kwargs)))
+
+
+def check_analytics_coverage() -> None:
+    public = {
+        name for name, _ in inspect.getmembers(BookAnalyticsService, inspect.isfunction)
+        if not name.startswith("_")
+    }
+    missing = public - ANALYTICS_ARGS.keys()
+    if missing:
+        raise SystemExit(f"no benchmark for BookAnalyticsService.{', '.join(sorted(missing))}; add it to ANALYTICS_ARGS")
+
+
+# -- runner -----------------------------------------------------------------
+
+def _run_once(c: Case, fx: Fixture, measure: Callable[[Callable[[], object]], object]):
+    if not c.writes:
+        return measure(c.prepare(fx))
+    # results must not depend on which cases ran before, so writers get
+    # pristine files (and no .log/.idx left behind by another case)
+    with tempfile.TemporaryDirectory(dir=fx.root) as scratch:
+        return measure(c.prepare(fx.copy_to(scratch)))
+
+
+def _timed(fn: Callable[[], object]) -> float:
+    gc.collect()
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def _peak_bytes(fn: Callable[[], object]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def run_case(c: Case, fx: Fixture, repeat: int, memory: bool) -> dict:
+    times = [_run_once(c, fx, _timed) for _ in range(repeat)]
+    result = {"name": c.name, "size": fx.count, "ops": c.ops, "seconds": min(times), "mean_seconds": sum(times) / len(times)}
+    if memory:
+        # separate run: tracemalloc slows allocation-heavy code down
+        result["peak_bytes"] = _run_once(c, fx, _peak_bytes)
+    return result
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def _fmt_seconds(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f}s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.1f}ms"
+    return f"{seconds * 1e6:.0f}us"
+
+
+def _fmt_bytes(n) -> str:
+    return "-" if n is None else f"{n / 2 ** 20:.1f}MB"
+
+
+def compare(baseline: dict, current: dict, threshold: float, min_seconds: float) -> list[str]:
+    """Print both runs side by side; return the cases that regressed."""
+    before = {(r["name"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+    print(f"\n{'case':<42} {'size':>8} {'before':>9} {'after':>9} {'ratio':>6} {'mem ratio':>9}")
+    for r in current["results"]:
+        old = before.get((r["name"], r["size"]))
+        if old is None:
+            continue
+        ratio = r["seconds"] / old["seconds"] if old["seconds"] else float("inf")
+        mem_ratio = None
+        if r.get("peak_bytes") and old.get("peak_bytes"):
+            mem_ratio = r["peak_bytes"] / old["peak_bytes"]
+        slower = ratio > threshold and r["seconds"] - old["seconds"] > min_seconds
+        hungrier = mem_ratio is not None and mem_ratio > threshold and r["peak_bytes"] - old["peak_bytes"] > 2 ** 20
+        flag = "  REGRESSION" if slower or hungrier else ""
+        if flag:
+            regressions.append(f"{r['name']} @ {r['size']}")
+        mem = "-" if mem_ratio is None else f"{mem_ratio:.2f}"
+        print(f"{r['name']:<42} {r['size']:>8} {_fmt_seconds(old['seconds']):>9} "
+              f"{_fmt_seconds(r['seconds']):>9} {ratio:>6.2f} {mem:>9}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--history-days", type=int, default=90)
+    parser.add_argument("--only", help="run only cases whose name contains this")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", metavar="BASELINE", help="results file from an earlier run")
+    parser.add_argument("--threshold", type=float, default=1.2, help="ratio that counts as a regression")
+    parser.add_argument("--min-seconds", type=float, default=0.005,
+                        help="ignore slowdowns smaller than this (timer noise)")
+    args = parser.parse_args()
+
+    check_analytics_coverage()
+    cases = [c for c in CASES if not args.only or args.only in c.name]
+    results = []
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            start = time.perf_counter()
+            fx = Fixture(tmp, size, args.seed, args.history_days)
+            print(f"\n{size} books, {fx.events} checkout events (fixtures built in {time.perf_counter() - start:.1f}s)")
+            print(f"{'case':<42} {'best':>9} {'per op':>9} {'peak':>9}")
+            for c in cases:
+                r = run_case(c, fx, args.repeat, not args.no_memory)
+                results.append(r)
+                print(f"{c.name:<42} {_fmt_seconds(r['seconds']):>9} "
+                      f"{_fmt_seconds(r['seconds'] / r['ops']):>9} {_fmt_bytes(r.get('peak_bytes')):>9}")
+
+    current = {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "sizes": args.sizes,
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "history_days": args.history_days,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(current, f, indent=2)
+    print(f"\nSaved {len(results)} results to {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, current, args.threshold, args.min_seconds)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,3 @@
 from .book import Book
-from .checkout_history import CheckoutEvent
\ No newline at end of file
+from .checkout_history import CheckoutEvent
+from .compact_book import CompactBook
@@ -8,3 +8,32 @@ class CheckoutEvent:
     checkout_date: Optional[datetime] = None
     return_date: Optional[datetime] = None
     returned: bool = False
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'CheckoutEvent':
+        return cls(
+            book_id=data["book_id"],
+            checkout_date=(
+                datetime.fromisoformat(data["checkout_date"])
+                if data["checkout_date"]
+                else None
+            ),
+            return_date=(
+                datetime.fromisoformat(data["return_date"])
+                if data["return_date"]
+                else None
+            ),
+            returned=data["returned"],
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "book_id": self.book_id,
+            "checkout_date": (
+                self.checkout_date.isoformat() if self.checkout_date else None
+            ),
+            "return_date": (
+                self.return_date.isoformat() if self.return_date else None
+            ),
+            "returned": self.returned,
+        }
@@ -0,0 +1,117 @@
+import uuid
+from typing import Optional
+from src.domain.book import Book, intern_categoricals
+
+BOOK_FIELDS = [
+    "title",
+    "author",
+    "genre",
+    "publication_year",
+    "page_count",
+    "average_rating",
+    "ratings_count",
+    "price_usd",
+    "publisher",
+    "language",
+    "format",
+    "in_print",
+    "sales_millions",
+    "last_checkout",
+    "available",
+    "publisher_email",
+    "version",
+]
+
+
+class CompactBook:
+    """Drop-in, smaller-footprint alternative to Book.
+
+    Slotted like Book, but the id is stored as the 16 raw UUID bytes and
+    turned back into the usual 36-char string on access. Ids that are not
+    UUIDs are kept as given. Supports the same constructor, from_dict,
+    to_dict, check_out and check_in, so repositories can be configured to
+    hold CompactBook instead of Book (see BookRepository's book_cls).
+    """
+
+    __slots__ = BOOK_FIELDS + ["_id"]
+
+    def __init__(
+        self,
+        title: str,
+        author: str,
+        genre: Optional[str] = None,
+        publication_year: Optional[int] = None,
+        page_count: Optional[int] = None,
+        average_rating: Optional[float] = None,
+        ratings_count: Optional[int] = 0,
+        price_usd: Optional[float] = None,
+        publisher: Optional[str] = None,
+        language: Optional[str] = None,
+        format: Optional[str] = None,
+        in_print: Optional[bool] = None,
+        sales_millions: Optional[float] = None,
+        last_checkout: Optional[str] = None,
+        available: Optional[bool] = True,
+        publisher_email: Optional[str] = None,
+        book_id: Optional[str] = None,
+        version: int = 0,
+    ):
+        self.title = title
+        self.author = author
+        self.genre = genre
+        self.publication_year = publication_year
+        self.page_count = page_count
+        self.average_rating = average_rating
+        self.ratings_count = ratings_count
+        self.price_usd = price_usd
+        self.publisher = publisher
+        self.language = language
+        self.format = format
+        self.in_print = in_print
+        self.sales_millions = sales_millions
+        self.last_checkout = last_checkout
+        self.available = available
+        self.publisher_email = publisher_email
+        self.book_id = book_id or str(uuid.uuid4())
+        self.version = version
+
+    @property
+    def book_id(self) -> str:
+        if isinstance(self._id, bytes):
+            return str(uuid.UUID(bytes=self._id))
+        return self._id
+
+    @book_id.setter
+    def book_id(self, value: str) -> None:
+        try:
+            parsed = uuid.UUID(value)
+        except (ValueError, TypeError, AttributeError):
+            self._id = value
+            return
+        # only compact ids that round-trip to the same string
+        self._id = parsed.bytes if str(parsed) == value else value
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'CompactBook':
+        return cls(**intern_categoricals(data))
+
+    @classmethod
+    def from_book(cls, book: Book) -> 'CompactBook':
+        return cls.from_dict(book.to_dict())
+
+    def to_book(self) -> Book:
+        return Book.from_dict(self.to_dict())
+
+    check_out = Book.check_out
+    check_in = Book.check_in
+    to_dict = Book.to_dict
+    __str__ = Book.__str__
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CompactBook):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{k}={v!r}" for k, v in self.to_dict().items())
+        return f"CompactBook({fields})"
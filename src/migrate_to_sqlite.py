@@ -0,0 +1,49 @@
+import argparse
+import json
+from src.domain.book import Book
+from src.repositories.sqlite_book_repository import (
+    UPSERT_BOOK,
+    SqliteBookRepository,
+    book_to_row,
+)
+from src.repositories.sqlite_checkout_history_repository import (
+    INSERT_EVENT,
+    SqliteCheckoutHistoryRepository,
+    event_to_row,
+)
+from src.repositories.checkout_history_repository import CheckoutHistoryRepository
+
+
+def migrate(books_path: str, history_path: str, db_path: str) -> tuple[int, int]:
+    """Import books.json and checkout_history.json into a SQLite database.
+
+    Books already present (same book_id) are replaced and the history table
+    is replaced by the JSON history, so the migration can be re-run.
+    Returns (books imported, events imported).
+    """
+    book_repo = SqliteBookRepository(db_path)
+    history_repo = SqliteCheckoutHistoryRepository(db_path)
+
+    with open(books_path, "r", encoding="utf-8") as f:
+        books = [Book.from_dict(item) for item in json.load(f)]
+    events = CheckoutHistoryRepository(history_path).get_history_all()
+
+    with book_repo.conn:
+        book_repo.conn.executemany(UPSERT_BOOK, (book_to_row(b) for b in books))
+    with history_repo.conn:
+        # events have no natural key to upsert on; a re-run starts over
+        history_repo.conn.execute("DELETE FROM checkout_history")
+        history_repo.conn.executemany(INSERT_EVENT, (event_to_row(e) for e in events))
+
+    return len(books), len(events)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import the JSON stores into SQLite.")
+    parser.add_argument("--books", default="books.json")
+    parser.add_argument("--history", default="checkout_history.json")
+    parser.add_argument("--db", default="library.db")
+    args = parser.parse_args()
+
+    n_books, n_events = migrate(args.books, args.history, args.db)
+    print(f"Imported {n_books} books and {n_events} checkout events into {args.db}")
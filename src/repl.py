@@ -1,10 +1,22 @@
 from datetime import datetime
+import os
 from src.domain.book import Book
 from src.services.book_service import BookService
 from src.services.book_analytics_service import BookAnalyticsService
+from src.services.analytics_cache import AnalyticsCache
+from src.services.running_aggregates import RunningAggregates
+from src.services.book_search_service import BookSearchIndex
+from src.services.fuzzy_search_service import TrigramIndex
+from src.services.book_query import BookIndexes, QueryPlanner
+from src.services.book_frame import BookFrame
+from src.services.book_ranking import BookRanking, rating_score
+from src.services.catalog_views import CatalogViews
 from src.services.checkout_service import CheckoutService
-from src.repositories.book_repository import BookRepository
-from src.repositories.checkout_history_repository import CheckoutHistoryRepository
+from src.repositories.binary_catalog import BinaryCatalog, write_binary_catalog
+from src.repositories.book_repository_protocol import ConcurrentModificationError
+from src.repositories.cached_book_repository import CachedBookRepository
+from src.repositories.indexed_checkout_history_repository import IndexedCheckoutHistoryRepository
+from src.repositories.jsonl_checkout_history_repository import convert_json_history
 import requests
 
 
@@ -16,11 +28,47 @@ class BookREPL:
         book_svc: BookService,
         checkout_svc: CheckoutService,
         book_analytics_svc: BookAnalyticsService = None,
+        book_frame: BookFrame = None,
+        top_books_ranking: BookRanking = None,
+        analytics_cache: AnalyticsCache = None,
+        running_aggregates: RunningAggregates = None,
+        search_index: BookSearchIndex = None,
+        search_index_path: str = None,
+        fuzzy_index: TrigramIndex = None,
+        catalog_views: CatalogViews = None,
     ):
         self.running = True
         self.book_svc = book_svc
         self.checkout_svc = checkout_svc
         self.book_analytics_svc = book_analytics_svc
+        self.book_frame = book_frame
+        self.top_books_ranking = top_books_ranking
+        self.analytics_cache = analytics_cache
+        self.running_aggregates = running_aggregates
+        self.search_index = search_index
+        self.search_index_path = search_index_path
+        self.fuzzy_index = fuzzy_index
+        self.catalog_views = catalog_views
+
+    def view(self, name: str, fallback):
+        """The named view from catalog_views, brought up to date with the
+        catalog, or fallback if it isn't registered there."""
+        if self.catalog_views is not None and name in self.catalog_views:
+            return self.catalog_views.get(name)
+        return fallback
+
+    def save_search_index(self):
+        if self.search_index_path and self.catalog_views is not None and "search" in self.catalog_views:
+            index = self.catalog_views.get("search")
+            # stamp it with the version it was synced against; the file's
+            # current version may include writes this index never saw
+            index.save(self.search_index_path, self.catalog_views.version)
+
+    def before_write(self):
+        # catalog_views only trusts its version across our own write if the
+        # views were current when the write started
+        if self.catalog_views is not None:
+            self.catalog_views.sync()
 
     def start(self):
         print("Welcome to the book app! Type 'help' for a list of commands.")
@@ -31,6 +79,7 @@ class BookREPL:
     def handle_command(self, cmd):
         if cmd == "exit":
             self.running = False
+            self.save_search_index()
             print("Goodbye!")
 
         elif cmd in ("getAllRecords", "ls"):
@@ -43,6 +92,8 @@ class BookREPL:
             self.update_book()
         elif cmd == "deleteBook":
             self.delete_book()
+        elif cmd == "query":
+            self.query_books()
 
         elif cmd == "checkOut":
             self.check_out_book()
@@ -77,6 +128,7 @@ Books:
   findByName (find)
   updateBook
   deleteBook
+  query
 
 Checkout:
   checkOut
@@ -98,15 +150,25 @@ Other:
     def select_book_by_title(self, action_name):
         title = input(f"Enter book title to {action_name}: ").strip()
         matches = self.book_svc.find_book_by_name(title)
+        fuzzy = False
+
+        fuzzy_index = self.view("fuzzy", self.fuzzy_index)
+        if not matches and fuzzy_index is not None:
+            candidates = fuzzy_index.search(title)
+            matches = [
+                b for b in (self.book_svc.get_book_by_id(i) for i, _ in candidates)
+                if b is not None
+            ]
+            fuzzy = True
 
         if not matches:
             print("No books found.")
             return None
 
-        if len(matches) == 1:
+        if len(matches) == 1 and not fuzzy:
             return matches[0]
 
-        print("\nMultiple books found:")
+        print("\nNo exact match. Did you mean:" if fuzzy else "\nMultiple books found:")
         for i, book in enumerate(matches, start=1):
             print(f"[{i}] {book.title} | {book.author} | ID: {book.book_id}")
 
@@ -123,24 +185,66 @@ Other:
         return matches[idx]
 
     def get_all_records(self):
-        books = self.book_svc.get_all_books()
+        found = False
+        for book in self.book_svc.iter_books():
+            if not found:
+                print("\n--- Books ---")
+                found = True
+            print(book)
+
+        if not found:
+            print("No books found.")
+
+    def find_book_by_name(self):
+        title = input("Enter book name: ").strip()
+        search_index = self.view("search", self.search_index)
+        if search_index is not None:
+            ids = search_index.search(title)
+            books = [b for b in map(self.book_svc.get_book_by_id, ids) if b is not None]
+        else:
+            books = self.book_svc.find_book_by_name(title)
+
         if not books:
             print("No books found.")
             return
 
-        print("\n--- Books ---")
+        print("\n--- Matches ---")
         for book in books:
             print(book)
 
-    def find_book_by_name(self):
-        title = input("Enter book name: ").strip()
-        books = self.book_svc.find_book_by_name(title)
+    def query_books(self):
+        print("Leave blank to skip a filter.")
+        prompts = [
+            ("genre", "Genre: ", str),
+            ("author", "Author: ", str),
+            ("min_year", "Published from year: ", int),
+            ("max_year", "Published to year: ", int),
+            ("min_price", "Min price USD: ", float),
+            ("max_price", "Max price USD: ", float),
+            ("available", "Available (True/False): ", lambda s: s.lower() == "true"),
+            ("in_print", "In print (True/False): ", lambda s: s.lower() == "true"),
+            ("sort_by", "Sort by field: ", str),
+            ("descending", "Descending (True/False): ", lambda s: s.lower() == "true"),
+            ("limit", "Limit: ", int),
+        ]
+        try:
+            filters = {}
+            for name, prompt, parse in prompts:
+                value = input(prompt).strip()
+                if value:
+                    filters[name] = parse(value)
+            # brings the query planner's indexes up to date
+            self.view("indexes", None)
+            books = self.book_svc.query(**filters)
+        except (ValueError, AttributeError) as e:
+            print(f"Error: {e}")
+            return
 
         if not books:
             print("No books found.")
             return
 
-        print("\n--- Matches ---")
+        print(f"\n--- {len(books)} Matches ---")
         for book in books:
             print(book)
 
@@ -164,6 +268,7 @@ Other:
                 price_usd=float(price_usd) if price_usd else None,
                 in_print=(in_print.lower() == "true") if in_print else None
             )
+            self.before_write()
             new_book_id = self.book_svc.add_book(book)
 
             print(f"Book added with ID: {new_book_id}")
@@ -175,6 +280,7 @@ Other:
         if not book:
             return
 
+        self.before_write()
         success = self.book_svc.delete_book(book.book_id)
         print("Book deleted successfully." if success else "Delete failed.")
 
@@ -204,9 +310,15 @@ Other:
             price_usd=float(price_usd) if price_usd else book.price_usd,
             publisher=publisher or book.publisher,
             in_print=(in_print.lower() == "true") if in_print else book.in_print,
+            version=book.version,
         )
 
-        success = self.book_svc.update_book(updated_book)
+        try:
+            self.before_write()
+            success = self.book_svc.update_book(updated_book)
+        except ConcurrentModificationError as e:
+            print(f"Update failed: {e} Reload the book and try again.")
+            return
         print("Book updated successfully." if success else "Update failed.")
 
     def check_out_book(self):
@@ -215,6 +327,7 @@ Other:
             return
 
         try:
+            self.before_write()
             self.checkout_svc.check_out(book.book_id)
             print(f"Book '{book.title}' checked out.")
         except Exception as e:
@@ -226,6 +339,7 @@ Other:
             return
 
         try:
+            self.before_write()
             self.checkout_svc.check_in(book.book_id)
             print(f"Book '{book.title}' checked in.")
         except Exception as e:
@@ -259,21 +373,32 @@ Other:
             date = e.return_date if e.returned else e.checkout_date
             print(f"Book ID {e.book_id}: {status} at {date}")
 
+    def run_analytics(self, method, *args, **kwargs):
+        if self.analytics_cache is not None:
+            return self.analytics_cache.get(method, *args, **kwargs)
+        frame = self.view("frame", self.book_frame)
+        books = frame if frame is not None else self.book_svc.get_all_books()
+        return getattr(self.book_analytics_svc, method)(books, *args, **kwargs)
+
     def get_average_price(self):
-        if self.book_analytics_svc:
-            books = self.book_svc.get_all_books()
-            print("$" + str(self.book_analytics_svc.average_price(books)))
+        running_aggregates = self.view("aggregates", self.running_aggregates)
+        if running_aggregates is not None:
+            print("$" + str(running_aggregates.average_price()))
+        elif self.book_analytics_svc:
+            print("$" + str(self.run_analytics("average_price")))
 
     def get_top_books(self):
-        if self.book_analytics_svc:
-            books = self.book_svc.get_all_books()
-            for b in self.book_analytics_svc.top_rated(books):
+        top_books_ranking = self.view("ranking", self.top_books_ranking)
+        if top_books_ranking is not None:
+            for b in top_books_ranking.top(10):
+                print(b)
+        elif self.book_analytics_svc:
+            for b in self.run_analytics("top_rated"):
                 print(b)
 
     def get_value_scores(self):
         if self.book_analytics_svc:
-            books = self.book_svc.get_all_books()
-            print(self.book_analytics_svc.value_scores(books))
+            print(self.run_analytics("value_scores"))
 
     def get_joke(self):
         try:
@@ -289,12 +414,59 @@ Other:
 
 
 if __name__ == "__main__":
-    book_repo = BookRepository("books.json")
-    checkout_repo = CheckoutHistoryRepository("checkout_history.json")
+    book_repo = CachedBookRepository("books.json")
+    if not os.path.exists("checkout_history.jsonl") and os.path.exists("checkout_history.json"):
+        convert_json_history("checkout_history.json", "checkout_history.jsonl")
+    checkout_repo = IndexedCheckoutHistoryRepository("checkout_history.jsonl")
 
-    book_service = BookService(book_repo)
+    book_service = BookService(book_repo, QueryPlanner())
     checkout_service = CheckoutService(book_repo, checkout_repo)
     book_analytics_service = BookAnalyticsService()
-
-    repl = BookREPL(book_service, checkout_service, book_analytics_service)
+    catalog_views = CatalogViews(book_service)
+
+    def build_frame(version):
+        # the analytics frame maps books.bin instead of parsing books.json;
+        # the binary catalog is rewritten whenever books.json has changed
+        catalog = BinaryCatalog.load("books.bin", version)
+        if catalog is None:
+            write_binary_catalog("books.bin", book_service.iter_books(), version)
+            catalog = BinaryCatalog("books.bin")
+        return BookFrame.from_binary_catalog(catalog)
+
+    catalog_views.register("frame", build_frame)
+
+    def build_book_indexes(version):
+        indexes = BookIndexes.from_books(book_service.iter_books())
+        book_service.query_planner.indexes = indexes
+        return indexes
+
+    catalog_views.register("indexes", build_book_indexes)
+    catalog_views.register("ranking", lambda version: BookRanking.from_books(book_service.iter_books(), rating_score()))
+    catalog_views.register("aggregates", lambda version: RunningAggregates.from_books(book_service.iter_books()))
+    search_index_path = "books_search_index.json"
+
+    def build_search_index(version):
+        index = BookSearchIndex.load(search_index_path, version)
+        if index is None:
+            index = BookSearchIndex.from_books(book_service.iter_books())
+            index.save(search_index_path, version)
+        return index
+
+    catalog_views.register("search", build_search_index)
+    catalog_views.register("fuzzy", lambda version: TrigramIndex.from_books(book_service.iter_books()))
+    book_service.subscribe(catalog_views)
+    checkout_service.subscribe(catalog_views)
+
+    analytics_cache = AnalyticsCache(
+        book_analytics_service, book_service, frame=lambda: catalog_views.get("frame")
+    )
+
+    repl = BookREPL(
+        book_service,
+        checkout_service,
+        book_analytics_service,
+        analytics_cache=analytics_cache,
+        search_index_path=search_index_path,
+        catalog_views=catalog_views,
+    )
     repl.start()
@@ -1,2 +1,8 @@
 from .book_repository import BookRepository
-from .book_repository_protocol import BookRepositoryProtocol
+from .book_repository_protocol import BookRepositoryProtocol, ConcurrentModificationError
+from .cached_book_repository import CachedBookRepository
+from .logged_book_repository import LoggedBookRepository
+from .sqlite_book_repository import SqliteBookRepository
+from .sqlite_checkout_history_repository import SqliteCheckoutHistoryRepository
+from .jsonl_checkout_history_repository import JsonlCheckoutHistoryRepository
+from .indexed_checkout_history_repository import IndexedCheckoutHistoryRepository
@@ -0,0 +1,443 @@
+import argparse
+import bisect
+import datetime
+import json
+import math
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from array import array
+from itertools import accumulate
+from typing import Iterable, Iterator, Optional, Sequence
+try:
+    import numpy as np
+except ImportError:
+    np = None
+from src.domain.book import Book
+from src.repositories.book_repository import BookRepository
+from src.repositories.codecs import JsonCodec
+
+# File layout:
+#   MAGIC, u64 metadata length, metadata JSON, then every section padded to
+#   ALIGN bytes. The metadata lists each section as [offset from the first
+#   section, byte length, array typecode] plus the category dictionaries.
+#
+# Sections mirror BookFrame's dtypes so they can be wrapped zero-copy:
+#   numeric fields      float64, NaN for missing
+#   flag fields         int8, 1/0 and -1 for missing
+#   categorical fields  int32 codes into metadata["categories"], -1 for missing
+#   last_checkout       int64 microseconds since the epoch (numpy's
+#                       datetime64[us] layout, INT64_MIN is NaT)
+# String fields live in a heap: "<field>.heap" holds the UTF-8 bytes,
+# "<field>.offsets" n + 1 int64 offsets into it and "<field>.null" an int8
+# flag per row. "book_id.order" is the row numbers sorted by book_id, for
+# binary-search lookups.
+MAGIC = b"BOOKCAT2"
+ALIGN = 64
+NUMERIC_FIELDS = (
+    "publication_year",
+    "page_count",
+    "average_rating",
+    "ratings_count",
+    "price_usd",
+    "sales_millions",
+    "version",
+)
+INT_FIELDS = ("publication_year", "page_count", "ratings_count", "version")
+FLAG_FIELDS = ("in_print", "available")
+CATEGORICAL_FIELDS = ("genre", "author", "publisher", "language", "format")
+STRING_FIELDS = ("book_id", "title", "last_checkout", "publisher_email")
+NAT = -(2 ** 63)
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_HEADER = struct.Struct("<8sQ")
+
+
+def _micros(value: Optional[str]) -> int:
+    # same reading as BookFrame: wall-clock time, offset dropped, NAT if
+    # the value doesn't parse
+    try:
+        dt = datetime.datetime.fromisoformat(value) if value else None
+    except (TypeError, ValueError):
+        dt = None
+    if dt is None:
+        return NAT
+    return (dt.replace(tzinfo=None) - _EPOCH) // datetime.timedelta(microseconds=1)
+
+
+def _as_bytes(values, typecode: str) -> bytes:
+    """Raw column bytes from a sequence of Python values or a buffer."""
+    if isinstance(values, (list, tuple)):
+        return array(typecode, values).tobytes()
+    # array.array / numpy array of the right itemsize; written as-is
+    return memoryview(values).cast("B").tobytes()
+
+
+class BinaryCatalogWriter:
+    """Streams books into a binary catalog file.
+
+    Each section is spooled to its own temp file as chunks arrive, so
+    memory stays bounded by the chunk size; close() concatenates the
+    sections into path and swaps it in with os.replace. Chunks can be
+    Book objects (append_books) or columns of plain values (append_columns),
+    e.g. NumPy arrays from a vectorized generator.
+    """
+
+    def __init__(self, path: str, version=None):
+        self.path = path
+        self.version = version
+        self.count = 0
+        self.categories: dict[str, list[str]] = {f: [] for f in CATEGORICAL_FIELDS}
+        self._codes: dict[str, dict[str, int]] = {f: {} for f in CATEGORICAL_FIELDS}
+        self._heap_sizes = {f: 0 for f in STRING_FIELDS}
+        self._typecodes: dict[str, str] = {}
+        for f in NUMERIC_FIELDS:
+            self._typecodes[f] = "d"
+        for f in FLAG_FIELDS:
+            self._typecodes[f] = "b"
+        for f in CATEGORICAL_FIELDS:
+            self._typecodes[f] = "i"
+        self._typecodes["last_checkout"] = "q"
+        for f in STRING_FIELDS:
+            self._typecodes[f + ".heap"] = "B"
+            self._typecodes[f + ".offsets"] = "q"
+            self._typecodes[f + ".null"] = "b"
+        self._tmp_dir = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(path)))
+        self._spools = {
+            name: open(os.path.join(self._tmp_dir, name), "wb") for name in self._typecodes
+        }
+        for f in STRING_FIELDS:
+            self._spools[f + ".offsets"].write(array("q", [0]).tobytes())
+
+    def __enter__(self) -> 'BinaryCatalogWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def append_books(self, books: Iterable[Book]) -> None:
+        books = list(books)
+        self.append_columns({
+            name: [getattr(b, name) for b in books]
+            for name in NUMERIC_FIELDS + FLAG_FIELDS + CATEGORICAL_FIELDS + STRING_FIELDS
+        })
+
+    def append_columns(self, columns: dict[str, Sequence], last_checkout_micros=None) -> None:
+        """Append one chunk given as field -> values.
+
+        book_id is required and sets the chunk length; other missing fields
+        are stored as missing. Numeric and flag columns may also be buffers
+        already in the section's dtype (float64 / int8). last_checkout_micros
+        is an optional int64 buffer matching columns["last_checkout"] (e.g.
+        a datetime64[us] array viewed as int64) that saves parsing the strings.
+        """
+        n = len(columns["book_id"])
+        for f in NUMERIC_FIELDS:
+            values = columns.get(f)
+            if values is None:
+                values = [math.nan] * n
+            elif isinstance(values, (list, tuple)):
+                values = [math.nan if v is None else float(v) for v in values]
+            self._spools[f].write(_as_bytes(values, "d"))
+        for f in FLAG_FIELDS:
+            values = columns.get(f)
+            if values is None:
+                values = [-1] * n
+            elif isinstance(values, (list, tuple)):
+                values = [-1 if v is None else (1 if v else 0) for v in values]
+            self._spools[f].write(_as_bytes(values, "b"))
+        for f in CATEGORICAL_FIELDS:
+            values = columns.get(f)
+            codes = [-1] * n if values is None else self._codes_of(f, values)
+            self._spools[f].write(array("i", codes).tobytes())
+        for f in STRING_FIELDS:
+            values = columns.get(f)
+            self._append_strings(f, [None] * n if values is None else values)
+        last_checkout = columns.get("last_checkout")
+        if last_checkout_micros is not None:
+            self._spools["last_checkout"].write(_as_bytes(last_checkout_micros, "q"))
+        else:
+            micros = [NAT] * n if last_checkout is None else [_micros(v) for v in last_checkout]
+            self._spools["last_checkout"].write(array("q", micros).tobytes())
+        self.count += n
+
+    def _code(self, field: str, value) -> int:
+        if value is None:
+            return -1
+        codes = self._codes[field]
+        code = codes.get(value)
+        if code is None:
+            code = len(self.categories[field])
+            codes[value] = code
+            self.categories[field].append(value)
+        return code
+
+    def _codes_of(self, field: str, values: Sequence) -> list[int]:
+        # register each distinct value once (in first-seen order, so the
+        # file is deterministic), then map every row with a C-level lookup
+        distinct = dict.fromkeys(values)
+        for value in distinct:
+            self._code(field, value)
+        lookup = self._codes[field]
+        if None in distinct:
+            lookup = {**lookup, None: -1}
+        return list(map(lookup.__getitem__, values))
+
+    def _append_strings(self, field: str, values: Sequence) -> None:
+        end = self._heap_sizes[field]
+        try:
+            text = "".join(values)
+        except TypeError:
+            # None or non-str values; take the per-value path
+            text = None
+        if text is not None and text.isascii():
+            # one encode for the whole chunk; byte lengths are str lengths
+            heap = text.encode("ascii")
+            lengths = map(len, values)
+            nulls = bytes(len(values))
+        else:
+            encoded = [b"" if v is None else str(v).encode("utf-8") for v in values]
+            heap = b"".join(encoded)
+            lengths = map(len, encoded)
+            nulls = array("b", [v is None for v in values]).tobytes()
+        offsets = array("q", accumulate(lengths, initial=end))
+        del offsets[0]
+        self._heap_sizes[field] = end + len(heap)
+        self._spools[field + ".heap"].write(heap)
+        self._spools[field + ".offsets"].write(offsets.tobytes())
+        self._spools[field + ".null"].write(nulls)
+
+    def _write_id_order(self) -> None:
+        for spool in self._spools.values():
+            spool.flush()
+        with open(self._spools["book_id.heap"].name, "rb") as f:
+            heap = f.read()
+        offsets = array("q")
+        with open(self._spools["book_id.offsets"].name, "rb") as f:
+            offsets.frombytes(f.read())
+        width = len(heap) // self.count if self.count else 0
+        if np is not None and width and (np.diff(np.frombuffer(offsets, dtype=np.int64)) == width).all():
+            # fixed-width ids (e.g. all UUIDs): argsort the heap in place
+            # instead of materialising a bytes object per row
+            ids = np.frombuffer(heap, dtype=f"S{width}")
+            order = np.argsort(ids, kind="stable").astype(np.int32).tobytes()
+        else:
+            ids = [heap[offsets[i]:offsets[i + 1]] for i in range(self.count)]
+            order = array("i", sorted(range(self.count), key=ids.__getitem__)).tobytes()
+        self._typecodes["book_id.order"] = "i"
+        self._spools["book_id.order"] = open(os.path.join(self._tmp_dir, "book_id.order"), "wb")
+        self._spools["book_id.order"].write(order)
+
+    def close(self) -> int:
+        """Write the catalog file and return the number of books in it."""
+        self._write_id_order()
+        sections = {}
+        offset = 0
+        for name, spool in self._spools.items():
+            spool.close()
+            size = os.path.getsize(spool.name)
+            sections[name] = [offset, size, self._typecodes[name]]
+            offset += -(-size // ALIGN) * ALIGN
+        meta = json.dumps({
+            "count": self.count,
+            "version": repr(self.version),
+            "categories": self.categories,
+            "sections": sections,
+        }).encode("utf-8")
+
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as out:
+            out.write(_HEADER.pack(MAGIC, len(meta)))
+            out.write(meta)
+            out.write(b"\0" * (-out.tell() % ALIGN))
+            for name, spool in self._spools.items():
+                with open(spool.name, "rb") as f:
+                    shutil.copyfileobj(f, out)
+                out.write(b"\0" * (-out.tell() % ALIGN))
+        os.replace(tmp_path, self.path)
+        shutil.rmtree(self._tmp_dir, ignore_errors=True)
+        return self.count
+
+    def abort(self) -> None:
+        for spool in self._spools.values():
+            spool.close()
+        shutil.rmtree(self._tmp_dir, ignore_errors=True)
+
+
+class BinaryCatalog:
+    """Read-only, memory-mapped view of a catalog written by BinaryCatalogWriter.
+
+    Opening only parses the small metadata block; columns and books are read
+    from the mapping on demand, so the OS pages in just what is touched.
+    column() returns a memoryview over the mapped file; np.frombuffer() on
+    it gives a zero-copy array (see BookFrame.from_binary_catalog).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, meta_len = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f'{path} is not a binary book catalog')
+        meta = json.loads(self._mm[_HEADER.size:_HEADER.size + meta_len])
+        self._base = -(-(_HEADER.size + meta_len) // ALIGN) * ALIGN
+        self._count = meta["count"]
+        self.version = meta["version"]
+        self.categories: dict[str, list[str]] = meta["categories"]
+        self._sections = meta["sections"]
+        self._views: dict[str, memoryview] = {}
+
+    @classmethod
+    def load(cls, path: str, version) -> Optional['BinaryCatalog']:
+        """Open a catalog, or None if it is missing, stale or in an older format."""
+        try:
+            catalog = cls(path)
+        except (FileNotFoundError, ValueError):
+            return None
+        if catalog.version != repr(version):
+            catalog.close()
+            return None
+        return catalog
+
+    def __enter__(self) -> 'BinaryCatalog':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the file. Arrays built on column() must be released first."""
+        for view in self._views.values():
+            view.release()
+        self._views.clear()
+        self._mm.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _section(self, name: str) -> memoryview:
+        view = self._views.get(name)
+        if view is None:
+            offset, size, typecode = self._sections[name]
+            start = self._base + offset
+            view = memoryview(self._mm)[start:start + size].cast(typecode)
+            self._views[name] = view
+        return view
+
+    def column(self, name: str) -> memoryview:
+        """Zero-copy view of a numeric, flag, categorical or last_checkout column."""
+        if name in STRING_FIELDS and name != "last_checkout":
+            raise KeyError(f'{name} is stored in the string heap; use string()')
+        return self._section(name)
+
+    def labels(self, field: str) -> list[str]:
+        return self.categories[field]
+
+    def string(self, field: str, row: int) -> Optional[str]:
+        if self._section(field + ".null")[row]:
+            return None
+        offsets = self._section(field + ".offsets")
+        heap = self._section(field + ".heap")
+        return bytes(heap[offsets[row]:offsets[row + 1]]).decode("utf-8")
+
+    def strings(self, field: str) -> list[Optional[str]]:
+        # one pass over the heap instead of a string() call per row
+        heap = self._section(field + ".heap").tobytes()
+        offsets = self._section(field + ".offsets").tolist()
+        nulls = self._section(field + ".null").tolist()
+        return [
+            None if nulls[row] else heap[offsets[row]:offsets[row + 1]].decode("utf-8")
+            for row in range(self._count)
+        ]
+
+    def book_ids(self) -> list[str]:
+        return self.strings("book_id")
+
+    def row_of(self, book_id: str) -> Optional[int]:
+        """Row of a book, by binary search over the sorted id order."""
+        order = self._section("book_id.order")
+        key = book_id.encode("utf-8")
+        heap = self._section("book_id.heap")
+        offsets = self._section("book_id.offsets")
+        id_at = lambda row: bytes(heap[offsets[row]:offsets[row + 1]])
+        pos = bisect.bisect_left(order, key, key=id_at)
+        if pos < len(order) and id_at(order[pos]) == key:
+            return order[pos]
+        return None
+
+    def get_book(self, row: int, book_cls: type = Book) -> Book:
+        if not 0 <= row < self._count:
+            raise IndexError(f'row {row} out of range for {self._count} books')
+        data = {}
+        for f in NUMERIC_FIELDS:
+            value = self._section(f)[row]
+            if math.isnan(value):
+                data[f] = None
+            else:
+                data[f] = int(value) if f in INT_FIELDS else value
+        for f in FLAG_FIELDS:
+            value = self._section(f)[row]
+            data[f] = None if value == -1 else bool(value)
+        for f in CATEGORICAL_FIELDS:
+            code = self._section(f)[row]
+            data[f] = None if code == -1 else self.categories[f][code]
+        for f in STRING_FIELDS:
+            data[f] = self.string(f, row)
+        return book_cls.from_dict(data)
+
+    def get_book_by_id(self, book_id: str, book_cls: type = Book) -> Optional[Book]:
+        row = self.row_of(book_id)
+        return None if row is None else self.get_book(row, book_cls)
+
+    def iter_books(self, book_cls: type = Book) -> Iterator[Book]:
+        for row in range(self._count):
+            yield self.get_book(row, book_cls)
+
+
+def write_binary_catalog(path: str, books: Iterable[Book], version=None, chunk_size: int = 10_000) -> int:
+    with BinaryCatalogWriter(path, version) as writer:
+        chunk = []
+        for book in books:
+            chunk.append(book)
+            if len(chunk) >= chunk_size:
+                writer.append_books(chunk)
+                chunk = []
+        writer.append_books(chunk)
+    return writer.count
+
+
+def json_to_binary(json_path: str, bin_path: str, chunk_size: int = 10_000) -> int:
+    """Convert books.json to a binary catalog stamped with the JSON file's version."""
+    repo = BookRepository(json_path)
+    return write_binary_catalog(bin_path, repo.iter_books(), repo.catalog_version(), chunk_size)
+
+
+def binary_to_json(bin_path: str, json_path: str, codec: Optional[JsonCodec] = None) -> int:
+    """Write a binary catalog back out as a books.json array."""
+    with BinaryCatalog(bin_path) as catalog:
+        books = list(catalog.iter_books())
+    BookRepository(json_path, codec=codec)._write_books(books)
+    return len(books)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert between books.json and the binary catalog.")
+    parser.add_argument("direction", choices=["export", "import"],
+                        help="export: JSON -> binary, import: binary -> JSON")
+    parser.add_argument("--json", default="books.json")
+    parser.add_argument("--binary", default="books.bin")
+    args = parser.parse_args()
+
+    if args.direction == "export":
+        count = json_to_binary(args.json, args.binary)
+        print(f"Wrote {count} books to {args.binary}")
+    else:
+        count = binary_to_json(args.binary, args.json)
+        print(f"Wrote {count} books to {args.json}")
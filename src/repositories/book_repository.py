@@ -1,41 +1,109 @@
-import json
+import os
+from typing import Iterator, Optional
 from src.domain.book import Book
-from src.repositories.book_repository_protocol import BookRepositoryProtocol
+from src.repositories.codecs import JsonCodec
+from src.repositories.file_lock import FileLock, atomic_write
+from src.repositories.json_stream import iter_json_array
+from src.repositories.book_repository_protocol import BookRepositoryProtocol, check_version
 
 class BookRepository(BookRepositoryProtocol):
-    def __init__(self, filepath: str="books.json"):
+    def __init__(self, filepath: str="books.json", book_cls: type=Book, codec: JsonCodec | None=None):
+        # book_cls=CompactBook trades a little access speed for memory;
+        # codec=FastJsonCodec() trades the indented layout for load speed
         self.filepath = filepath
+        self.book_cls = book_cls
+        self.codec = codec or JsonCodec()
+        # held around every read-modify-write so concurrent processes
+        # don't lose each other's updates
+        self._lock = FileLock(filepath + ".lock")
+
+    def _file_stamp(self):
+        try:
+            st = os.stat(self.filepath)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def catalog_version(self):
+        # only depends on the file, so it is comparable across processes
+        return self._file_stamp()
 
     def get_all_books(self) -> list[Book]:
+        with open(self.filepath, 'rb') as f:
+            data = f.read()
+        return self.codec.decode_books(data, self.book_cls)
+
+    def iter_books(self) -> Iterator[Book]:
         with open(self.filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return [Book.from_dict(item) for item in data]
+            for item in iter_json_array(f):
+                yield self.book_cls.from_dict(item)
+
+    def _write_books(self, books: list[Book]) -> None:
+        before = self._file_stamp()
+        atomic_write(self.filepath, self.codec.encode_books(books))
+        if before is not None and self._file_stamp() == before:
+            # same size within the mtime resolution; nudge the mtime so
+            # readers keyed on the stamp still see a change
+            os.utime(self.filepath, ns=(before[0], before[0] + 1))
 
     def add_book(self, book:Book) -> str:
-        books = self.get_all_books()
-        books.append(book)
-        with open(self.filepath, 'w', encoding='utf-8') as f:
-            json.dump([b.to_dict() for b in books], f, indent=2)
+        with self._lock:
+            books = self.get_all_books()
+            books.append(book)
+            self._write_books(books)
         return book.book_id
 
+    def add_books(self, books: list[Book]) -> list[str]:
+        with self._lock:
+            stored = self.get_all_books()
+            seen = {b.book_id for b in stored}
+            added = []
+            for book in books:
+                if book.book_id not in seen:
+                    seen.add(book.book_id)
+                    added.append(book)
+            if added:
+                self._write_books(stored + added)
+        return [b.book_id for b in added]
+
     def find_book_by_name(self, query) -> list[Book]:
         return [b for b in self.get_all_books() if b.title == query]
+
+    def get_book_by_id(self, book_id: str) -> Optional[Book]:
+        # the flat file has no index; use CachedBookRepository or
+        # SqliteBookRepository for keyed lookups
+        return next((b for b in self.iter_books() if b.book_id == book_id), None)
+
+    def get_books_by_ids(self, book_ids: list[str]) -> dict[str, Book]:
+        # one pass over the file for the whole batch
+        wanted = set(book_ids)
+        return {b.book_id: b for b in self.iter_books() if b.book_id in wanted}
     
     def update_book(self, updated_book: Book) -> bool:
-        books = self.get_all_books()
-        for i, book in enumerate(books):
-            if book.book_id == updated_book.book_id:
-                books[i] = updated_book
-                with open(self.filepath, "w", encoding="utf-8") as f:
-                    json.dump([b.to_dict() for b in books], f, indent=2)
-                return True
-        return False
+        return self.update_books([updated_book]) == 1
+
+    def update_books(self, updated_books: list[Book]) -> int:
+        updates = {b.book_id: b for b in updated_books}
+        with self._lock:
+            books = self.get_all_books()
+            matched = []
+            for i, book in enumerate(books):
+                updated = updates.get(book.book_id)
+                if updated is not None:
+                    check_version(book, updated)
+                    matched.append((i, updated))
+            for i, updated in matched:
+                updated.version += 1
+                books[i] = updated
+            if matched:
+                self._write_books(books)
+        return len(matched)
 
     def delete_book(self, book_id: str) -> bool:
-        books = self.get_all_books()
-        new_books = [b for b in books if b.book_id != book_id]
-        if len(new_books) == len(books):
-            return False
-        with open(self.filepath, "w", encoding="utf-8") as f:
-            json.dump([b.to_dict() for b in new_books], f, indent=2)
+        with self._lock:
+            books = self.get_all_books()
+            new_books = [b for b in books if b.book_id != book_id]
+            if len(new_books) == len(books):
+                return False
+            self._write_books(new_books)
         return True
@@ -1,18 +1,68 @@
-from typing import Protocol
+from typing import Hashable, Iterator, Optional, Protocol
 from src.domain.book import Book
 
+
+class ConcurrentModificationError(Exception):
+    """update_book was given a book whose version is no longer the stored one."""
+
+    def __init__(self, book_id: str, expected: int, actual: int):
+        super().__init__(
+            f'Book {book_id} was modified by someone else '
+            f'(have version {expected}, stored version is {actual}).'
+        )
+        self.book_id = book_id
+        self.expected = expected
+        self.actual = actual
+
+
+def check_version(current: Book, updated: Book) -> None:
+    if current.version != updated.version:
+        raise ConcurrentModificationError(updated.book_id, updated.version, current.version)
+
+
 class BookRepositoryProtocol(Protocol):
     def get_all_books(self) -> list[Book]:
         ...
 
+    def iter_books(self) -> Iterator[Book]:
+        ...
+
     def add_book(self, book:Book) -> str:
         ...
 
+    def add_books(self, books: list[Book]) -> list[str]:
+        """Add a batch of books in one write and return the ids added.
+
+        Books whose id is already stored, or repeated within the batch,
+        are skipped; the first occurrence wins.
+        """
+        ...
+
     def find_book_by_name(self, query:str) -> list[Book]:
         ...
+
+    def get_book_by_id(self, book_id: str) -> Optional[Book]:
+        ...
+
+    def get_books_by_ids(self, book_ids: list[str]) -> dict[str, Book]:
+        """get_book_by_id for a batch in one read; unknown ids are left out."""
+        ...
     
     def update_book(self, updated_book: Book) -> bool:
+        """Store updated_book if its version matches, then bump its version.
+
+        Returns False for an unknown id and raises ConcurrentModificationError
+        if the stored book was updated since updated_book was read.
+        """
+        ...
+
+    def update_books(self, updated_books: list[Book]) -> int:
+        """update_book for a batch; a version conflict rejects the whole batch."""
         ...
 
     def delete_book(self, book_id: str) -> bool:
+        ...
+
+    def catalog_version(self) -> Hashable:
+        """Token that changes whenever the stored catalog changes."""
         ...
\ No newline at end of file
@@ -0,0 +1,142 @@
+import copy
+from typing import Iterator, Optional
+from src.domain.book import Book
+from src.repositories.book_repository import BookRepository
+from src.repositories.book_repository_protocol import check_version
+from src.repositories.codecs import JsonCodec
+
+class CachedBookRepository(BookRepository):
+    """BookRepository that parses books.json once and serves reads from memory.
+
+    Keeps an id -> Book dict plus a title -> ids index. The file's mtime and
+    size are checked on every call, so edits made by another process are
+    picked up with a reload. Books handed out are copies, so callers can
+    mutate them without touching the cache until they call update_book.
+    """
+
+    def __init__(self, filepath: str="books.json", book_cls: type=Book, codec: JsonCodec | None=None):
+        super().__init__(filepath, book_cls, codec)
+        self._books: dict[str, Book] = {}
+        self._title_index: dict[str, list[str]] = {}
+        self._stamp = None
+
+    def _load(self) -> None:
+        books = super().get_all_books() if self._file_stamp() else []
+        self._books = {b.book_id: b for b in books}
+        self._title_index = {}
+        for b in books:
+            self._title_index.setdefault(b.title, []).append(b.book_id)
+
+    def _ensure_fresh(self) -> None:
+        stamp = self._file_stamp()
+        if self._stamp is None or stamp != self._stamp:
+            self._load()
+            self._stamp = stamp
+
+    def _stored_copy(self, book: Book) -> Book:
+        if isinstance(book, self.book_cls):
+            return copy.copy(book)
+        return self.book_cls.from_dict(book.to_dict())
+
+    def _index_title(self, book: Book) -> None:
+        self._title_index.setdefault(book.title, []).append(book.book_id)
+
+    def _unindex_title(self, book: Book) -> None:
+        ids = self._title_index.get(book.title)
+        if not ids:
+            return
+        ids.remove(book.book_id)
+        if not ids:
+            del self._title_index[book.title]
+
+    def _flush(self) -> None:
+        self._write_books(list(self._books.values()))
+        self._stamp = self._file_stamp()
+
+    def _persist_put(self, books: list[Book]) -> None:
+        self._flush()
+
+    def _persist_delete(self, book_id: str) -> None:
+        self._flush()
+
+    def get_all_books(self) -> list[Book]:
+        self._ensure_fresh()
+        return [copy.copy(b) for b in self._books.values()]
+
+    def iter_books(self) -> Iterator[Book]:
+        self._ensure_fresh()
+        for b in list(self._books.values()):
+            yield copy.copy(b)
+
+    def add_book(self, book: Book) -> str:
+        with self._lock:
+            self._ensure_fresh()
+            stored = self._stored_copy(book)
+            self._books[stored.book_id] = stored
+            self._index_title(stored)
+            self._persist_put([stored])
+        return book.book_id
+
+    def add_books(self, books: list[Book]) -> list[str]:
+        with self._lock:
+            self._ensure_fresh()
+            added = []
+            for book in books:
+                if book.book_id not in self._books:
+                    stored = self._stored_copy(book)
+                    self._books[stored.book_id] = stored
+                    self._index_title(stored)
+                    added.append(stored)
+            if added:
+                # one rewrite (or one log append) for the whole batch
+                self._persist_put(added)
+        return [b.book_id for b in added]
+
+    def find_book_by_name(self, query) -> list[Book]:
+        self._ensure_fresh()
+        return [copy.copy(self._books[i]) for i in self._title_index.get(query, [])]
+
+    def get_book_by_id(self, book_id: str) -> Optional[Book]:
+        self._ensure_fresh()
+        book = self._books.get(book_id)
+        return copy.copy(book) if book is not None else None
+
+    def get_books_by_ids(self, book_ids: list[str]) -> dict[str, Book]:
+        self._ensure_fresh()
+        return {i: copy.copy(self._books[i]) for i in book_ids if i in self._books}
+
+    def update_book(self, updated_book: Book) -> bool:
+        return self.update_books([updated_book]) == 1
+
+    def update_books(self, updated_books: list[Book]) -> int:
+        with self._lock:
+            # re-check freshness under the lock so the version check sees
+            # updates other processes committed since our last read
+            self._ensure_fresh()
+            matched = []
+            for updated_book in {b.book_id: b for b in updated_books}.values():
+                current = self._books.get(updated_book.book_id)
+                if current is not None:
+                    check_version(current, updated_book)
+                    matched.append((current, updated_book))
+            stored_books = []
+            for current, updated_book in matched:
+                updated_book.version += 1
+                stored = self._stored_copy(updated_book)
+                self._unindex_title(current)
+                self._books[stored.book_id] = stored
+                self._index_title(stored)
+                stored_books.append(stored)
+            if stored_books:
+                self._persist_put(stored_books)
+        return len(stored_books)
+
+    def delete_book(self, book_id: str) -> bool:
+        with self._lock:
+            self._ensure_fresh()
+            current = self._books.pop(book_id, None)
+            if current is None:
+                return False
+            self._unindex_title(current)
+            self._persist_delete(book_id)
+        return True
@@ -5,6 +5,9 @@ class CheckoutHistoryRepositoryProtocol(Protocol):
     def add_event(self, event: CheckoutEvent) -> None:
         ...
 
+    def add_events(self, events: List[CheckoutEvent]) -> None:
+        ...
+
     def get_history_for_book(self, book_id: str) -> List[CheckoutEvent]:
         ...
 
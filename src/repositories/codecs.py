@@ -0,0 +1,116 @@
+import json
+import sys
+from src.domain.book import CATEGORICAL_FIELDS, Book
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+class JsonCodec:
+    """Stdlib JSON encoding for the file-backed repositories.
+
+    indent=2 reproduces the original books.json layout. Subclasses trade
+    readability for size (CompactJsonCodec) or speed (FastJsonCodec).
+    """
+
+    name = "json"
+
+    def __init__(self, indent: int | None = 2):
+        self.indent = indent
+
+    def dumps(self, records: list[dict]) -> bytes:
+        return json.dumps(records, indent=self.indent).encode("utf-8")
+
+    def loads(self, data: bytes) -> list[dict]:
+        return json.loads(data)
+
+    def encode_books(self, books: list[Book]) -> bytes:
+        return self.dumps([b.to_dict() for b in books])
+
+    def decode_books(self, data: bytes, book_cls: type = Book) -> list[Book]:
+        return [book_cls.from_dict(item) for item in self.loads(data)]
+
+
+class CompactJsonCodec(JsonCodec):
+    """No indentation or padding; roughly 30% smaller files than indent=2."""
+
+    name = "compact"
+
+    def __init__(self):
+        super().__init__(indent=None)
+
+    def dumps(self, records: list[dict]) -> bytes:
+        return json.dumps(records, separators=(",", ":")).encode("utf-8")
+
+
+class FastJsonCodec(CompactJsonCodec):
+    """Compact JSON through orjson/msgspec when they are installed.
+
+    With msgspec, decode_books goes straight from bytes to Book instances
+    with no intermediate dicts. Files that don't match Book's field types
+    (e.g. uncleaned dumps) take the dict path instead. Without either
+    library this is CompactJsonCodec.
+    """
+
+    name = "fast"
+
+    def __init__(self):
+        super().__init__()
+        self._book_decoder = msgspec.json.Decoder(list[Book]) if msgspec else None
+
+    def dumps(self, records: list[dict]) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(records)
+        return super().dumps(records)
+
+    def loads(self, data: bytes) -> list[dict]:
+        if orjson is not None:
+            return orjson.loads(data)
+        return super().loads(data)
+
+    def encode_books(self, books: list[Book]) -> bytes:
+        if msgspec is not None and all(type(b) is Book for b in books):
+            return msgspec.json.encode(books)
+        return super().encode_books(books)
+
+    def decode_books(self, data: bytes, book_cls: type = Book) -> list[Book]:
+        if self._book_decoder is not None and book_cls is Book:
+            try:
+                books = self._book_decoder.decode(data)
+            except msgspec.ValidationError:
+                pass
+            else:
+                _intern_books(books)
+                return books
+        return super().decode_books(data, book_cls)
+
+
+def _intern_books(books: list[Book]) -> None:
+    # msgspec bypasses Book.from_dict, so share the categorical strings here
+    seen: dict[str, str] = {}
+    for b in books:
+        for name in CATEGORICAL_FIELDS:
+            value = getattr(b, name)
+            if value is not None:
+                setattr(b, name, seen.setdefault(value, sys.intern(value)))
+
+
+CODECS = {
+    JsonCodec.name: JsonCodec,
+    CompactJsonCodec.name: CompactJsonCodec,
+    FastJsonCodec.name: FastJsonCodec,
+}
+
+
+def get_codec(name: str) -> JsonCodec:
+    try:
+        return CODECS[name]()
+    except KeyError:
+        raise ValueError(f'Unknown codec "{name}", expected one of: {", ".join(CODECS)}') from None
@@ -0,0 +1,91 @@
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    # no advisory locks on this platform; FileLock only serializes threads
+    fcntl = None
+
+
+class FileLock:
+    """Exclusive inter-process lock on a sidecar file (fcntl.flock).
+
+    Re-entrant within one process, so a locked method can call another
+    locked method on the same repository. The data file itself is never
+    locked because atomic_write replaces it with a new inode; every writer
+    locks the same "<data file>.lock" instead.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+
+    def __enter__(self) -> 'FileLock':
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+                if fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_EX)
+            except BaseException:
+                if self._fd is not None:
+                    os.close(self._fd)
+                    self._fd = None
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+        self._thread_lock.release()
+
+
+def atomic_write(path: str, data: bytes, fsync: bool = False) -> None:
+    """Write data to a temp file next to path and swap it in with os.replace.
+
+    Readers see either the old or the new file, never a partial one.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def truncate_torn_tail(f) -> None:
+    """Cut a partial last line (a torn write) off the log opened as f ("ab+").
+
+    Readers already skip it, but appending after it would glue the next
+    record onto the fragment and make that line undecodable. Only safe
+    while holding the lock every writer of the log takes.
+    """
+    end = f.seek(0, os.SEEK_END)
+    pos = end
+    while pos > 0:
+        step = min(pos, 4096)
+        f.seek(pos - step)
+        block = f.read(step)
+        if pos == end and block.endswith(b"\n"):
+            return
+        newline = block.rfind(b"\n")
+        if newline >= 0:
+            f.truncate(pos - step + newline + 1)
+            return
+        pos -= step
+    f.truncate(0)
@@ -0,0 +1,164 @@
+import json
+import os
+from typing import Optional
+from src.domain.checkout_history import CheckoutEvent
+from src.repositories.file_lock import atomic_write
+from src.repositories.jsonl_checkout_history_repository import (
+    JsonlCheckoutHistoryRepository,
+)
+
+class IndexedCheckoutHistoryRepository(JsonlCheckoutHistoryRepository):
+    """JSONL history with a persisted book_id -> byte offsets index.
+
+    The index lives next to the log (checkout_history.jsonl.idx). Its first
+    line names the log it describes ("#<TAB>device<TAB>inode") and every
+    other line is "book_id<TAB>offset<TAB>length". It is appended to
+    alongside the log and caught up incrementally if the log grew without
+    it, so get_history_for_book seeks straight to that book's events.
+
+    Several instances (or processes) may share one log: appends and index
+    writes happen under the same checkout_history.jsonl.lock as plain JSONL
+    appends, after reading whatever the others appended to the index, so
+    no entry is recorded twice. A log
+    that was replaced (new inode) or truncated gets a fresh index.
+    """
+
+    def __init__(self, filepath: str = "checkout_history.jsonl", fsync: bool = False):
+        super().__init__(filepath, fsync)
+        self.index_path = filepath + ".idx"
+        self._offsets: dict[str, list[tuple[int, int]]] = {}
+        self._indexed_size = 0
+        # identity of the log the loaded index describes, the index file's
+        # inode and how many bytes of it have been read
+        self._log_id = None
+        self._index_id = None
+        self._index_read = 0
+        self._stamp = None
+
+    @staticmethod
+    def _stat(path: str) -> Optional[os.stat_result]:
+        try:
+            return os.stat(path)
+        except FileNotFoundError:
+            return None
+
+    def _current_stamp(self) -> tuple:
+        log, index = self._stat(self.filepath), self._stat(self.index_path)
+        return (
+            (log.st_dev, log.st_ino, log.st_size) if log else None,
+            (index.st_dev, index.st_ino, index.st_size) if index else None,
+        )
+
+    def _reset_index(self) -> None:
+        self._offsets = {}
+        self._indexed_size = 0
+        self._log_id = None
+        self._index_id = None
+        self._index_read = 0
+
+    def _read_index(self) -> None:
+        """Pick up index lines appended since the last read (all of them if
+        the index file was replaced)."""
+        index = self._stat(self.index_path)
+        if index is None:
+            self._reset_index()
+            return
+        if (index.st_dev, index.st_ino) != self._index_id or index.st_size < self._index_read:
+            self._reset_index()
+            self._index_id = (index.st_dev, index.st_ino)
+        with open(self.index_path, "rb") as f:
+            f.seek(self._index_read)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # torn write from a crash; _record truncates it
+                    break
+                self._index_read += len(line)
+                fields = line.decode("utf-8").rstrip("\n").split("\t")
+                if fields[0] == "#":
+                    self._log_id = (int(fields[1]), int(fields[2]))
+                    continue
+                book_id, offset, length = fields
+                offset, length = int(offset), int(length)
+                self._offsets.setdefault(book_id, []).append((offset, length))
+                self._indexed_size = max(self._indexed_size, offset + length)
+
+    def _sync_index(self) -> None:
+        """Bring the index up to date with the log; caller holds the lock."""
+        self._read_index()
+        log = self._stat(self.filepath)
+        if log is None:
+            self._reset_index()
+            return
+        log_id = (log.st_dev, log.st_ino)
+        if log_id != self._log_id or log.st_size < self._indexed_size:
+            # the log was replaced or truncated; the index no longer applies
+            atomic_write(self.index_path, f"#\t{log_id[0]}\t{log_id[1]}\n".encode("utf-8"))
+            self._read_index()
+        if log.st_size > self._indexed_size:
+            self._index_tail()
+
+    def _ensure_index(self) -> None:
+        # unchanged log and index: no lock, no reads
+        if self._stamp is not None and self._stamp == self._current_stamp():
+            return
+        with self._lock:
+            self._sync_index()
+            self._stamp = self._current_stamp()
+
+    def _index_tail(self) -> None:
+        entries = []
+        with open(self.filepath, "rb") as f:
+            f.seek(self._indexed_size)
+            offset = self._indexed_size
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                entries.append((json.loads(line)["book_id"], offset, len(line)))
+                offset += len(line)
+        self._record(entries)
+
+    def _record(self, entries: list[tuple[str, int, int]]) -> None:
+        data = "".join(f"{b}\t{o}\t{n}\n" for b, o, n in entries).encode("utf-8")
+        with open(self.index_path, "r+b") as f:
+            # everything past what _read_index consumed is a torn line
+            f.truncate(self._index_read)
+            f.seek(self._index_read)
+            f.write(data)
+        self._index_read += len(data)
+        for book_id, offset, length in entries:
+            self._offsets.setdefault(book_id, []).append((offset, length))
+            self._indexed_size = max(self._indexed_size, offset + length)
+
+    def add_events(self, events: list[CheckoutEvent]) -> None:
+        lines = [(json.dumps(e.to_dict()) + "\n").encode("utf-8") for e in events]
+        with self._lock:
+            # create the log first so the index is stamped with its inode
+            open(self.filepath, "ab").close()
+            self._sync_index()
+            with open(self.filepath, "r+b") as f:
+                # past the last indexed line there can only be a torn write
+                f.truncate(self._indexed_size)
+                offset = f.seek(self._indexed_size)
+                f.write(b"".join(lines))
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+
+            entries = []
+            for event, line in zip(events, lines):
+                entries.append((event.book_id, offset, len(line)))
+                offset += len(line)
+            self._record(entries)
+            self._stamp = self._current_stamp()
+
+    def get_history_for_book(self, book_id: str) -> list[CheckoutEvent]:
+        self._ensure_index()
+        offsets = self._offsets.get(book_id)
+        if not offsets:
+            return []
+        events = []
+        with open(self.filepath, "rb") as f:
+            for offset, length in offsets:
+                f.seek(offset)
+                events.append(CheckoutEvent.from_dict(json.loads(f.read(length))))
+        return events
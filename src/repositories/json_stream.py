@@ -0,0 +1,257 @@
+import json
+import re
+from typing import IO, Callable, Iterator
+
+_WHITESPACE = " \t\n\r"
+# a backslash-escaped quote: an odd run of backslashes before the quote
+_ESCAPED_QUOTE = re.compile(r'(?<!\\)(?:\\\\)*\\"')
+
+
+def iter_json_array(f: IO[str], chunk_size: int = 64 * 1024) -> Iterator:
+    """Yield the elements of a top-level JSON array one at a time.
+
+    Only chunk_size characters plus the element being decoded are held in
+    memory, so a catalog can be walked without materialising the whole tree.
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+    started = False
+
+    def fill() -> bool:
+        nonlocal buf, pos, eof
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+
+    while True:
+        while pos < len(buf) and (buf[pos] in _WHITESPACE or (started and buf[pos] == ",")):
+            pos += 1
+        if pos >= len(buf):
+            if not fill():
+                raise ValueError("Unexpected end of JSON array.")
+            continue
+
+        if not started:
+            if buf[pos] != "[":
+                raise ValueError("Expected a JSON array.")
+            started = True
+            pos += 1
+            continue
+        if buf[pos] == "]":
+            return
+
+        try:
+            value, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof or not fill():
+                raise
+            continue
+        # a number such as "1." may have decoded as a prefix of "1.5", so
+        # only accept the value once its delimiter is in the buffer
+        nxt = end
+        while nxt < len(buf) and buf[nxt] in _WHITESPACE:
+            nxt += 1
+        if nxt >= len(buf) or buf[nxt] not in ",]":
+            if fill():
+                continue
+            if nxt < len(buf) or not eof:
+                raise ValueError("Malformed JSON array.")
+        yield value
+        pos = end
+
+
+class _Prefixed:
+    """Read-only stream that returns prefix before the rest of f."""
+
+    def __init__(self, prefix: str, f: IO[str]):
+        self.prefix = prefix
+        self.f = f
+
+    def read(self, size: int) -> str:
+        if self.prefix:
+            data, self.prefix = self.prefix[:size], self.prefix[size:]
+            return data
+        return self.f.read(size)
+
+
+def _last_object_end(buf: str, end: int | None = None) -> int:
+    """Index of the last comma before end that follows a "}", or -1."""
+    i = len(buf) if end is None else end
+    while True:
+        i = buf.rfind(",", 0, i)
+        if i < 0:
+            return -1
+        j = i - 1
+        while j >= 0 and buf[j] in _WHITESPACE:
+            j -= 1
+        if j >= 0 and buf[j] == "}":
+            return i
+
+
+def iter_json_array_chunks(
+    f: IO[str],
+    chunk_size: int = 8 * 1024 * 1024,
+    loads: Callable[[str], list] = json.loads,
+    fallback_batch: int = 10_000,
+) -> Iterator[list]:
+    """Yield the elements of a top-level JSON array as lists, a chunk at a time.
+
+    Fast path for arrays of objects such as books.json: each chunk is cut
+    after its last "}," and decoded with a single loads() call instead of a
+    raw_decode per element. A cut that lands inside a string or a nested
+    object can't decode, so from that point on the rest of the array is
+    read element by element with iter_json_array.
+    """
+    buf = f.read(chunk_size).lstrip(_WHITESPACE)
+    if not buf.startswith("["):
+        raise ValueError("Expected a JSON array.")
+    buf = buf[1:]
+    while True:
+        data = f.read(chunk_size)
+        buf += data
+        if data:
+            cut = _last_object_end(buf)
+            if cut < 0:
+                continue
+            piece, rest = buf[:cut], buf[cut + 1:]
+        else:
+            piece, rest = buf.rstrip(_WHITESPACE), ""
+            if not piece.endswith("]"):
+                raise ValueError("Unexpected end of JSON array.")
+            piece = piece[:-1]
+            if not piece.strip(_WHITESPACE):
+                return
+        try:
+            items = loads("[" + piece + "]")
+        except ValueError:
+            batch = []
+            for item in iter_json_array(_Prefixed("[" + buf, f)):
+                batch.append(item)
+                if len(batch) >= fallback_batch:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+            return
+        yield items
+        if not data:
+            return
+        buf = rest
+
+
+def _ends_in_string(text: str) -> bool:
+    """Whether text stops inside a JSON string literal."""
+    quotes = text.count('"')
+    if '\\"' in text:
+        quotes -= len(_ESCAPED_QUOTE.findall(text))
+    return quotes % 2 == 1
+
+
+def _last_element_break(buf: str) -> int:
+    """Index of the last comma in buf that separates two array elements."""
+    i = len(buf)
+    while True:
+        i = _last_object_end(buf, i)
+        if i < 0:
+            return -1
+        j = i + 1
+        while j < len(buf) and buf[j] in _WHITESPACE:
+            j += 1
+        if j < len(buf) and buf[j] == "{" and not _ends_in_string(buf[:i]):
+            return i
+
+
+def iter_json_array_texts(f: IO[str], chunk_size: int = 8 * 1024 * 1024) -> Iterator[str]:
+    """Split a top-level JSON array of flat objects into smaller array texts.
+
+    Nothing is decoded: each chunk is cut at its last "},{" that is not
+    inside a string, so every yielded text is itself a JSON array that
+    can be handed to another process and decoded there. Objects nested
+    in arrays inside the elements can be split wrongly, which shows up as
+    a decode error in the consumer.
+    """
+    buf = f.read(chunk_size).lstrip(_WHITESPACE)
+    if not buf.startswith("["):
+        raise ValueError("Expected a JSON array.")
+    buf = buf[1:]
+    while True:
+        data = f.read(chunk_size)
+        if not data:
+            piece = buf.rstrip(_WHITESPACE)
+            if not piece.endswith("]"):
+                raise ValueError("Unexpected end of JSON array.")
+            piece = piece[:-1]
+            if piece.strip(_WHITESPACE):
+                yield "[" + piece + "]"
+            return
+        buf += data
+        cut = _last_element_break(buf)
+        if cut < 0:
+            continue
+        yield "[" + buf[:cut] + "]"
+        buf = buf[cut + 1:]
+
+
+_ELEMENT_BREAK = re.compile(r"\}[ \t\n\r]*,[ \t\n\r]*(?=\{)")
+
+
+def split_json_array_text(text: str) -> list[str]:
+    """The undecoded element texts of one array text from iter_json_array_texts.
+
+    Cuts at the same "},{" breaks outside strings, so an element that
+    fails to decode can be told apart from its neighbours.
+    """
+    body = text.strip(_WHITESPACE)
+    if body.startswith("["):
+        body = body[1:]
+    if body.endswith("]"):
+        body = body[:-1]
+    elements = []
+    start = checked = 0
+    in_string = False
+    for m in _ELEMENT_BREAK.finditer(body):
+        # quote parity of the stretch since the previous break
+        if _ends_in_string(body[checked:m.start()]):
+            in_string = not in_string
+        checked = m.start()
+        if not in_string:
+            elements.append(body[start:m.start() + 1])
+            start = m.end()
+    if body[start:].strip(_WHITESPACE):
+        elements.append(body[start:])
+    return elements
+
+
+def iter_jsonl_texts(f: IO[str], chunk_size: int = 8 * 1024 * 1024) -> Iterator[str]:
+    """Split a JSONL stream into blocks of whole lines without decoding them.
+
+    Unlike iter_jsonl this is meant for complete dumps rather than
+    append-only logs, so a last line without a trailing newline is kept.
+    """
+    rest = ""
+    while True:
+        data = f.read(chunk_size)
+        if not data:
+            if rest.strip():
+                yield rest
+            return
+        buf = rest + data
+        cut = buf.rfind("\n")
+        if cut < 0:
+            rest = buf
+            continue
+        yield buf[:cut + 1]
+        rest = buf[cut + 1:]
+
+
+def iter_jsonl(f: IO[str]) -> Iterator:
+    """Yield one decoded value per complete line of a JSONL stream."""
+    for line in f:
+        if line.endswith("\n") and line.strip():
+            yield json.loads(line)
@@ -0,0 +1,74 @@
+import json
+import os
+from src.domain.checkout_history import CheckoutEvent
+from src.repositories.checkout_history_repository_protocol import (
+    CheckoutHistoryRepositoryProtocol,
+)
+from src.repositories.file_lock import FileLock, truncate_torn_tail
+from src.repositories.json_stream import iter_jsonl
+
+class JsonlCheckoutHistoryRepository(CheckoutHistoryRepositoryProtocol):
+    """Checkout history stored as one JSON object per line.
+
+    add_event is a single buffered append, so writing history no longer
+    costs more as the file grows. With fsync=True every append is forced
+    to disk before returning. Appends hold checkout_history.jsonl.lock, the
+    same FileLock the JSON stores use, so concurrent writers never
+    interleave or write onto a torn line.
+    """
+
+    def __init__(self, filepath: str = "checkout_history.jsonl", fsync: bool = False):
+        self.filepath = filepath
+        self.fsync = fsync
+        self._lock = FileLock(filepath + ".lock")
+
+    def _iter_records(self):
+        try:
+            with open(self.filepath, "r", encoding="utf-8") as f:
+                yield from iter_jsonl(f)
+        except FileNotFoundError:
+            return
+
+    def add_event(self, event: CheckoutEvent) -> None:
+        self.add_events([event])
+
+    def add_events(self, events: list[CheckoutEvent]) -> None:
+        data = "".join(json.dumps(e.to_dict()) + "\n" for e in events).encode("utf-8")
+        with self._lock:
+            with open(self.filepath, "ab+") as f:
+                truncate_torn_tail(f)
+                f.write(data)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+
+    def get_history_for_book(self, book_id: str) -> list[CheckoutEvent]:
+        return [
+            CheckoutEvent.from_dict(e)
+            for e in self._iter_records()
+            if e["book_id"] == book_id
+        ]
+
+    def get_history_all(self) -> list[CheckoutEvent]:
+        return [CheckoutEvent.from_dict(e) for e in self._iter_records()]
+
+
+def convert_json_history(src: str = "checkout_history.json", dest: str = "checkout_history.jsonl") -> int:
+    """Rewrite a JSON-array history file as JSONL. Returns the event count."""
+    with open(src, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    tmp_path = dest + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for record in data:
+            f.write(json.dumps(record) + "\n")
+    os.replace(tmp_path, dest)
+    return len(data)
+
+
+if __name__ == "__main__":
+    import sys
+
+    src_path = sys.argv[1] if len(sys.argv) > 1 else "checkout_history.json"
+    dest_path = sys.argv[2] if len(sys.argv) > 2 else "checkout_history.jsonl"
+    count = convert_json_history(src_path, dest_path)
+    print(f"Converted {count} events from {src_path} to {dest_path}")
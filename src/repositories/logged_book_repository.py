@@ -0,0 +1,106 @@
+import json
+import os
+from src.domain.book import Book
+from src.repositories.cached_book_repository import CachedBookRepository
+from src.repositories.codecs import JsonCodec
+from src.repositories.file_lock import atomic_write, truncate_torn_tail
+
+class LoggedBookRepository(CachedBookRepository):
+    """CachedBookRepository that appends mutations to a JSONL log.
+
+    books.json is treated as a snapshot and every add/update/delete is
+    appended to books.json.log as one line, so a mutation costs O(1) I/O.
+    Loading replays the log over the snapshot. Once the log grows past
+    compact_threshold bytes it is folded into a fresh snapshot, which is
+    written to a temp file and swapped in with os.replace.
+    """
+
+    def __init__(
+        self,
+        filepath: str="books.json",
+        compact_threshold: int=4 * 1024 * 1024,
+        fsync: bool=True,
+        book_cls: type=Book,
+        codec: JsonCodec | None=None,
+    ):
+        super().__init__(filepath, book_cls, codec)
+        self.log_path = filepath + ".log"
+        self.compact_threshold = compact_threshold
+        self.fsync = fsync
+
+    def _file_stamp(self):
+        stamps = []
+        for path in (self.filepath, self.log_path):
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                stamps.append(None)
+                continue
+            stamps.append((st.st_mtime_ns, st.st_size))
+        return tuple(stamps)
+
+    def _load(self) -> None:
+        books = self.get_snapshot_books()
+        self._books = {b.book_id: b for b in books}
+        for record in self._read_log():
+            if record["op"] == "put":
+                book = self.book_cls.from_dict(record["book"])
+                self._books[book.book_id] = book
+            elif record["op"] == "delete":
+                self._books.pop(record["book_id"], None)
+        self._title_index = {}
+        for b in self._books.values():
+            self._index_title(b)
+
+    def get_snapshot_books(self) -> list[Book]:
+        if not os.path.exists(self.filepath):
+            return []
+        with open(self.filepath, 'rb') as f:
+            data = f.read()
+        return self.codec.decode_books(data, self.book_cls)
+
+    def _read_log(self):
+        try:
+            with open(self.log_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.endswith("\n"):
+                        # torn write from a crash; the record never committed
+                        break
+                    yield json.loads(line)
+        except FileNotFoundError:
+            return
+
+    def _append(self, records: list[dict]) -> None:
+        with self._lock:
+            with open(self.log_path, 'ab+') as f:
+                truncate_torn_tail(f)
+                f.seek(0, os.SEEK_END)
+                f.write("".join(json.dumps(r) + "\n" for r in records).encode('utf-8'))
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+                size = f.tell()
+            if size >= self.compact_threshold:
+                self.compact()
+            else:
+                self._stamp = self._file_stamp()
+
+    def _persist_put(self, books: list[Book]) -> None:
+        self._append([{"op": "put", "book": b.to_dict()} for b in books])
+
+    def _persist_delete(self, book_id: str) -> None:
+        self._append([{"op": "delete", "book_id": book_id}])
+
+    def compact(self) -> None:
+        """Fold the log into a new snapshot and truncate the log."""
+        with self._lock:
+            self._ensure_fresh()
+            atomic_write(
+                self.filepath,
+                self.codec.encode_books(list(self._books.values())),
+                fsync=True,
+            )
+            # replaying puts/deletes is idempotent, so a crash before this
+            # truncate just replays the old log over the new snapshot
+            open(self.log_path, 'w', encoding='utf-8').close()
+            self._stamp = self._file_stamp()
@@ -0,0 +1,188 @@
+import sqlite3
+from typing import Iterator, Optional
+from src.domain.book import Book
+from src.repositories.book_repository_protocol import (
+    BookRepositoryProtocol,
+    ConcurrentModificationError,
+)
+
+BOOK_COLUMNS = [
+    "book_id",
+    "title",
+    "author",
+    "genre",
+    "publication_year",
+    "page_count",
+    "average_rating",
+    "ratings_count",
+    "price_usd",
+    "publisher",
+    "language",
+    "format",
+    "in_print",
+    "sales_millions",
+    "last_checkout",
+    "available",
+    "publisher_email",
+    "version",
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS books (
+    book_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    author TEXT NOT NULL,
+    genre TEXT,
+    publication_year INTEGER,
+    page_count INTEGER,
+    average_rating REAL,
+    ratings_count INTEGER,
+    price_usd REAL,
+    publisher TEXT,
+    language TEXT,
+    format TEXT,
+    in_print INTEGER,
+    sales_millions REAL,
+    last_checkout TEXT,
+    available INTEGER,
+    publisher_email TEXT,
+    version INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_books_title ON books (title);
+CREATE INDEX IF NOT EXISTS idx_books_genre ON books (genre);
+CREATE INDEX IF NOT EXISTS idx_books_author ON books (author);
+"""
+
+_SELECT = f"SELECT {', '.join(BOOK_COLUMNS)} FROM books"
+INSERT_BOOK = (
+    f"INSERT INTO books ({', '.join(BOOK_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in BOOK_COLUMNS)})"
+)
+# insert unless a book with the same id is stored; unlike INSERT OR
+# IGNORE, other constraint violations (a NULL title) still raise
+INSERT_IGNORE_BOOK = f"{INSERT_BOOK} ON CONFLICT (book_id) DO NOTHING"
+# insert, or overwrite every column of the stored book with the same id
+UPSERT_BOOK = (
+    f"{INSERT_BOOK} ON CONFLICT (book_id) DO UPDATE SET "
+    f"{', '.join(f'{c} = excluded.{c}' for c in BOOK_COLUMNS[1:])}"
+)
+# compare-and-swap on version: matches no row if someone else updated first
+UPDATE_BOOK = (
+    f"UPDATE books SET {', '.join(c + ' = ?' for c in BOOK_COLUMNS[1:-1])}, "
+    "version = version + 1 WHERE book_id = ? AND version = ?"
+)
+
+
+def connect(db_path: str) -> sqlite3.Connection:
+    """Open a connection in WAL mode so readers don't block the writer."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
+
+
+def migrate_schema(conn: sqlite3.Connection) -> None:
+    """Add columns introduced after a database was created."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(books)")}
+    if "version" not in columns:
+        with conn:
+            conn.execute("ALTER TABLE books ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+
+
+def book_to_row(book: Book) -> tuple:
+    d = book.to_dict()
+    return tuple(d[c] for c in BOOK_COLUMNS)
+
+
+def row_to_book(row: tuple) -> Book:
+    data = dict(zip(BOOK_COLUMNS, row))
+    for flag in ("in_print", "available"):
+        if data[flag] is not None:
+            data[flag] = bool(data[flag])
+    return Book.from_dict(data)
+
+
+class SqliteBookRepository(BookRepositoryProtocol):
+    # every query is a constant string with ? placeholders, so sqlite3's
+    # statement cache prepares each one once per connection
+    def __init__(self, db_path: str="library.db"):
+        self.db_path = db_path
+        self.conn = connect(db_path)
+        self.conn.executescript(SCHEMA)
+        migrate_schema(self.conn)
+
+    def get_all_books(self) -> list[Book]:
+        return [row_to_book(r) for r in self.conn.execute(_SELECT)]
+
+    def iter_books(self) -> Iterator[Book]:
+        for row in self.conn.execute(_SELECT):
+            yield row_to_book(row)
+
+    def add_book(self, book:Book) -> str:
+        with self.conn:
+            self.conn.execute(INSERT_BOOK, book_to_row(book))
+        return book.book_id
+
+    def add_books(self, books: list[Book]) -> list[str]:
+        added = []
+        with self.conn:
+            for book in books:
+                if self.conn.execute(INSERT_IGNORE_BOOK, book_to_row(book)).rowcount:
+                    added.append(book.book_id)
+        return added
+
+    def find_book_by_name(self, query:str) -> list[Book]:
+        rows = self.conn.execute(_SELECT + " WHERE title = ?", (query,))
+        return [row_to_book(r) for r in rows]
+
+    def get_book_by_id(self, book_id: str) -> Optional[Book]:
+        row = self.conn.execute(_SELECT + " WHERE book_id = ?", (book_id,)).fetchone()
+        return row_to_book(row) if row else None
+
+    def get_books_by_ids(self, book_ids: list[str]) -> dict[str, Book]:
+        books = {}
+        ids = list(dict.fromkeys(book_ids))
+        # stay under SQLite's bound-parameter limit
+        for lo in range(0, len(ids), 500):
+            chunk = ids[lo:lo + 500]
+            rows = self.conn.execute(
+                f"{_SELECT} WHERE book_id IN ({', '.join('?' for _ in chunk)})", chunk
+            )
+            for row in rows:
+                book = row_to_book(row)
+                books[book.book_id] = book
+        return books
+
+    def update_book(self, updated_book: Book) -> bool:
+        return self.update_books([updated_book]) == 1
+
+    def _update(self, book: Book) -> bool:
+        row = book_to_row(book)
+        if self.conn.execute(UPDATE_BOOK, row[1:-1] + row[:1] + row[-1:]).rowcount:
+            return True
+        stored = self.conn.execute(
+            "SELECT version FROM books WHERE book_id = ?", (book.book_id,)
+        ).fetchone()
+        if stored is not None:
+            raise ConcurrentModificationError(book.book_id, book.version, stored[0])
+        return False
+
+    def update_books(self, updated_books: list[Book]) -> int:
+        # one transaction: a conflict rolls back the whole batch
+        with self.conn:
+            updated = [b for b in updated_books if self._update(b)]
+        for book in updated:
+            book.version += 1
+        return len(updated)
+
+    def delete_book(self, book_id: str) -> bool:
+        with self.conn:
+            cur = self.conn.execute("DELETE FROM books WHERE book_id = ?", (book_id,))
+        return cur.rowcount > 0
+
+    def catalog_version(self):
+        # data_version moves when another connection commits,
+        # total_changes when this one does
+        data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        return (data_version, self.conn.total_changes)
@@ -0,0 +1,65 @@
+from datetime import datetime
+from src.domain.checkout_history import CheckoutEvent
+from src.repositories.checkout_history_repository_protocol import (
+    CheckoutHistoryRepositoryProtocol,
+)
+from src.repositories.sqlite_book_repository import connect
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkout_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    book_id TEXT NOT NULL,
+    checkout_date TEXT,
+    return_date TEXT,
+    returned INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_history_book_checkout
+    ON checkout_history (book_id, checkout_date);
+"""
+
+_SELECT = "SELECT book_id, checkout_date, return_date, returned FROM checkout_history"
+INSERT_EVENT = (
+    "INSERT INTO checkout_history (book_id, checkout_date, return_date, returned) "
+    "VALUES (?, ?, ?, ?)"
+)
+
+
+def event_to_row(event: CheckoutEvent) -> tuple:
+    return (
+        event.book_id,
+        event.checkout_date.isoformat() if event.checkout_date else None,
+        event.return_date.isoformat() if event.return_date else None,
+        int(event.returned),
+    )
+
+
+def row_to_event(row: tuple) -> CheckoutEvent:
+    book_id, checkout_date, return_date, returned = row
+    return CheckoutEvent(
+        book_id=book_id,
+        checkout_date=datetime.fromisoformat(checkout_date) if checkout_date else None,
+        return_date=datetime.fromisoformat(return_date) if return_date else None,
+        returned=bool(returned),
+    )
+
+
+class SqliteCheckoutHistoryRepository(CheckoutHistoryRepositoryProtocol):
+    def __init__(self, db_path: str = "library.db"):
+        self.db_path = db_path
+        self.conn = connect(db_path)
+        self.conn.executescript(SCHEMA)
+
+    def add_event(self, event: CheckoutEvent) -> None:
+        with self.conn:
+            self.conn.execute(INSERT_EVENT, event_to_row(event))
+
+    def add_events(self, events: list[CheckoutEvent]) -> None:
+        with self.conn:
+            self.conn.executemany(INSERT_EVENT, (event_to_row(e) for e in events))
+
+    def get_history_for_book(self, book_id: str) -> list[CheckoutEvent]:
+        rows = self.conn.execute(_SELECT + " WHERE book_id = ? ORDER BY id", (book_id,))
+        return [row_to_event(r) for r in rows]
+
+    def get_history_all(self) -> list[CheckoutEvent]:
+        return [row_to_event(r) for r in self.conn.execute(_SELECT + " ORDER BY id")]
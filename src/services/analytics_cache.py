@@ -0,0 +1,71 @@
+from collections import OrderedDict
+from typing import Callable, Optional
+from src.domain.book import Book
+from src.services.book_analytics_service import BookAnalyticsService
+from src.services.book_frame import BookFrame
+from src.services.book_service import BookService
+
+def _freeze(value):
+    """A hashable stand-in for an argument; lists and dicts become tuples."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple((k, _freeze(v)) for k, v in sorted(value.items()))
+    if isinstance(value, set):
+        return frozenset(_freeze(v) for v in value)
+    return value
+
+
+class AnalyticsCache:
+    """Memoizes BookAnalyticsService results per catalog version.
+
+    Results are keyed by (method, args, catalog version), so any mutation
+    through the repository, or an external edit of the underlying file,
+    makes later calls miss and recompute. At most maxsize results are kept,
+    least recently used first out. Cached results are shared between
+    callers and must not be mutated. List and dict arguments are keyed by
+    their contents; a call with an argument that still isn't hashable is
+    computed without caching.
+
+    A miss computes over frame(), e.g. a callable returning the live
+    BookFrame, which must reflect the current catalog version; without
+    one every miss loads the catalog with book_svc.get_all_books().
+    """
+
+    def __init__(
+        self,
+        analytics_svc: BookAnalyticsService,
+        book_svc: BookService,
+        maxsize: int = 128,
+        frame: Optional[Callable[[], BookFrame | list[Book]]] = None,
+    ):
+        self.analytics_svc = analytics_svc
+        self.book_svc = book_svc
+        self.maxsize = maxsize
+        self.frame = frame or book_svc.get_all_books
+        self.hits = 0
+        self.misses = 0
+        self._results: OrderedDict = OrderedDict()
+
+    def get(self, method: str, *args, **kwargs):
+        key = (method, _freeze(args), _freeze(kwargs), self.book_svc.catalog_version())
+        try:
+            hash(key)
+        except TypeError:
+            self.misses += 1
+            return getattr(self.analytics_svc, method)(self.frame(), *args, **kwargs)
+        if key in self._results:
+            self.hits += 1
+            self._results.move_to_end(key)
+            return self._results[key]
+
+        self.misses += 1
+        books = self.frame()
+        result = getattr(self.analytics_svc, method)(books, *args, **kwargs)
+        self._results[key] = result
+        if len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+        return result
+
+    def clear(self) -> None:
+        self._results.clear()
@@ -1,136 +1,152 @@
 import numpy as np
 import pandas as pd
 from src.domain.book import Book
-import datetime
+from src.services.book_frame import BookFrame
+from src.services.grouped_aggregation import group_aggregate
+from typing import Iterable
 
 # Ground rules for numpy (applies to pandas too):
 # 1. keep numpy in the service layer ONLY
 # 2. methods take in books and return normal datatypes (not ndarrays)
+#
+# Every method accepts either list[Book] or a BookFrame. Passing a frame that
+# is kept up to date (see BookFrame) skips the list -> ndarray conversion.
 
-class BookAnalyticsService:
-
-    def average_price(self, books: list[Book]) -> float:
-        prices = np.array([b.price_usd for b in books if b.price_usd is not None], dtype=float)
-        return float(prices.mean().round(2))
-
-    def top_rated(self, books: list[Book], min_ratings: int = 1000, limit: int = 10):
-        ratings = np.array([b.average_rating for b in books])
-        counts = np.array([b.ratings_count for b in books])
-        
-        mask = counts >= min_ratings
-        filtered_books = np.array(books)[mask]
-        scores = ratings[mask]
-        sorted_idx = np.argsort(scores)[::-1]
-        return filtered_books[sorted_idx].tolist()[:limit]
-
-    def value_scores(self, books: list[Book]) -> dict[str, float]:
-        valid_books = [b for b in books if b.average_rating is not None and b.price_usd is not None]
-        if not valid_books:
-            return {}
-
-        ratings = np.array([b.average_rating for b in valid_books], dtype=float)
-        counts = np.array([b.ratings_count for b in valid_books], dtype=float)
-        prices = np.array([b.price_usd for b in valid_books], dtype=float)
-        scores = (ratings * np.log1p(counts)) / prices
-
-        return {book.book_id: float(score) for book, score in zip(valid_books, scores)}
-
+def _as_frame(books: list[Book] | BookFrame) -> BookFrame:
+    if isinstance(books, BookFrame):
+        return books
+    return BookFrame.from_books(books)
 
-    def top_rated_with_pandas(self, books: list, min_ratings: int = 1000, limit: int = 10) -> list:
-        df = pd.DataFrame([{
-            "book": b,
-            "avg": b.average_rating,
-            "count": b.ratings_count
-        } for b in books])
 
-        filtered = df[df["count"] >= min_ratings].sort_values("avg", ascending=False)
-        return filtered["book"].tolist()[:limit]
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest scores, best first, in O(N + k log k)."""
+    if k <= 0 or len(scores) == 0:
+        return np.array([], dtype=int)
+    if k < len(scores):
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
 
-    def value_scores_with_pandas(self, books: list, limit: int = 10) -> dict[str, float]:
-        df = pd.DataFrame([{
-            "book_id": b.book_id,
-            "avg": b.average_rating,
-            "count": b.ratings_count,
-            "price": b.price_usd
-        } for b in books])
 
-        df["score"] = df["avg"] * np.log1p(df["count"]) / df["price"]
+class BookAnalyticsService:
 
-        return (
-            df.sort_values("score", ascending=False)
-              .head(limit)
-              .set_index("book_id")["score"]
-              .astype(float)
-              .to_dict()
-        )
+    def average_price(self, books: Iterable[Book] | BookFrame) -> float:
+        if isinstance(books, BookFrame):
+            prices = books.column("price_usd")
+            prices = prices[~np.isnan(prices)]
+        else:
+            # fromiter lets a streamed catalog (BookService.iter_books) be
+            # consumed without holding every Book at once
+            prices = np.fromiter((b.price_usd for b in books if b.price_usd is not None), dtype=float)
+        return float(prices.mean().round(2))
 
-    def median_price_by_genre(self, books: list[Book]) -> dict[str, float]:
-        genres = np.array([b.genre for b in books])
-        prices = np.array([b.price_usd for b in books], dtype=float)
-        result = {}
+    def top_rated(self, books: list[Book] | BookFrame, min_ratings: int = 1000, limit: int = 10):
+        frame = _as_frame(books)
+        ratings = frame.column("average_rating")
+        counts = frame.column("ratings_count")
 
-        for genre in np.unique(genres):
-            mask = (genres == genre) & ~np.isnan(prices)
-            genre_prices = prices[mask]
-            result[str(genre)] = float(np.median(genre_prices))
+        eligible = np.flatnonzero((counts >= min_ratings) & ~np.isnan(ratings))
+        return frame.books_at(eligible[_top_k(ratings[eligible], limit)])
 
-        return result
+    def value_scores(self, books: list[Book] | BookFrame) -> dict[str, float]:
+        frame = _as_frame(books)
+        ratings = frame.column("average_rating")
+        counts = frame.column("ratings_count")
+        prices = frame.column("price_usd")
 
-    def median_genre_current_year(self, books: list[Book]) -> str:
-        current_year = 2026
-        genres = [
-            b.genre
-            for b in books
-            if b.last_checkout
-            and datetime.datetime.fromisoformat(b.last_checkout).year == current_year
-        ]
-
-        if not genres:
-            return ""
+        valid = np.flatnonzero(~np.isnan(ratings) & ~np.isnan(prices))
+        if len(valid) == 0:
+            return {}
+        scores = (ratings[valid] * np.log1p(counts[valid])) / prices[valid]
 
-        values, counts = np.unique(genres, return_counts=True)
-        return values[np.argmax(counts)]
+        return {
+            frame.book_at(row).book_id: float(score)
+            for row, score in zip(valid, scores)
+        }
 
-    def genre_counts(self, books: list[Book]) -> dict[str, int]:
-        genres = np.array([b.genre for b in books])
-        genres = genres[genres != None]
+    def top_value_scores(self, books: list[Book] | BookFrame, limit: int = 10) -> dict[str, float]:
+        frame = _as_frame(books)
+        ratings = frame.column("average_rating")
+        counts = frame.column("ratings_count")
+        prices = frame.column("price_usd")
 
-        values, counts = np.unique(genres, return_counts=True)
+        valid = np.flatnonzero(~np.isnan(ratings) & ~np.isnan(prices))
+        scores = (ratings[valid] * np.log1p(counts[valid])) / prices[valid]
+        top = _top_k(scores, limit)
 
         return {
-            str(genre): int(count)
-            for genre, count in zip(values, counts)
+            frame.book_at(valid[i]).book_id: float(scores[i])
+            for i in top
         }
 
 
-    def mean_rating_by_genre(self, books: list[Book]) -> dict[str, float]:
-        genres = np.array([b.genre for b in books])
-        ratings = np.array([b.average_rating for b in books], dtype=float)
+    def top_rated_with_pandas(self, books: list | BookFrame, min_ratings: int = 1000, limit: int = 10) -> list:
+        frame = _as_frame(books)
+        df = pd.DataFrame({
+            "avg": frame.column("average_rating"),
+            "count": frame.column("ratings_count"),
+        })
 
-        valid = (genres != None) & ~np.isnan(ratings)
-        genres = genres[valid]
-        ratings = ratings[valid]
-
-        result = {}
+        filtered = df[df["count"] >= min_ratings].sort_values("avg", ascending=False)
+        return frame.books_at(filtered.index[:limit])
 
-        for genre in np.unique(genres):
-            mask = genres == genre
-            result[str(genre)] = float(np.mean(ratings[mask]))
+    def value_scores_with_pandas(self, books: list | BookFrame, limit: int = 10) -> dict[str, float]:
+        frame = _as_frame(books)
+        df = pd.DataFrame({
+            "book_id": frame.book_ids,
+            "avg": frame.column("average_rating"),
+            "count": frame.column("ratings_count"),
+            "price": frame.column("price_usd"),
+        })
 
-        return result
+        df["score"] = df["avg"] * np.log1p(df["count"]) / df["price"]
 
-    def median_ratings_count_by_genre(self, books: list[Book]) -> dict[str, float]:
-        genres = np.array([b.genre for b in books])
-        counts = np.array([b.ratings_count for b in books], dtype=float)
+        return (
+            df.nlargest(limit, "score")
+              .set_index("book_id")["score"]
+              .astype(float)
+              .to_dict()
+        )
 
-        valid = (genres != None) & ~np.isnan(counts)
-        genres = genres[valid]
-        counts = counts[valid]
+    def median_price_by_genre(self, books: list[Book] | BookFrame) -> dict[str, float]:
+        stats = group_aggregate(_as_frame(books), "genre", "price_usd", ["median"])
+        return {genre: s["median"] for genre, s in stats.items()}
 
-        result = {}
+    def median_genre_current_year(self, books: list[Book] | BookFrame) -> str:
+        current_year = 2026
+        frame = _as_frame(books)
+        genres = frame.column("genre")
+        years = frame.column("last_checkout").astype("datetime64[Y]")
 
-        for genre in np.unique(genres):
-            mask = genres == genre
-            result[str(genre)] = float(np.median(counts[mask]))
+        mask = (years == np.datetime64(str(current_year), "Y")) & (genres >= 0)
+        if not mask.any():
+            return ""
 
-        return result
+        counts = np.bincount(genres[mask])
+        return frame.categories["genre"][int(np.argmax(counts))]
+
+    def genre_counts(self, books: list[Book] | BookFrame) -> dict[str, int]:
+        stats = group_aggregate(_as_frame(books), "genre")
+        return {genre: s["count"] for genre, s in stats.items()}
+
+    def mean_rating_by_genre(self, books: list[Book] | BookFrame) -> dict[str, float]:
+        stats = group_aggregate(_as_frame(books), "genre", "average_rating", ["mean"])
+        return {genre: s["mean"] for genre, s in stats.items()}
+
+    def median_ratings_count_by_genre(self, books: list[Book] | BookFrame) -> dict[str, float]:
+        stats = group_aggregate(_as_frame(books), "genre", "ratings_count", ["median"])
+        return {genre: s["median"] for genre, s in stats.items()}
+
+    def grouped_stats(
+        self,
+        books: list[Book] | BookFrame,
+        keys: str | list[str],
+        field: str | None = None,
+        aggs: list[str] = ("count",),
+    ) -> dict:
+        """Any of count/sum/mean/median/min/max of field, grouped by keys.
+
+        e.g. grouped_stats(books, ["genre", "format"], "price_usd", ["mean", "max"])
+        """
+        return group_aggregate(_as_frame(books), keys, field, list(aggs))
@@ -0,0 +1,377 @@
+import argparse
+import datetime
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator, Optional
+import numpy as np
+import pandas as pd
+from src.repositories.codecs import FastJsonCodec
+from src.repositories.json_stream import iter_json_array_chunks
+
+# Column order of the cleaned output; matches Book.to_dict
+OUTPUT_FIELDS = [
+    "book_id",
+    "title",
+    "author",
+    "genre",
+    "publication_year",
+    "page_count",
+    "average_rating",
+    "ratings_count",
+    "price_usd",
+    "publisher",
+    "language",
+    "format",
+    "in_print",
+    "sales_millions",
+    "last_checkout",
+    "available",
+    "publisher_email",
+    "version",
+]
+REQUIRED_FIELDS = ["book_id", "title", "author"]
+# inclusive valid range per numeric field; None leaves that side open
+NUMERIC_RANGES = {
+    "publication_year": (1450, datetime.date.today().year + 1),
+    "page_count": (1, None),
+    "average_rating": (0, 5),
+    "ratings_count": (0, None),
+    "price_usd": (0, None),
+    "sales_millions": (0, None),
+    "version": (0, None),
+}
+INT_FIELDS = ["publication_year", "page_count", "ratings_count", "version"]
+BOOL_FIELDS = ["in_print", "available"]
+PLACEHOLDERS = {"", "n/a", "na", "none", "null", "unknown", "-", "?"}
+# the usual spellings, so whole columns can be checked with isin() without
+# lower-casing every value first
+_PLACEHOLDER_SPELLINGS = sorted(
+    {s for p in PLACEHOLDERS for s in (p, p.upper(), p.title(), p.capitalize())}
+)
+BOOL_VALUES = {
+    "true": True, "t": True, "yes": True, "y": True, "1": True,
+    "false": False, "f": False, "no": False, "n": False, "0": False,
+}
+LANGUAGE_SYNONYMS = {
+    "english": "English", "eng": "English", "en": "English",
+    "french": "French", "fre": "French", "fra": "French", "fr": "French",
+    "spanish": "Spanish", "spa": "Spanish", "es": "Spanish",
+    "german": "German", "ger": "German", "deu": "German", "de": "German",
+}
+FORMAT_SYNONYMS = {
+    "paperback": "Paperback", "paper back": "Paperback", "softcover": "Paperback",
+    "hardcover": "Hardcover", "hard cover": "Hardcover", "hardback": "Hardcover",
+    "audiobook": "Audiobook", "audio book": "Audiobook", "audio": "Audiobook",
+    "ebook": "Ebook", "e-book": "Ebook", "e book": "Ebook", "kindle": "Ebook",
+}
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[A-Za-z]{2,}$")
+
+_MISSING = object()
+
+
+def _parse_number(value) -> float:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return np.nan
+    return number if np.isfinite(number) else np.nan
+
+
+def _is_placeholder(value) -> bool:
+    return isinstance(value, str) and value.strip().lower() in PLACEHOLDERS
+
+
+@dataclass
+class CleaningReport:
+    """What the cleaner changed: rejected values per field and reason.
+
+    A rejected value is replaced by None (missing); rows that lack a
+    required field are dropped and counted under that field as well.
+    examples keeps the first few offending raw values per field.
+    """
+
+    rows_in: int = 0
+    rows_out: int = 0
+    rejections: dict[str, Counter] = field(default_factory=dict)
+    examples: dict[str, list] = field(default_factory=dict)
+    max_examples: int = 3
+
+    def reject(self, field_name: str, reason: str, values: pd.Series) -> None:
+        if values.empty:
+            return
+        self.rejections.setdefault(field_name, Counter())[reason] += len(values)
+        examples = self.examples.setdefault(field_name, [])
+        if len(examples) < self.max_examples:
+            examples.extend(values.head(self.max_examples - len(examples)).tolist())
+
+    def merge(self, other: 'CleaningReport') -> None:
+        self.rows_in += other.rows_in
+        self.rows_out += other.rows_out
+        for name, reasons in other.rejections.items():
+            self.rejections.setdefault(name, Counter()).update(reasons)
+        for name, values in other.examples.items():
+            examples = self.examples.setdefault(name, [])
+            examples.extend(values[:self.max_examples - len(examples)])
+
+    @property
+    def rows_dropped(self) -> int:
+        return self.rows_in - self.rows_out
+
+    def summary(self) -> str:
+        lines = [f"{self.rows_in} rows in, {self.rows_out} rows out ({self.rows_dropped} dropped)"]
+        for name in sorted(self.rejections):
+            reasons = ", ".join(f"{r}={n}" for r, n in self.rejections[name].most_common())
+            lines.append(f"  {name}: {reasons}  e.g. {self.examples.get(name, [])!r}")
+        return "\n".join(lines)
+
+
+def _map_unique(values: pd.Series, fn: Callable) -> pd.Series:
+    """Apply fn once per distinct value instead of once per row.
+
+    Categorical and boolean columns only have a handful of distinct values,
+    so this is the vectorized path for cleanups that need Python logic.
+    None/NaN is mapped to fn(_MISSING). Unhashable values (lists, dicts
+    from nested JSON) can't be factorized and get one fn call each.
+    """
+    try:
+        codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    except TypeError:
+        nested = values.map(lambda v: isinstance(v, (list, dict)))
+        result = pd.Series(None, index=values.index, dtype=object)
+        result[~nested] = _map_unique(values[~nested], fn)
+        result[nested] = [fn(v) for v in values[nested]]
+        return result
+    lookup = np.empty(len(uniques) + 1, dtype=object)
+    lookup[:-1] = [fn(u) for u in uniques]
+    lookup[-1] = fn(_MISSING)
+    return pd.Series(lookup[codes], index=values.index)
+
+
+def _placeholders(values: pd.Series, failed: pd.Series) -> pd.Series:
+    """Which of the values that failed to parse are placeholders like "N/A"."""
+    found = _map_unique(values[failed], _is_placeholder).astype(bool)
+    return found.reindex(values.index, fill_value=False)
+
+
+class BookCleaningService:
+    """Column-at-a-time cleaning of raw book records (e.g. books_dirty.json).
+
+    Numbers are coerced with pd.to_numeric and range-checked, booleans and
+    categorical synonyms are mapped per distinct value, dates are parsed
+    with pd.to_datetime (converted to UTC when they carry an offset), and
+    every value that can't be salvaged is set to
+    None and counted in a CleaningReport. clean_file streams a JSON array
+    in chunks so memory stays bounded by chunk_size.
+    """
+
+    def __init__(
+        self,
+        numeric_ranges: Optional[dict[str, tuple]] = None,
+        language_synonyms: Optional[dict[str, str]] = None,
+        format_synonyms: Optional[dict[str, str]] = None,
+    ):
+        self.numeric_ranges = numeric_ranges or NUMERIC_RANGES
+        self.language_synonyms = language_synonyms or LANGUAGE_SYNONYMS
+        self.format_synonyms = format_synonyms or FORMAT_SYNONYMS
+
+    def clean_frame(self, raw: pd.DataFrame) -> tuple[pd.DataFrame, CleaningReport]:
+        report = CleaningReport(rows_in=len(raw))
+        columns = {}
+        for name in OUTPUT_FIELDS:
+            values = raw[name] if name in raw else pd.Series(None, index=raw.index, dtype=object)
+            if name in self.numeric_ranges:
+                columns[name] = self._clean_numeric(name, values, report)
+            elif name in BOOL_FIELDS:
+                columns[name] = self._clean_bool(name, values, report)
+            elif name == "language":
+                columns[name] = self._clean_category(name, values, self.language_synonyms, report)
+            elif name == "format":
+                columns[name] = self._clean_category(name, values, self.format_synonyms, report)
+            elif name == "last_checkout":
+                columns[name] = self._clean_date(name, values, report)
+            elif name == "publisher_email":
+                columns[name] = self._clean_email(name, values, report)
+            elif name == "book_id":
+                # ids are never padded or re-cased; only drop placeholders
+                # and nested values (which couldn't be dict keys either)
+                nested = values.map(type).isin([list, dict])
+                report.reject(name, "not_text", values[nested])
+                columns[name] = values.where(values.notna() & ~values.isin(_PLACEHOLDER_SPELLINGS) & ~nested, None)
+            else:
+                columns[name] = self._clean_text(name, values, report)
+        # raw dumps carry no version; a missing or rejected one starts at 0
+        # like a new Book, a valid one (re-cleaning a catalog) is kept
+        columns["version"] = columns["version"].fillna(0)
+        cleaned = pd.DataFrame(columns, index=raw.index)
+
+        keep = pd.Series(True, index=raw.index)
+        for name in REQUIRED_FIELDS:
+            missing = cleaned[name].isna() & keep
+            source = raw[name] if name in raw else cleaned[name]
+            report.reject(name, "missing", source[missing])
+            keep &= ~missing
+        cleaned = cleaned[keep].reset_index(drop=True)
+        report.rows_out = len(cleaned)
+        return cleaned, report
+
+    def _clean_numeric(self, name: str, values: pd.Series, report: CleaningReport) -> pd.Series:
+        if values.dtype == object or pd.api.types.is_bool_dtype(values):
+            # split by type first: JSON numbers convert in one astype, and
+            # strings (mostly a few distinct placeholders) are parsed once
+            # per distinct value. bools are neither, so True/False don't
+            # become 1/0 (an all-bool column arrives as bool dtype)
+            values = values.astype(object)
+            types = values.map(type)
+            numbers = pd.Series(np.nan, index=values.index)
+            is_number = types.isin([int, float])
+            numbers[is_number] = values[is_number].astype(float)
+            is_str = types == str
+            if is_str.any():
+                numbers[is_str] = _map_unique(values[is_str], _parse_number).astype(float)
+        else:
+            numbers = pd.to_numeric(values, errors="coerce").astype(float)
+        failed = numbers.isna() & values.notna()
+        if failed.any():
+            placeholder = _placeholders(values, failed)
+            report.reject(name, "placeholder", values[placeholder])
+            report.reject(name, "not_numeric", values[failed & ~placeholder])
+
+        lo, hi = self.numeric_ranges[name]
+        bad = pd.Series(False, index=values.index)
+        if lo is not None:
+            bad |= numbers < lo
+        if hi is not None:
+            bad |= numbers > hi
+        report.reject(name, "out_of_range", values[bad])
+        numbers = numbers.mask(bad)
+
+        if name in INT_FIELDS:
+            fractional = numbers.notna() & (numbers % 1 != 0)
+            report.reject(name, "not_integer", values[fractional])
+            return numbers.mask(fractional).astype("Int64")
+        return numbers.astype("Float64")
+
+    def _clean_bool(self, name: str, values: pd.Series, report: CleaningReport) -> pd.Series:
+        def parse(value):
+            if value is _MISSING:
+                return None
+            if isinstance(value, (bool, np.bool_)):
+                return bool(value)
+            if isinstance(value, (int, float)) and value in (0, 1):
+                return bool(value)
+            if isinstance(value, str):
+                return BOOL_VALUES.get(value.strip().lower(), _MISSING)
+            return _MISSING
+
+        parsed = _map_unique(values, parse)
+        failed = parsed.isin([_MISSING])
+        report.reject(name, "not_boolean", values[failed])
+        return parsed.mask(failed, None).astype("boolean")
+
+    def _clean_category(self, name: str, values: pd.Series, synonyms: dict[str, str], report: CleaningReport) -> pd.Series:
+        def normalize(value):
+            if value is _MISSING or _is_placeholder(value):
+                return None
+            if not isinstance(value, str):
+                return _MISSING
+            value = value.strip()
+            return synonyms.get(value.lower(), value)
+
+        categories = _map_unique(values, normalize)
+        invalid = categories.isin([_MISSING])
+        report.reject(name, "not_text", values[invalid])
+        return categories.mask(invalid, None)
+
+    def _clean_text(self, name: str, values: pd.Series, report: CleaningReport) -> pd.Series:
+        def normalize(value):
+            if value is _MISSING or _is_placeholder(value):
+                return None
+            if isinstance(value, (list, dict)):
+                return _MISSING
+            return value.strip() if isinstance(value, str) else str(value)
+
+        text = _map_unique(values, normalize)
+        invalid = text.isin([_MISSING])
+        report.reject(name, "not_text", values[invalid])
+        return text.mask(invalid, None)
+
+    def _clean_date(self, name: str, values: pd.Series, report: CleaningReport) -> pd.Series:
+        # utc=True: one chunk may mix offsets (and naive values, taken as
+        # UTC), which pandas otherwise refuses to put in one column
+        parsed = pd.to_datetime(values.astype(object), errors="coerce", format="ISO8601", utc=True)
+        parsed = parsed.dt.tz_localize(None)
+        failed = parsed.isna() & values.notna()
+        if failed.any():
+            placeholder = _placeholders(values, failed)
+            report.reject(name, "placeholder", values[placeholder])
+            report.reject(name, "not_date", values[failed & ~placeholder])
+        text = np.datetime_as_string(parsed.to_numpy(dtype="datetime64[us]"), unit="us")
+        return pd.Series(text, index=values.index, dtype=object).where(parsed.notna(), None)
+
+    def _clean_email(self, name: str, values: pd.Series, report: CleaningReport) -> pd.Series:
+        def normalize(value):
+            if value is _MISSING or _is_placeholder(value):
+                return None
+            value = str(value).strip().lower()
+            return value if EMAIL_PATTERN.match(value) else _MISSING
+
+        emails = _map_unique(values, normalize)
+        invalid = emails.isin([_MISSING])
+        report.reject(name, "invalid_email", values[invalid])
+        return emails.mask(invalid, None)
+
+    def clean_records(self, records: list[dict]) -> tuple[list[dict], CleaningReport]:
+        """Clean a list of raw dicts; the result can go to Book.from_dict."""
+        cleaned, report = self.clean_frame(pd.DataFrame.from_records(records))
+        rows = cleaned.astype(object).where(cleaned.notna(), None)
+        return rows.to_dict("records"), report
+
+    def iter_chunks(self, batches: Iterable[list[dict]], chunk_size: int = 100_000) -> Iterator[tuple[pd.DataFrame, CleaningReport]]:
+        """Regroup batches of raw records into chunk_size frames and clean each."""
+        chunk = []
+        for batch in batches:
+            chunk.extend(batch)
+            while len(chunk) >= chunk_size:
+                yield self.clean_frame(pd.DataFrame.from_records(chunk[:chunk_size]))
+                chunk = chunk[chunk_size:]
+        if chunk:
+            yield self.clean_frame(pd.DataFrame.from_records(chunk))
+
+    def clean_file(self, src: str, dest: Optional[str] = None, chunk_size: int = 100_000) -> CleaningReport:
+        """Clean a JSON array file chunk by chunk, writing the result to dest.
+
+        Without dest only the report is produced.
+        """
+        report = CleaningReport()
+        out = open(dest, "w", encoding="utf-8") if dest else None
+        try:
+            if out:
+                out.write("[")
+            first = True
+            with open(src, "r", encoding="utf-8") as f:
+                batches = iter_json_array_chunks(f, loads=FastJsonCodec().loads)
+                for cleaned, chunk_report in self.iter_chunks(batches, chunk_size):
+                    report.merge(chunk_report)
+                    if out and len(cleaned):
+                        # to_json writes the nullable dtypes as ints/bools/null
+                        body = cleaned.to_json(orient="records")[1:-1]
+                        out.write(body if first else "," + body)
+                        first = False
+            if out:
+                out.write("]")
+        finally:
+            if out:
+                out.close()
+        return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Clean a raw book catalog and report what was rejected.")
+    parser.add_argument("src", nargs="?", default="books_dirty.json")
+    parser.add_argument("dest", nargs="?", default="books_clean.json")
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    report = BookCleaningService().clean_file(args.src, args.dest, args.chunk_size)
+    print(report.summary())
@@ -0,0 +1,17 @@
+from typing import Protocol
+from src.domain.book import Book
+
+class BookEventListener(Protocol):
+    """Something that keeps derived state in step with catalog mutations.
+
+    Subscribe it with BookService.subscribe / CheckoutService.subscribe.
+    """
+
+    def book_added(self, book: Book) -> None:
+        ...
+
+    def book_updated(self, book: Book) -> None:
+        ...
+
+    def book_deleted(self, book_id: str) -> None:
+        ...
@@ -0,0 +1,214 @@
+import datetime
+import numpy as np
+from typing import Iterable, Optional
+from src.domain.book import Book
+from src.repositories.binary_catalog import BinaryCatalog
+
+NUMERIC_FIELDS = [
+    "publication_year",
+    "page_count",
+    "average_rating",
+    "ratings_count",
+    "price_usd",
+    "sales_millions",
+]
+FLAG_FIELDS = ["in_print", "available"]
+CATEGORICAL_FIELDS = ["genre", "author", "publisher", "language", "format"]
+
+
+def _flag(value) -> int:
+    if value is None:
+        return -1
+    return 1 if value else 0
+
+
+def _timestamp(value) -> np.datetime64:
+    """last_checkout as naive wall-clock time, NaT if missing or unparseable.
+
+    A UTC offset is dropped rather than applied, so the date is the one
+    written down (as datetime.fromisoformat(value).year always gave).
+    """
+    try:
+        dt = datetime.datetime.fromisoformat(value) if value else None
+    except (TypeError, ValueError):
+        dt = None
+    if dt is None:
+        return np.datetime64("NaT", "us")
+    return np.datetime64(dt.replace(tzinfo=None), "us")
+
+
+class BookFrame:
+    """Columnar snapshot of the catalog for BookAnalyticsService.
+
+    Numeric fields are float64 arrays with NaN for missing values, flags are
+    int8 (1/0, -1 for missing) and genre/author/publisher/language/format are int32
+    codes into self.categories (-1 for missing). Built once, then kept up to
+    date through the BookEventListener methods instead of being rebuilt from
+    list[Book] on every analytics call.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        capacity = max(capacity, 1)
+        self._n = 0
+        self._books: list[Book] = []
+        self._rows: dict[str, int] = {}
+        self._catalog: Optional[BinaryCatalog] = None
+        self.categories: dict[str, list[str]] = {f: [] for f in CATEGORICAL_FIELDS}
+        self._category_codes: dict[str, dict[str, int]] = {f: {} for f in CATEGORICAL_FIELDS}
+        self._columns: dict[str, np.ndarray] = {}
+        for f in NUMERIC_FIELDS:
+            self._columns[f] = np.full(capacity, np.nan)
+        for f in FLAG_FIELDS:
+            self._columns[f] = np.full(capacity, -1, dtype=np.int8)
+        for f in CATEGORICAL_FIELDS:
+            self._columns[f] = np.full(capacity, -1, dtype=np.int32)
+        self._columns["last_checkout"] = np.full(capacity, np.datetime64("NaT", "us"))
+
+    @classmethod
+    def from_books(cls, books: Iterable[Book]) -> 'BookFrame':
+        books = list(books)
+        frame = cls(capacity=len(books))
+        frame._books = books
+        frame._rows = {b.book_id: i for i, b in enumerate(books)}
+        frame._n = len(books)
+        n = len(books)
+        for f in NUMERIC_FIELDS:
+            frame._columns[f][:n] = np.array(
+                [getattr(b, f) for b in books], dtype=float
+            )
+        for f in FLAG_FIELDS:
+            frame._columns[f][:n] = [_flag(getattr(b, f)) for b in books]
+        for f in CATEGORICAL_FIELDS:
+            frame._columns[f][:n] = [frame._code(f, getattr(b, f)) for b in books]
+        frame._columns["last_checkout"][:n] = [_timestamp(b.last_checkout) for b in books]
+        return frame
+
+    @classmethod
+    def from_binary_catalog(cls, catalog: BinaryCatalog) -> 'BookFrame':
+        """Frame whose columns are zero-copy views of a memory-mapped catalog.
+
+        Books are only decoded from the catalog when book_at needs them, and
+        the columns are copied out of the mapping on the first mutation.
+        """
+        frame = cls(capacity=1)
+        frame._catalog = catalog
+        frame._n = len(catalog)
+        frame._books = [None] * frame._n
+        frame._rows = {book_id: i for i, book_id in enumerate(catalog.book_ids())}
+        for f in NUMERIC_FIELDS:
+            frame._columns[f] = np.frombuffer(catalog.column(f), dtype=np.float64)
+        for f in FLAG_FIELDS:
+            frame._columns[f] = np.frombuffer(catalog.column(f), dtype=np.int8)
+        for f in CATEGORICAL_FIELDS:
+            frame._columns[f] = np.frombuffer(catalog.column(f), dtype=np.int32)
+            frame.categories[f] = list(catalog.labels(f))
+            frame._category_codes[f] = {label: i for i, label in enumerate(frame.categories[f])}
+        frame._columns["last_checkout"] = np.frombuffer(
+            catalog.column("last_checkout"), dtype="datetime64[us]"
+        )
+        return frame
+
+    def __len__(self) -> int:
+        return self._n
+
+    def column(self, name: str) -> np.ndarray:
+        """Live view of one column; do not write to it."""
+        return self._columns[name][:self._n]
+
+    def labels(self, name: str) -> np.ndarray:
+        """Category labels of a categorical column, indexable by its codes."""
+        return np.array(self.categories[name], dtype=object)
+
+    def code_of(self, field: str, value: str) -> Optional[int]:
+        """Code of a category label, or None if no book has that label."""
+        return self._category_codes[field].get(value)
+
+    def book_at(self, row: int) -> Book:
+        book = self._books[row]
+        if book is None:
+            book = self._books[row] = self._catalog.get_book(row)
+        return book
+
+    def books_at(self, rows: Iterable[int]) -> list[Book]:
+        return [self.book_at(int(r)) for r in rows]
+
+    @property
+    def book_ids(self) -> list[str]:
+        ids = [None] * self._n
+        for book_id, row in self._rows.items():
+            ids[row] = book_id
+        return ids
+
+    def _code(self, field: str, value) -> int:
+        if value is None:
+            return -1
+        codes = self._category_codes[field]
+        code = codes.get(value)
+        if code is None:
+            code = len(self.categories[field])
+            codes[value] = code
+            self.categories[field].append(value)
+        return code
+
+    def _grow(self) -> None:
+        capacity = max(len(self._columns["price_usd"]) * 2, 1)
+        for name, col in self._columns.items():
+            grown = np.empty(capacity, dtype=col.dtype)
+            grown[:len(col)] = col
+            self._columns[name] = grown
+
+    def _write_row(self, row: int, book: Book) -> None:
+        for f in NUMERIC_FIELDS:
+            value = getattr(book, f)
+            self._columns[f][row] = np.nan if value is None else value
+        for f in FLAG_FIELDS:
+            self._columns[f][row] = _flag(getattr(book, f))
+        for f in CATEGORICAL_FIELDS:
+            self._columns[f][row] = self._code(f, getattr(book, f))
+        self._columns["last_checkout"][row] = _timestamp(book.last_checkout)
+
+    def _ensure_writable(self) -> None:
+        if not self._columns["price_usd"].flags.writeable:
+            # still mapped from a BinaryCatalog; copy before the first write
+            for name, col in self._columns.items():
+                self._columns[name] = col.copy()
+
+    def upsert(self, book: Book) -> None:
+        self._ensure_writable()
+        row = self._rows.get(book.book_id)
+        if row is None:
+            if self._n == len(self._columns["price_usd"]):
+                self._grow()
+            row = self._n
+            self._n += 1
+            self._books.append(book)
+            self._rows[book.book_id] = row
+        else:
+            self._books[row] = book
+        self._write_row(row, book)
+
+    def remove(self, book_id: str) -> bool:
+        row = self._rows.pop(book_id, None)
+        if row is None:
+            return False
+        self._ensure_writable()
+        last = self._n - 1
+        if row != last:
+            # move the last row into the hole so columns stay dense
+            for col in self._columns.values():
+                col[row] = col[last]
+            moved = self.book_at(last)
+            self._books[row] = moved
+            self._rows[moved.book_id] = row
+        self._books.pop()
+        self._n -= 1
+        return True
+
+    def book_added(self, book: Book) -> None:
+        self.upsert(book)
+
+    def book_updated(self, book: Book) -> None:
+        self.upsert(book)
+
+    def book_deleted(self, book_id: str) -> None:
+        self.remove(book_id)
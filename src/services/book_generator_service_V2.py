@@ -1,141 +1,264 @@
-import json
-import random
-import uuid
+import argparse
+import os
 from datetime import datetime, timedelta
+from typing import Iterator, Optional
 import numpy as np
+from src.repositories.codecs import FastJsonCodec
 
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
 
-def generate_books_json(filename="books.json", count=500, seed=None):
+GENRES = [
+    "Fantasy",
+    "Sci-Fi",
+    "Non-Fiction",
+    "Mystery",
+    "Romance",
+    "Technology",
+    "History",
+]
+# make Fantasy and Sci-Fi more popular
+GENRE_WEIGHTS = np.array([0.28, 0.24, 0.12, 0.10, 0.08, 0.10, 0.08])
+GENRE_WEIGHTS = GENRE_WEIGHTS / GENRE_WEIGHTS.sum()
+
+PUBLISHERS = [
+    "North Star Press",
+    "Emerald House",
+    "Atlas Publishing",
+    "Blue River Books",
+]
+
+FORMATS = ["Hardcover", "Paperback", "Ebook", "Audiobook"]
+
+AUTHORS = [f"Author {k}" for k in range(1, 80)]
+
+# Publication year distribution: fewer before 1950, increasing after 1950
+YEARS = np.arange(1850, 2026)
+YEAR_WEIGHTS = np.where(YEARS <= 1950, 0.2, 1.0 + (YEARS - 1950) / (2025 - 1950))
+YEAR_WEIGHTS = YEAR_WEIGHTS / YEAR_WEIGHTS.sum()
+
+# make popularity multipliers from GENRE_WEIGHTS (centered on 1.0)
+# positive values boost ratings_count and sales for popular genres
+# strengthen the effect so popular genres (Fantasy, Sci‑Fi) get noticeably higher counts
+GENRE_POP_MULT = 1.0 + (GENRE_WEIGHTS - GENRE_WEIGHTS.mean()) * 4.0
+# stronger per-genre rating bias so popular genres tend to be rated higher
+GENRE_RATING_BIAS = (GENRE_WEIGHTS - GENRE_WEIGHTS.mean()) * 1.2
+
+# Correlated latent variables:
+# z0 -> price latent, z1 -> average_rating latent, z2 -> ratings_count latent
+LATENT_COV = np.array([[1.0, 0.7, 0.3], [0.7, 1.0, 0.6], [0.3, 0.6, 1.0]])
+_LATENT_CHOLESKY = np.linalg.cholesky(LATENT_COV)
+
+# log1p(ratings_count) is scaled by this in the sales score. It used to be
+# the max over the generated rows, which needs every row up front and made
+# sales depend on count; exp(4.5 + 0.9 * 3) is ratings_count at +3 sigma
+RATINGS_COUNT_LOG_SCALE = 4.5 + 0.9 * 3.0
+
+FIELDS = [
+    "book_id",
+    "title",
+    "author",
+    "genre",
+    "publication_year",
+    "page_count",
+    "average_rating",
+    "ratings_count",
+    "price_usd",
+    "publisher",
+    "language",
+    "format",
+    "in_print",
+    "sales_millions",
+    "last_checkout",
+    "available",
+]
+
+# a Struct per row encodes to the same object as a dict but is far cheaper
+# to build (map(_Record, *columns) never enters the interpreter loop)
+_Record = msgspec.defstruct("_Record", FIELDS) if msgspec else None
+
+_HEX = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+_UUID_HEX_COLUMNS = [i for i in range(36) if i not in (8, 13, 18, 23)]
+
+
+def uuid4_strings(rng: np.random.Generator, n: int) -> list[str]:
+    """n random (version 4) UUID strings drawn from rng, so seeded runs repeat."""
+    raw = np.frombuffer(rng.bytes(16 * n), dtype=np.uint8).reshape(n, 16).copy()
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40  # version 4
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80  # RFC 4122 variant
+    text = np.full((n, 36), ord("-"), dtype=np.uint8)
+    digits = np.empty((n, 32), dtype=np.uint8)
+    digits[:, 0::2] = _HEX[raw >> 4]
+    digits[:, 1::2] = _HEX[raw & 0x0F]
+    text[:, _UUID_HEX_COLUMNS] = digits
+    joined = text.tobytes().decode("ascii")
+    return [joined[i:i + 36] for i in range(0, 36 * n, 36)]
+
+
+def generate_columns(rng: np.random.Generator, start: int, n: int, now: datetime) -> dict[str, np.ndarray]:
+    """Draw books start + 1 .. start + n as NumPy columns (plus id/title lists)."""
+    z = rng.standard_normal((n, 3)) @ _LATENT_CHOLESKY.T
+    genre = rng.choice(len(GENRES), size=n, p=GENRE_WEIGHTS)
+
+    # average_rating in [1.0, 5.0] (mean ~3.2, sd ~0.6), plus the genre bias
+    average_rating = np.clip(np.round(z[:, 1] * 0.6 + 3.2, 2), 1.0, 5.0)
+    average_rating = np.clip(np.round(average_rating + GENRE_RATING_BIAS[genre], 2), 1.0, 5.0)
+    # log-scale price so a higher latent means a substantially higher price
+    price_usd = np.round(np.clip(np.exp(z[:, 0] * 0.45 + 2.2), 3.99, 299.99), 2)
+    # heavy-tailed ratings_count, boosted for popular genres
+    ratings_count = np.round(np.clip(np.exp(z[:, 2] * 0.9 + 4.5), 0, 200000))
+    ratings_count = np.round(np.clip(ratings_count * GENRE_POP_MULT[genre], 0, 200000)).astype(np.int64)
+    # rating => ~0.6 of the sales score, popularity the rest
+    score = (average_rating / 5.0) * 0.6 + (np.log1p(ratings_count) / RATINGS_COUNT_LOG_SCALE) * 0.4
+    sales_millions = np.round(np.clip(rng.normal(loc=score * 10.0, scale=1.5), 0.01, 200.0), 2)
+
+    six_months_ago = np.datetime64(now - timedelta(days=182), "us")
+    offsets = rng.integers(0, 183, n) * 86_400_000_000 + rng.integers(0, 80000, n) * 1_000_000
+    last_checkout = six_months_ago + offsets.astype("timedelta64[us]")
+
+    return {
+        "book_id": uuid4_strings(rng, n),
+        "title": [f"Book Title {i}" for i in range(start + 1, start + n + 1)],
+        "author": rng.integers(0, len(AUTHORS), n),
+        "genre": genre,
+        "publication_year": rng.choice(YEARS, size=n, p=YEAR_WEIGHTS),
+        "page_count": rng.integers(80, 1200, n),
+        "average_rating": average_rating,
+        "ratings_count": ratings_count,
+        "price_usd": price_usd,
+        "publisher": rng.integers(0, len(PUBLISHERS), n),
+        "format": rng.integers(0, len(FORMATS), n),
+        "in_print": rng.random(n) < 0.8,
+        "sales_millions": sales_millions,
+        "last_checkout": last_checkout,
+        "available": rng.random(n) < 0.5,
+    }
+
+
+def _as_values(columns: dict[str, np.ndarray]) -> dict[str, list]:
+    """Plain Python lists per field, ready for JSON encoding."""
+    n = len(columns["book_id"])
+    return {
+        "book_id": columns["book_id"],
+        "title": columns["title"],
+        "author": np.array(AUTHORS, dtype=object)[columns["author"]].tolist(),
+        "genre": np.array(GENRES, dtype=object)[columns["genre"]].tolist(),
+        "publication_year": columns["publication_year"].tolist(),
+        "page_count": columns["page_count"].tolist(),
+        "average_rating": columns["average_rating"].tolist(),
+        "ratings_count": columns["ratings_count"].tolist(),
+        "price_usd": columns["price_usd"].tolist(),
+        "publisher": np.array(PUBLISHERS, dtype=object)[columns["publisher"]].tolist(),
+        "language": ["English"] * n,
+        "format": np.array(FORMATS, dtype=object)[columns["format"]].tolist(),
+        "in_print": columns["in_print"].tolist(),
+        "sales_millions": columns["sales_millions"].tolist(),
+        "last_checkout": np.datetime_as_string(columns["last_checkout"], unit="us").tolist(),
+        "available": columns["available"].tolist(),
+    }
+
+
+def _encode_array(values: dict[str, list]) -> bytes:
+    """One chunk as a compact JSON array of book objects."""
+    columns = [values[k] for k in FIELDS]
+    if msgspec is not None:
+        return msgspec.json.encode(list(map(_Record, *columns)))
+    return FastJsonCodec().dumps([dict(zip(FIELDS, row)) for row in zip(*columns)])
+
+
+def iter_book_chunks(
+    count: int,
+    seed: Optional[int] = None,
+    chunk_size: int = 100_000,
+    now: Optional[datetime] = None,
+) -> Iterator[dict[str, np.ndarray]]:
+    """Yield the catalog as generate_columns chunks of at most chunk_size books.
+
+    The same seed, chunk_size and now give the same books.
+    """
     rng = np.random.default_rng(seed)
-    random.seed(seed)
-
-    genres = [
-        "Fantasy",
-        "Sci-Fi",
-        "Non-Fiction",
-        "Mystery",
-        "Romance",
-        "Technology",
-        "History",
-    ]
-    # make Fantasy and Sci-Fi more popular
-    genre_weights = np.array([0.28, 0.24, 0.12, 0.10, 0.08, 0.10, 0.08])
-    genre_weights = genre_weights / genre_weights.sum()
-
-    publishers = [
-        "North Star Press",
-        "Emerald House",
-        "Atlas Publishing",
-        "Blue River Books",
-    ]
-
-    formats = ["Hardcover", "Paperback", "Ebook", "Audiobook"]
-
-    # Publication year distribution: fewer before 1950, increasing after 1950
-    years = np.arange(1850, 2026)
-    year_weights = np.where(years <= 1950, 0.2, 1.0 + (years - 1950) / (2025 - 1950))
-    year_weights = year_weights / year_weights.sum()
-
-    # make popularity multipliers from genre_weights (centered on 1.0)
-    # positive values boost ratings_count and sales for popular genres
-    # strengthen the effect so popular genres (Fantasy, Sci‑Fi) get noticeably higher counts
-    genre_pop_mult = 1.0 + (genre_weights - genre_weights.mean()) * 4.0
-    # stronger per-genre rating bias so popular genres tend to be rated higher
-    genre_rating_bias = (genre_weights - genre_weights.mean()) * 1.2
-
-    # Build correlated latent variables:
-    # z0 -> price latent, z1 -> average_rating latent, z2 -> ratings_count latent
-    cov = np.array([[1.0, 0.7, 0.3], [0.7, 1.0, 0.6], [0.3, 0.6, 1.0]])
-    z = rng.multivariate_normal(mean=np.zeros(3), cov=cov, size=count)
-
-    price_raw = z[:, 0]
-    rating_raw = z[:, 1]
-    rc_raw = z[:, 2]
-
-    # Transform rating_raw -> average_rating in [1.0, 5.0] (target ~ mean 3.2, sd ~0.6)
-    rating = (rating_raw - rating_raw.mean()) / (rating_raw.std() + 1e-9)
-    average_rating = np.clip(np.round(rating * 0.6 + 3.2, 2), 1.0, 5.0)
-
-    # Transform price_raw -> price_usd (log-scale so higher latent => substantially higher price)
-    price_norm = (price_raw - price_raw.mean()) / (price_raw.std() + 1e-9)
-    price_usd = np.round(np.clip(np.exp(price_norm * 0.45 + 2.2), 3.99, 299.99), 2)
-
-    # Transform rc_raw -> ratings_count (positive, heavy-tail via exp)
-    rc_norm = (rc_raw - rc_raw.mean()) / (rc_raw.std() + 1e-9)
-    ratings_count = np.round(np.clip(np.exp(rc_norm * 0.9 + 4.5), 0, 200000)).astype(
-        int
-    )
-
-    # sales_millions tends to be higher with average_rating + ratings_count
-    # combine rating and log1p(ratings_count), then scale and add some noise
-    score = (average_rating / 5.0) * 0.6 + (
-        np.log1p(ratings_count) / np.log1p(ratings_count).max()
-    ) * 0.4
-    sales_loc = score * 10.0  # base scale so typical values are in 0..10 range
-    sales_millions = np.round(
-        np.clip(rng.normal(loc=sales_loc, scale=1.5), 0.01, 200.0), 2
-    )
-
-    books = []
-    now = datetime.now()
-    six_months_ago = now - timedelta(days=182)
-
-    for i in range(1, count + 1):
-        # publication year from weighted distribution
-        pub_year = int(rng.choice(years, p=year_weights))
-
-        random_days = int(rng.integers(0, 183))
-        random_seconds = int(rng.integers(0, 80000))
-        last_checkout = six_months_ago + timedelta(
-            days=random_days, seconds=random_seconds
-        )
-
-        idx = i - 1
-
-        # choose genre and apply stronger popularity multiplier to ratings_count and sales
-        genre_choice = str(rng.choice(genres, p=genre_weights))
-        gidx = genres.index(genre_choice)
-
-        adj_ratings_count = int(
-            np.round(np.clip(ratings_count[idx] * genre_pop_mult[gidx], 0, 200000))
-        )
-        # compute sales based on the adjusted rating and adjusted ratings_count
-        # keep the same weighting so rating => ~0.6 of sales influence
-        rating_adj = float(
-            np.clip(round(average_rating[idx] + genre_rating_bias[gidx], 2), 1.0, 5.0)
-        )
-
-        score_adj = (rating_adj / 5.0) * 0.6 + (
-            np.log1p(adj_ratings_count) / np.log1p(ratings_count).max()
-        ) * 0.4
-        adj_sales_millions = float(
-            np.round(
-                np.clip(rng.normal(loc=score_adj * 10.0, scale=1.5), 0.01, 200.0), 2
-            )
-        )
-
-        # apply a small genre-specific bias to average_rating so popularity shows in Bayesian avg
-        # rating_adj already computed above for sales calculation
-        books.append(
-            {
-                "book_id": str(uuid.uuid4()),
-                "title": f"Book Title {i}",
-                "author": f"Author {rng.integers(1, 80)}",
-                "genre": genre_choice,
-                "publication_year": pub_year,
-                "page_count": int(rng.integers(80, 1200)),
-                "average_rating": rating_adj,
-                "ratings_count": int(adj_ratings_count),
-                "price_usd": float(price_usd[idx]),
-                "publisher": random.choice(publishers),
-                "language": "English",
-                "format": random.choice(formats),
-                "in_print": bool(rng.choice([True, True, True, True, False])),
-                "sales_millions": float(adj_sales_millions),
-                "last_checkout": last_checkout.isoformat(),
-                "available": bool(rng.choice([True, False])),
-            }
-        )
-
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(books, f, indent=2)
\ No newline at end of file
+    now = now or datetime.now()
+    for start in range(0, count, chunk_size):
+        yield generate_columns(rng, start, min(chunk_size, count - start), now)
+
+
+def _detect_format(filename: str) -> str:
+    ext = os.path.splitext(filename)[1]
+    return {".jsonl": "jsonl", ".ndjson": "jsonl", ".bin": "binary"}.get(ext, "json")
+
+
+def _write_json(filename: str, chunks: Iterator[dict], lines: bool) -> None:
+    tmp_path = f"{filename}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            if not lines:
+                f.write(b"[")
+            first = True
+            for columns in chunks:
+                body = _encode_array(_as_values(columns))[1:-1]
+                if lines:
+                    # generated text never contains "},{", so this only splits records
+                    f.write(body.replace(b"},{", b"}\n{") + b"\n")
+                else:
+                    f.write(body if first else b"," + body)
+                first = False
+            if not lines:
+                f.write(b"]")
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, filename)
+
+
+def _write_binary(filename: str, chunks: Iterator[dict]) -> None:
+    from src.repositories.binary_catalog import BinaryCatalogWriter
+
+    with BinaryCatalogWriter(filename) as writer:
+        for columns in chunks:
+            values = _as_values(columns)
+            for name in ("publication_year", "page_count", "average_rating", "ratings_count", "price_usd", "sales_millions"):
+                values[name] = columns[name].astype(np.float64)
+            for name in ("in_print", "available"):
+                values[name] = columns[name].astype(np.int8)
+            writer.append_columns(values, columns["last_checkout"].view(np.int64))
+
+
+def generate_books_json(
+    filename: str = "books.json",
+    count: int = 500,
+    seed: Optional[int] = None,
+    format: Optional[str] = None,
+    chunk_size: int = 100_000,
+    now: Optional[datetime] = None,
+) -> int:
+    """Write count synthetic books to filename and return count.
+
+    Every per-book draw is vectorized and the catalog is produced
+    chunk_size books at a time, so memory stays bounded however large
+    count is. format is "json" (one compact array), "jsonl" or "binary"
+    (see binary_catalog); by default it follows the file extension.
+    """
+    format = format or _detect_format(filename)
+    chunks = iter_book_chunks(count, seed, chunk_size, now)
+    if format == "binary":
+        _write_binary(filename, chunks)
+    elif format in ("json", "jsonl"):
+        _write_json(filename, chunks, lines=format == "jsonl")
+    else:
+        raise ValueError(f'Unknown format {format!r}; expected json, jsonl or binary')
+    return count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic book catalog.")
+    parser.add_argument("filename", nargs="?", default="books.json")
+    parser.add_argument("--count", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--format", choices=["json", "jsonl", "binary"], help="default: from the file extension")
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    generate_books_json(args.filename, args.count, args.seed, args.format, args.chunk_size)
+    print(f"Wrote {args.count} books to {args.filename}")
@@ -0,0 +1,200 @@
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+import pandas as pd
+from src.domain.book import Book
+from src.repositories.book_repository_protocol import BookRepositoryProtocol
+from src.repositories.codecs import FastJsonCodec
+from src.repositories.json_stream import iter_json_array_texts, iter_jsonl_texts, split_json_array_text
+from src.services.book_cleaning_service import BookCleaningService, CleaningReport, OUTPUT_FIELDS
+
+_loads = FastJsonCodec().loads
+# longest raw text kept as an example of a malformed record
+_EXAMPLE_CHARS = 80
+
+
+def detect_format(path: str) -> str:
+    """"jsonl" for .jsonl/.ndjson files, otherwise "json" (a top-level array)."""
+    return "jsonl" if path.endswith((".jsonl", ".ndjson")) else "json"
+
+
+def iter_texts(path: str, fmt: str, chunk_size: int) -> Iterator[str]:
+    """Raw, undecoded chunks of path that each hold whole records."""
+    with open(path, "r", encoding="utf-8") as f:
+        if fmt == "jsonl":
+            yield from iter_jsonl_texts(f, chunk_size)
+        else:
+            yield from iter_json_array_texts(f, chunk_size)
+
+
+def decode_text(text: str, fmt: str) -> list[dict]:
+    if fmt == "jsonl":
+        # one loads() per block instead of one per line
+        return _loads("[" + ",".join(line for line in text.splitlines() if line.strip()) + "]")
+    return _loads(text)
+
+
+def decode_records(text: str, fmt: str) -> tuple[list[dict], list[str]]:
+    """Decode a chunk into records plus the raw text of those that aren't objects.
+
+    The whole chunk is decoded at once; only if that fails is it decoded
+    again one line (JSONL) or one array element (JSON) at a time, so a
+    single malformed record costs its chunk the slow path instead of
+    aborting the ingest. JSON elements are told apart by their "},{"
+    breaks, so an element cut off before its "}" takes the next one
+    down with it.
+    """
+    try:
+        values = decode_text(text, fmt)
+    except ValueError:
+        pieces = [line for line in text.splitlines() if line.strip()] if fmt == "jsonl" else split_json_array_text(text)
+        records, malformed = [], []
+        for piece in pieces:
+            try:
+                value = _loads(piece)
+            except ValueError:
+                malformed.append(piece.strip()[:_EXAMPLE_CHARS])
+                continue
+            if isinstance(value, dict):
+                records.append(value)
+            else:
+                malformed.append(piece.strip()[:_EXAMPLE_CHARS])
+        return records, malformed
+    records = [v for v in values if isinstance(v, dict)]
+    if len(records) == len(values):
+        return records, []
+    return records, [repr(v)[:_EXAMPLE_CHARS] for v in values if not isinstance(v, dict)]
+
+
+def parse_chunk(text: str, fmt: str, cleaner: BookCleaningService) -> tuple[list[tuple], CleaningReport]:
+    """Decode and clean one chunk; runs in the worker processes.
+
+    Rows come back as plain tuples in OUTPUT_FIELDS order because they
+    pickle several times faster than dicts or Book objects. Records that
+    don't decode to an object count as rows in, rejected under
+    "record": "malformed".
+    """
+    records, malformed = decode_records(text, fmt)
+    cleaned, report = cleaner.clean_frame(pd.DataFrame.from_records(records))
+    report.rows_in += len(malformed)
+    report.reject("record", "malformed", pd.Series(malformed, dtype=object))
+    rows = cleaned.astype(object).where(cleaned.notna(), None)
+    return list(rows.itertuples(index=False, name=None)), report
+
+
+@dataclass
+class IngestReport:
+    """Outcome of one ingest: cleaning rejections plus what was stored."""
+
+    cleaning: CleaningReport = field(default_factory=CleaningReport)
+    duplicates: int = 0
+    already_stored: int = 0
+    books_added: int = 0
+    seconds: float = 0.0
+
+    @property
+    def records_in(self) -> int:
+        return self.cleaning.rows_in
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records_in / self.seconds if self.seconds else 0.0
+
+    def summary(self) -> str:
+        return "\n".join([
+            self.cleaning.summary(),
+            f"{self.duplicates} duplicate ids in the input, "
+            f"{self.already_stored} already stored, {self.books_added} books added",
+            f"{self.seconds:.2f}s ({self.records_per_second:,.0f} records/s)",
+        ])
+
+
+class BookIngestService:
+    """Bulk import of large JSON/JSONL book dumps.
+
+    The parent process only splits the file into raw text chunks (see
+    iter_json_array_texts); decoding and BookCleaningService run in a
+    ProcessPoolExecutor, at most 2 * workers chunks in flight so memory
+    stays bounded. Results are merged in file order, deduplicated on
+    book_id (first occurrence wins) and stored with a single add_books
+    call, i.e. one write/transaction for the whole file.
+    """
+
+    def __init__(
+        self,
+        repo: BookRepositoryProtocol,
+        workers: Optional[int] = None,
+        chunk_size: int = 4 * 1024 * 1024,
+        cleaner: Optional[BookCleaningService] = None,
+        book_cls: type = Book,
+    ):
+        self.repo = repo
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.cleaner = cleaner or BookCleaningService()
+        self.book_cls = book_cls
+
+    def _parsed_chunks(self, texts: Iterator[str], fmt: str, executor: Optional[Executor]) -> Iterator[tuple[list[tuple], CleaningReport]]:
+        if executor is None:
+            for text in texts:
+                yield parse_chunk(text, fmt, self.cleaner)
+            return
+        pending = deque()
+        for text in texts:
+            pending.append(executor.submit(parse_chunk, text, fmt, self.cleaner))
+            if len(pending) >= 2 * self.workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+    def ingest_file(self, path: str, fmt: Optional[str] = None) -> IngestReport:
+        """Parse, clean and store every record of path; see IngestReport."""
+        fmt = fmt or detect_format(path)
+        report = IngestReport()
+        start = time.perf_counter()
+        books: dict[str, Book] = {}
+        texts = iter_texts(path, fmt, self.chunk_size)
+        # a single worker gains nothing from a pool but pays the pickling
+        executor = ProcessPoolExecutor(self.workers) if self.workers > 1 else None
+        try:
+            for rows, chunk_report in self._parsed_chunks(texts, fmt, executor):
+                report.cleaning.merge(chunk_report)
+                for row in rows:
+                    # row[0] is book_id (OUTPUT_FIELDS order)
+                    if row[0] in books:
+                        report.duplicates += 1
+                        continue
+                    books[row[0]] = self.book_cls.from_dict(dict(zip(OUTPUT_FIELDS, row)))
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+        added = self.repo.add_books(list(books.values()))
+        report.books_added = len(added)
+        report.already_stored = len(books) - len(added)
+        report.seconds = time.perf_counter() - start
+        return report
+
+
+if __name__ == "__main__":
+    from src.repositories.cached_book_repository import CachedBookRepository
+    from src.repositories.sqlite_book_repository import SqliteBookRepository
+
+    parser = argparse.ArgumentParser(description="Bulk-import a JSON/JSONL book dump into a catalog.")
+    parser.add_argument("src")
+    parser.add_argument("--into", default="books.json", help="books.json-style file or a .db SQLite database")
+    parser.add_argument("--format", choices=["json", "jsonl"], help="default: from the file extension")
+    parser.add_argument("--workers", type=int, default=None, help="default: one per CPU")
+    parser.add_argument("--chunk-size", type=int, default=4 * 1024 * 1024, help="bytes of input per task")
+    args = parser.parse_args()
+
+    if args.into.endswith(".db"):
+        repo = SqliteBookRepository(args.into)
+    else:
+        repo = CachedBookRepository(args.into, codec=FastJsonCodec())
+    report = BookIngestService(repo, args.workers, args.chunk_size).ingest_file(args.src, args.format)
+    print(report.summary())
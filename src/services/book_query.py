@@ -0,0 +1,234 @@
+import heapq
+import numpy as np
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
+from src.domain.book import Book
+from src.services.book_frame import BookFrame
+
+EQUALITY_FIELDS = ["genre", "author"]
+RANGE_FIELDS = {"publication_year": ("min_year", "max_year"), "price_usd": ("min_price", "max_price")}
+FLAG_FILTERS = ["available", "in_print"]
+
+
+@dataclass
+class BookQuery:
+    genre: Optional[str] = None
+    author: Optional[str] = None
+    min_year: Optional[int] = None
+    max_year: Optional[int] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    available: Optional[bool] = None
+    in_print: Optional[bool] = None
+    sort_by: Optional[str] = None
+    descending: bool = False
+    limit: Optional[int] = None
+
+    def bounds(self, field: str) -> tuple:
+        lo, hi = RANGE_FIELDS[field]
+        return getattr(self, lo), getattr(self, hi)
+
+    def matches(self, book: Book) -> bool:
+        for field in EQUALITY_FIELDS:
+            value = getattr(self, field)
+            if value is not None and getattr(book, field) != value:
+                return False
+        for field in RANGE_FIELDS:
+            lo, hi = self.bounds(field)
+            value = getattr(book, field)
+            if (lo is not None or hi is not None) and value is None:
+                return False
+            if lo is not None and value < lo:
+                return False
+            if hi is not None and value > hi:
+                return False
+        for field in FLAG_FILTERS:
+            value = getattr(self, field)
+            if value is not None and bool(getattr(book, field)) != value:
+                return False
+        return True
+
+
+class RangeIndex:
+    """(value, book_id) pairs kept sorted for bisect range lookups."""
+
+    def __init__(self):
+        self._entries: list[tuple] = []
+        self._values: dict[str, object] = {}
+
+    def add(self, book_id: str, value) -> None:
+        self.remove(book_id)
+        if value is None:
+            return
+        insort(self._entries, (value, book_id))
+        self._values[book_id] = value
+
+    def add_many(self, pairs: Iterable[tuple[str, object]]) -> None:
+        """add() for many (book_id, value) pairs with one sort instead of an
+        insort each, which is O(n^2) when building the index."""
+        for book_id, value in pairs:
+            if value is None:
+                self._values.pop(book_id, None)
+            else:
+                self._values[book_id] = value
+        self._entries = sorted((value, book_id) for book_id, value in self._values.items())
+
+    def remove(self, book_id: str) -> None:
+        if book_id not in self._values:
+            return
+        value = self._values.pop(book_id)
+        del self._entries[bisect_left(self._entries, (value, book_id))]
+
+    def between(self, lo, hi) -> set[str]:
+        start = 0 if lo is None else bisect_left(self._entries, (lo,))
+        end = len(self._entries)
+        if hi is not None:
+            # (hi, chr(0x10FFFF)) sorts after every (hi, book_id)
+            end = bisect_right(self._entries, (hi, chr(0x10FFFF)))
+        return {book_id for _, book_id in self._entries[start:end]}
+
+
+class BookIndexes:
+    """Secondary indexes the QueryPlanner can push predicates down to.
+
+    Hash indexes on genre and author, bisect range indexes on
+    publication_year and price_usd. Subscribe to BookService and
+    CheckoutService to keep them current.
+    """
+
+    def __init__(self):
+        self.books: dict[str, Book] = {}
+        # indexed values per book, since callers may mutate the Book itself
+        self._keys: dict[str, dict[str, object]] = {}
+        self.equality: dict[str, dict[object, set[str]]] = {f: {} for f in EQUALITY_FIELDS}
+        self.ranges: dict[str, RangeIndex] = {f: RangeIndex() for f in RANGE_FIELDS}
+
+    @classmethod
+    def from_books(cls, books: Iterable[Book]) -> 'BookIndexes':
+        indexes = cls()
+        for book in books:
+            # a repeated id replaces the earlier book, as in book_added
+            indexes.books[book.book_id] = book
+        for book_id, book in indexes.books.items():
+            keys = indexes._keys[book_id] = {f: getattr(book, f) for f in EQUALITY_FIELDS}
+            for field, value in keys.items():
+                indexes.equality[field].setdefault(value, set()).add(book_id)
+        for field, index in indexes.ranges.items():
+            index.add_many((book_id, getattr(book, field)) for book_id, book in indexes.books.items())
+        return indexes
+
+    def book_added(self, book: Book) -> None:
+        self.book_deleted(book.book_id)
+        self.books[book.book_id] = book
+        keys = self._keys[book.book_id] = {f: getattr(book, f) for f in EQUALITY_FIELDS}
+        for field, value in keys.items():
+            self.equality[field].setdefault(value, set()).add(book.book_id)
+        for field, index in self.ranges.items():
+            index.add(book.book_id, getattr(book, field))
+
+    def book_updated(self, book: Book) -> None:
+        self.book_added(book)
+
+    def book_deleted(self, book_id: str) -> None:
+        if self.books.pop(book_id, None) is None:
+            return
+        for field, value in self._keys.pop(book_id).items():
+            ids = self.equality[field][value]
+            ids.discard(book_id)
+            if not ids:
+                del self.equality[field][value]
+        for index in self.ranges.values():
+            index.remove(book_id)
+
+
+class QueryPlanner:
+    """Runs a BookQuery against indexes when it can, a column scan otherwise.
+
+    With BookIndexes, each indexed predicate yields a candidate id set; the
+    smallest is taken first and intersected with the rest, and any
+    remaining predicates are checked on the survivors. Without indexes,
+    every predicate becomes a boolean mask over a BookFrame.
+    """
+
+    def __init__(self, indexes: Optional[BookIndexes] = None):
+        self.indexes = indexes
+
+    def _index_lookups(self, query: BookQuery) -> list[tuple[str, Callable[[], set[str]]]]:
+        lookups = []
+        for field in EQUALITY_FIELDS:
+            value = getattr(query, field)
+            if value is not None:
+                lookups.append((field, lambda f=field, v=value: self.indexes.equality[f].get(v, set())))
+        for field in RANGE_FIELDS:
+            lo, hi = query.bounds(field)
+            if lo is not None or hi is not None:
+                lookups.append((field, lambda f=field, lo=lo, hi=hi: self.indexes.ranges[f].between(lo, hi)))
+        return lookups
+
+    def explain(self, query: BookQuery) -> str:
+        if self.indexes is None:
+            return "column scan"
+        lookups = self._index_lookups(query)
+        if not lookups:
+            return "full index scan"
+        return "index " + ", ".join(field for field, _ in lookups)
+
+    def run(self, query: BookQuery, load_books: Callable[[], list[Book] | BookFrame]) -> list[Book]:
+        if self.indexes is not None:
+            matched = self._run_indexed(query)
+        else:
+            books = load_books()
+            frame = books if isinstance(books, BookFrame) else BookFrame.from_books(books)
+            matched = self._run_scan(query, frame)
+        return self._order(query, matched)
+
+    def _run_indexed(self, query: BookQuery) -> list[Book]:
+        candidates = [lookup() for _, lookup in self._index_lookups(query)]
+        if candidates:
+            candidates.sort(key=len)
+            ids = set(candidates[0])
+            for other in candidates[1:]:
+                ids &= other
+            books = [self.indexes.books[i] for i in ids]
+        else:
+            books = list(self.indexes.books.values())
+        return [b for b in books if query.matches(b)]
+
+    def _run_scan(self, query: BookQuery, frame: BookFrame) -> list[Book]:
+        mask = np.ones(len(frame), dtype=bool)
+        for field in EQUALITY_FIELDS:
+            value = getattr(query, field)
+            if value is not None:
+                code = frame.code_of(field, value)
+                if code is None:
+                    mask[:] = False
+                else:
+                    mask &= frame.column(field) == code
+        for field in RANGE_FIELDS:
+            lo, hi = query.bounds(field)
+            col = frame.column(field)
+            if lo is not None:
+                mask &= col >= lo
+            if hi is not None:
+                mask &= col <= hi
+        for field in FLAG_FILTERS:
+            value = getattr(query, field)
+            if value is not None:
+                mask &= (frame.column(field) == 1) == value
+        return frame.books_at(np.flatnonzero(mask))
+
+    def _order(self, query: BookQuery, books: list[Book]) -> list[Book]:
+        if query.sort_by is None:
+            return books if query.limit is None else books[:query.limit]
+
+        present = [b for b in books if getattr(b, query.sort_by) is not None]
+        missing = [b for b in books if getattr(b, query.sort_by) is None]
+        key = lambda b: getattr(b, query.sort_by)
+        if query.limit is not None and query.limit < len(present):
+            pick = heapq.nlargest if query.descending else heapq.nsmallest
+            return pick(query.limit, present, key=key)
+        present.sort(key=key, reverse=query.descending)
+        ordered = present + missing
+        return ordered if query.limit is None else ordered[:query.limit]
+
@@ -0,0 +1,87 @@
+import math
+from bisect import bisect_left, insort
+from typing import Callable, Iterable, Optional
+from src.domain.book import Book
+
+ScoreFn = Callable[[Book], Optional[float]]
+
+
+def rating_score(min_ratings: int = 1000) -> ScoreFn:
+    """Score used by BookAnalyticsService.top_rated."""
+    def score(book: Book) -> Optional[float]:
+        if book.average_rating is None or (book.ratings_count or 0) < min_ratings:
+            return None
+        return book.average_rating
+    return score
+
+
+def value_score(book: Book) -> Optional[float]:
+    """Score used by BookAnalyticsService.value_scores."""
+    if book.average_rating is None or not book.price_usd:
+        return None
+    return book.average_rating * math.log1p(book.ratings_count or 0) / book.price_usd
+
+
+class BookRanking:
+    """Books kept sorted by a score, updated as the catalog changes.
+
+    Entries are (-score, book_id) in a sorted list, so top(k) is a slice and
+    an add/update/delete is a bisect plus one list insert/delete. Books whose
+    score is None are not ranked. Subscribe it to BookService and
+    CheckoutService so the ranking stays warm between queries.
+    """
+
+    def __init__(self, score: ScoreFn):
+        self._score = score
+        self._entries: list[tuple[float, str]] = []
+        self._keys: dict[str, tuple[float, str]] = {}
+        self._books: dict[str, Book] = {}
+
+    @classmethod
+    def from_books(cls, books: Iterable[Book], score: ScoreFn) -> 'BookRanking':
+        ranking = cls(score)
+        for book in books:
+            s = score(book)
+            if s is None:
+                continue
+            key = (-s, book.book_id)
+            ranking._keys[book.book_id] = key
+            ranking._books[book.book_id] = book
+            ranking._entries.append(key)
+        ranking._entries.sort()
+        return ranking
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def top(self, k: int = 10) -> list[Book]:
+        return [self._books[book_id] for _, book_id in self._entries[:k]]
+
+    def top_scores(self, k: int = 10) -> dict[str, float]:
+        return {book_id: -neg for neg, book_id in self._entries[:k]}
+
+    def remove(self, book_id: str) -> None:
+        key = self._keys.pop(book_id, None)
+        if key is None:
+            return
+        del self._entries[bisect_left(self._entries, key)]
+        del self._books[book_id]
+
+    def upsert(self, book: Book) -> None:
+        self.remove(book.book_id)
+        s = self._score(book)
+        if s is None:
+            return
+        key = (-s, book.book_id)
+        insort(self._entries, key)
+        self._keys[book.book_id] = key
+        self._books[book.book_id] = book
+
+    def book_added(self, book: Book) -> None:
+        self.upsert(book)
+
+    def book_updated(self, book: Book) -> None:
+        self.upsert(book)
+
+    def book_deleted(self, book_id: str) -> None:
+        self.remove(book_id)
@@ -0,0 +1,164 @@
+import heapq
+import json
+import os
+import re
+from bisect import bisect_left, insort
+from typing import Hashable, Iterable, Optional
+from src.domain.book import Book
+
+_TOKEN_RE = re.compile(r"\w+")
+
+FIELD_WEIGHTS = {"title": 3.0, "author": 2.0, "publisher": 1.0}
+PREFIX_FACTOR = 0.5
+TITLE_PREFIX_BONUS = 5.0
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+class BookSearchIndex:
+    """Inverted index over title, author and publisher.
+
+    Each token maps to a posting dict {book_id: weight}, where the weight is
+    the sum of FIELD_WEIGHTS for the fields containing the token. Tokens are
+    also kept in a sorted list so a partial word is expanded by bisecting to
+    its prefix range instead of scanning the vocabulary. The index stays in
+    sync through the BookEventListener methods and can be saved next to the
+    catalog and reloaded while the catalog version matches.
+    """
+
+    def __init__(self):
+        self._postings: dict[str, dict[str, float]] = {}
+        self._vocabulary: list[str] = []
+        self._doc_tokens: dict[str, dict[str, float]] = {}
+        self._titles: dict[str, str] = {}
+
+    @classmethod
+    def from_books(cls, books: Iterable[Book]) -> 'BookSearchIndex':
+        index = cls()
+        for book in books:
+            index.add(book)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._doc_tokens)
+
+    def _index_doc(self, book_id: str, tokens: dict[str, float], title: str) -> None:
+        self._doc_tokens[book_id] = tokens
+        self._titles[book_id] = title
+        for token, weight in tokens.items():
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = {}
+                insort(self._vocabulary, token)
+            posting[book_id] = weight
+
+    def add(self, book: Book) -> None:
+        self.remove(book.book_id)
+        tokens: dict[str, float] = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            for token in set(tokenize(getattr(book, field))):
+                tokens[token] = tokens.get(token, 0.0) + weight
+        self._index_doc(book.book_id, tokens, " ".join(tokenize(book.title)))
+
+    def remove(self, book_id: str) -> None:
+        tokens = self._doc_tokens.pop(book_id, None)
+        if tokens is None:
+            return
+        del self._titles[book_id]
+        for token in tokens:
+            posting = self._postings[token]
+            del posting[book_id]
+            if not posting:
+                del self._postings[token]
+                del self._vocabulary[bisect_left(self._vocabulary, token)]
+
+    def _expand(self, token: str, prefix: bool) -> list[tuple[str, float]]:
+        if not prefix:
+            return [(token, 1.0)] if token in self._postings else []
+        matches = []
+        i = bisect_left(self._vocabulary, token)
+        while i < len(self._vocabulary) and self._vocabulary[i].startswith(token):
+            word = self._vocabulary[i]
+            matches.append((word, 1.0 if word == token else PREFIX_FACTOR))
+            i += 1
+        return matches
+
+    def search(self, query: str, limit: int = 20, prefix: bool = True) -> list[str]:
+        """Book ids matching every query token, best match first.
+
+        With prefix=True each query token also matches longer words that
+        start with it, at a reduced weight. Titles that start with the
+        whole query rank above the rest.
+        """
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return []
+
+        scores: Optional[dict[str, float]] = None
+        # rarest token first keeps the intersection small
+        expanded = sorted(
+            (self._expand(t, prefix) for t in query_tokens),
+            key=lambda words: sum(len(self._postings[w]) for w, _ in words),
+        )
+        for words in expanded:
+            token_scores: dict[str, float] = {}
+            for word, factor in words:
+                for book_id, weight in self._postings[word].items():
+                    if scores is not None and book_id not in scores:
+                        continue
+                    score = weight * factor
+                    if score > token_scores.get(book_id, 0.0):
+                        token_scores[book_id] = score
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {b: scores[b] + s for b, s in token_scores.items()}
+            if not scores:
+                return []
+
+        phrase = " ".join(query_tokens)
+        for book_id in scores:
+            if self._titles[book_id].startswith(phrase):
+                scores[book_id] += TITLE_PREFIX_BONUS
+        return heapq.nlargest(limit, scores, key=lambda b: (scores[b], b))
+
+    def save(self, path: str, version: Hashable) -> None:
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": repr(version),
+                    "docs": {
+                        book_id: [self._titles[book_id], tokens]
+                        for book_id, tokens in self._doc_tokens.items()
+                    },
+                },
+                f,
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, version: Hashable) -> Optional['BookSearchIndex']:
+        """Load a saved index, or None if it is missing or for another version."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        if data["version"] != repr(version):
+            return None
+        index = cls()
+        for book_id, (title, tokens) in data["docs"].items():
+            index._index_doc(book_id, tokens, title)
+        return index
+
+    def book_added(self, book: Book) -> None:
+        self.add(book)
+
+    def book_updated(self, book: Book) -> None:
+        self.add(book)
+
+    def book_deleted(self, book_id: str) -> None:
+        self.remove(book_id)
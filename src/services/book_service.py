@@ -1,23 +1,69 @@
 from src.repositories.book_repository_protocol import BookRepositoryProtocol
 from src.domain.book import Book
+from src.services.book_events import BookEventListener
+from src.services.book_query import BookQuery, QueryPlanner
+from typing import Iterator, Optional
 
 class BookService:
-    def __init__(self, repo: BookRepositoryProtocol):
+    def __init__(self, repo: BookRepositoryProtocol, query_planner: QueryPlanner = None):
         self.repo = repo
+        self.listeners: list[BookEventListener] = []
+        self.query_planner = query_planner or QueryPlanner()
+
+    def subscribe(self, listener: BookEventListener) -> None:
+        self.listeners.append(listener)
 
     def get_all_books(self) -> list[Book]:
         return self.repo.get_all_books()
 
+    def iter_books(self) -> Iterator[Book]:
+        return self.repo.iter_books()
+
     def add_book(self, book:Book) -> str:
-        return self.repo.add_book(book)
+        book_id = self.repo.add_book(book)
+        for listener in self.listeners:
+            listener.book_added(book)
+        return book_id
     
+    def add_books(self, books: list[Book]) -> list[str]:
+        added = self.repo.add_books(books)
+        if self.listeners:
+            pending = set(added)
+            for book in books:
+                if book.book_id in pending:
+                    pending.discard(book.book_id)
+                    for listener in self.listeners:
+                        listener.book_added(book)
+        return added
+
     def delete_book(self, book_id:str) -> str:
-        return self.repo.delete_book(book_id)
+        success = self.repo.delete_book(book_id)
+        if success:
+            for listener in self.listeners:
+                listener.book_deleted(book_id)
+        return success
     
     def update_book(self, book:Book) -> bool:
-        return self.repo.update_book(book)
+        success = self.repo.update_book(book)
+        if success:
+            for listener in self.listeners:
+                listener.book_updated(book)
+        return success
+
+    def catalog_version(self):
+        return self.repo.catalog_version()
+
+    def get_book_by_id(self, book_id:str) -> Optional[Book]:
+        return self.repo.get_book_by_id(book_id)
 
     def find_book_by_name(self, query:str) -> list[Book]:
         if not isinstance(query, str):
             raise TypeError('Expected str, got something else.')
         return self.repo.find_book_by_name(query)
+
+    def query(self, **filters) -> list[Book]:
+        """Filter, sort and limit books; see BookQuery for the accepted keywords.
+
+        e.g. query(genre="Fantasy", min_year=2000, available=True, sort_by="price_usd", limit=10)
+        """
+        return self.query_planner.run(BookQuery(**filters), self.get_all_books)
@@ -0,0 +1,68 @@
+from typing import Callable, Hashable
+from src.domain.book import Book
+from src.services.book_events import BookEventListener
+from src.services.book_service import BookService
+
+# builds a view of the catalog at the given version
+ViewBuilder = Callable[[Hashable], BookEventListener]
+
+
+class CatalogViews:
+    """Derived catalog state (BookFrame, rankings, indexes) tied to a catalog version.
+
+    Subscribe it to BookService and CheckoutService instead of the views
+    themselves: it forwards every event to them and then records the new
+    catalog version, so `version` is always the version the views reflect.
+    Edits by another process only show up as a different catalog_version();
+    sync() compares the two and rebuilds every view with its builder when
+    they differ, and get() syncs before handing a view out.
+
+    Call sync() right before writing as well. The version recorded after
+    a write event is only right if the views were current when it started.
+    """
+
+    def __init__(self, book_svc: BookService):
+        self.book_svc = book_svc
+        self.version = None
+        self.rebuilds = 0
+        self._builders: dict[str, ViewBuilder] = {}
+        self._views: dict[str, BookEventListener] = {}
+
+    def register(self, name: str, build: ViewBuilder) -> None:
+        """Add a view; it is built on the next sync() or get()."""
+        self._builders[name] = build
+        self._views.pop(name, None)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._builders
+
+    def sync(self) -> bool:
+        """Rebuild the views if the catalog changed; True if anything was built."""
+        version = self.book_svc.catalog_version()
+        if version != self.version:
+            stale = self._builders
+            self.rebuilds += 1
+        else:
+            stale = {n: b for n, b in self._builders.items() if n not in self._views}
+        for name, build in stale.items():
+            self._views[name] = build(version)
+        self.version = version
+        return bool(stale)
+
+    def get(self, name: str) -> BookEventListener:
+        self.sync()
+        return self._views[name]
+
+    def _forward(self, method: str, arg) -> None:
+        for view in self._views.values():
+            getattr(view, method)(arg)
+        self.version = self.book_svc.catalog_version()
+
+    def book_added(self, book: Book) -> None:
+        self._forward("book_added", book)
+
+    def book_updated(self, book: Book) -> None:
+        self._forward("book_updated", book)
+
+    def book_deleted(self, book_id: str) -> None:
+        self._forward("book_deleted", book_id)
@@ -0,0 +1,204 @@
+import argparse
+from datetime import datetime, timedelta
+from typing import Callable, Iterator, Optional
+import numpy as np
+from src.domain.checkout_history import CheckoutEvent
+from src.repositories.book_repository_protocol import BookRepositoryProtocol
+from src.repositories.checkout_history_repository_protocol import CheckoutHistoryRepositoryProtocol
+from src.services.book_generator_service_V2 import GENRES, GENRE_WEIGHTS
+
+# relative checkout traffic per hour of the day: closed overnight, a lunch
+# bump and an after-work peak
+HOUR_WEIGHTS = np.array([
+    0.01, 0.01, 0.01, 0.01, 0.01, 0.02, 0.05, 0.15,
+    0.45, 0.70, 0.85, 0.90, 1.00, 0.95, 0.80, 0.80,
+    0.90, 1.00, 1.00, 0.85, 0.60, 0.35, 0.12, 0.04,
+])
+# Monday .. Sunday; Saturdays are the busiest, Sundays short hours
+WEEKDAY_WEIGHTS = np.array([0.85, 0.80, 0.85, 0.90, 1.00, 1.20, 0.60])
+# acceptance probability per hour of the week (Monday 00:00 is hour 0)
+_HOUR_OF_WEEK = np.outer(WEEKDAY_WEIGHTS, HOUR_WEIGHTS).ravel()
+_HOUR_OF_WEEK = _HOUR_OF_WEEK / _HOUR_OF_WEEK.max()
+
+_US_PER_HOUR = 3_600_000_000
+_US_PER_DAY = 24 * _US_PER_HOUR
+# 1970-01-01, hour 0 of the microsecond clock, was a Thursday
+_EPOCH_HOUR_OF_WEEK = 3 * 24
+
+
+def lognormal_loan_days(median_days: float = 14.0, sigma: float = 0.5, max_days: float = 120.0) -> Callable:
+    """Loan durations in days: lognormal around median_days, capped at max_days."""
+    def draw(rng: np.random.Generator, n: int) -> np.ndarray:
+        return np.minimum(rng.lognormal(np.log(median_days), sigma, n), max_days)
+    return draw
+
+
+def _to_us(dt: datetime) -> int:
+    return int(np.datetime64(dt, "us").astype(np.int64))
+
+
+def simulate_loans(
+    genres: list[Optional[str]],
+    start: datetime,
+    end: datetime,
+    rng: np.random.Generator,
+    checkouts_per_year: float = 12.0,
+    loan_days: Optional[Callable] = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Draw every loan of every book between start and end.
+
+    Each book alternates between idle and on loan. While idle it is
+    checked out at a rate of checkouts_per_year, scaled by its genre's
+    weight in the V2 generator and a per-book popularity factor, and
+    thinned by the hour of the week (HOUR_WEIGHTS x WEEKDAY_WEIGHTS).
+    All books advance together, one candidate checkout per round.
+
+    Returns (book index, checkout time, return time) arrays, times in
+    microseconds since the epoch and ordered by book then time. A return
+    time at or after end means the book is still out.
+    """
+    loan_days = loan_days or lognormal_loan_days()
+    n = len(genres)
+    genre_weight = dict(zip(GENRES, GENRE_WEIGHTS / GENRE_WEIGHTS.mean()))
+    popularity = np.array([genre_weight.get(g, 1.0) for g in genres])
+    popularity *= rng.lognormal(-0.125, 0.5, n)  # mean 1
+    # candidate rate per microsecond; thinning keeps mean(_HOUR_OF_WEEK) of them
+    rate = checkouts_per_year * popularity / (365 * _US_PER_DAY) / _HOUR_OF_WEEK.mean()
+
+    start_us, end_us = _to_us(start), _to_us(end)
+    clock = np.full(n, start_us, dtype=np.int64)
+    active = np.arange(n)
+    books, checkouts, returns = [], [], []
+    while active.size:
+        clock[active] += rng.exponential(1 / rate[active]).astype(np.int64)
+        active = active[clock[active] < end_us]
+        hour = (clock[active] // _US_PER_HOUR + _EPOCH_HOUR_OF_WEEK) % 168
+        accepted = active[rng.random(active.size) < _HOUR_OF_WEEK[hour]]
+        duration = (loan_days(rng, accepted.size) * _US_PER_DAY).astype(np.int64)
+        books.append(accepted)
+        checkouts.append(clock[accepted].copy())
+        clock[accepted] += duration
+        returns.append(clock[accepted].copy())
+        active = active[clock[active] < end_us]
+
+    books = np.concatenate(books) if books else np.empty(0, dtype=np.int64)
+    checkouts = np.concatenate(checkouts) if checkouts else np.empty(0, dtype=np.int64)
+    returns = np.concatenate(returns) if returns else np.empty(0, dtype=np.int64)
+    order = np.lexsort((checkouts, books))
+    return books[order], checkouts[order], returns[order]
+
+
+def iter_events(
+    book_ids: list[str],
+    books: np.ndarray,
+    checkouts: np.ndarray,
+    returns: np.ndarray,
+    end: datetime,
+    chunk_size: Optional[int] = 100_000,
+) -> Iterator[list[CheckoutEvent]]:
+    """The loans as checkout and return events in time order, chunk_size at a time.
+
+    Returns after end are not emitted; those books are still checked out.
+    chunk_size=None yields everything as one list.
+    """
+    returned = returns < _to_us(end)
+    times = np.concatenate([checkouts, returns[returned]])
+    book_of = np.concatenate([books, books[returned]])
+    is_return = np.concatenate([np.zeros(len(checkouts), bool), np.ones(int(returned.sum()), bool)])
+    # at equal times a return sorts after the checkout it closes
+    order = np.lexsort((is_return, times))
+    ids = np.array(book_ids, dtype=object)
+    chunk_size = chunk_size or max(len(order), 1)
+    for lo in range(0, len(order), chunk_size):
+        idx = order[lo:lo + chunk_size]
+        dates = times[idx].astype("datetime64[us]").tolist()
+        yield [
+            CheckoutEvent(book_id=book_id, return_date=date, returned=True) if back
+            else CheckoutEvent(book_id=book_id, checkout_date=date, returned=False)
+            for book_id, date, back in zip(ids[book_of[idx]].tolist(), dates, is_return[idx].tolist())
+        ]
+
+
+def generate_checkout_history(
+    book_repo: BookRepositoryProtocol,
+    history_repo: CheckoutHistoryRepositoryProtocol,
+    days: int = 365,
+    end: Optional[datetime] = None,
+    checkouts_per_year: float = 12.0,
+    loan_days: Optional[Callable] = None,
+    seed: Optional[int] = None,
+    chunk_size: Optional[int] = 100_000,
+) -> int:
+    """Simulate `days` of loans for every book and return the number of events.
+
+    Events are streamed to history_repo with one add_events call per chunk
+    (chunk_size=None for a single call, e.g. for the JSON store, which
+    rewrites its file every time), so the store should start empty.
+    Afterwards every book's available and last_checkout match its history:
+    books whose last loan is still open at end are checked out. Those
+    changes are written with one update_books call.
+    """
+    end = end or datetime.now()
+    rng = np.random.default_rng(seed)
+    catalog = book_repo.get_all_books()
+    book_ids = [b.book_id for b in catalog]
+    books, checkouts, returns = simulate_loans(
+        [b.genre for b in catalog], end - timedelta(days=days), end, rng, checkouts_per_year, loan_days
+    )
+
+    count = 0
+    for events in iter_events(book_ids, books, checkouts, returns, end, chunk_size):
+        history_repo.add_events(events)
+        count += len(events)
+
+    # loans are ordered by book then time, so the last loan of each book
+    # is the entry before the next book starts
+    last = np.flatnonzero(np.append(books[1:] != books[:-1], True)) if len(books) else books
+    last_checkout = dict(zip(books[last].tolist(), checkouts[last].astype("datetime64[us]").tolist()))
+    out_on_loan = set(books[last][returns[last] >= _to_us(end)].tolist())
+    changed = []
+    for i, book in enumerate(catalog):
+        available = i not in out_on_loan
+        checked_out = last_checkout.get(i)
+        stamp = checked_out.isoformat() if checked_out else book.last_checkout
+        if book.available != available or book.last_checkout != stamp:
+            book.available = available
+            book.last_checkout = stamp
+            changed.append(book)
+    if changed:
+        book_repo.update_books(changed)
+    return count
+
+
+if __name__ == "__main__":
+    from src.repositories.cached_book_repository import CachedBookRepository
+    from src.repositories.checkout_history_repository import CheckoutHistoryRepository
+    from src.repositories.indexed_checkout_history_repository import IndexedCheckoutHistoryRepository
+
+    parser = argparse.ArgumentParser(description="Generate a synthetic checkout history for a catalog.")
+    parser.add_argument("--books", default="books.json")
+    parser.add_argument("--history", default="checkout_history.jsonl", help=".jsonl (appended) or .json")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--checkouts-per-year", type=float, default=12.0)
+    parser.add_argument("--loan-median-days", type=float, default=14.0)
+    parser.add_argument("--loan-sigma", type=float, default=0.5)
+    parser.add_argument("--loan-max-days", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    if args.history.endswith(".jsonl"):
+        history_repo = IndexedCheckoutHistoryRepository(args.history)
+    else:
+        history_repo = CheckoutHistoryRepository(args.history)
+        args.chunk_size = None
+    count = generate_checkout_history(
+        CachedBookRepository(args.books),
+        history_repo,
+        days=args.days,
+        checkouts_per_year=args.checkouts_per_year,
+        loan_days=lognormal_loan_days(args.loan_median_days, args.loan_sigma, args.loan_max_days),
+        seed=args.seed,
+        chunk_size=args.chunk_size,
+    )
+    print(f"Wrote {count} checkout events to {args.history}")
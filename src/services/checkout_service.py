@@ -1,7 +1,9 @@
 from datetime import datetime
+from src.domain.book import Book
 from src.domain.checkout_history import CheckoutEvent
 from src.repositories.book_repository_protocol import BookRepositoryProtocol
 from src.repositories.checkout_history_repository_protocol import CheckoutHistoryRepositoryProtocol
+from src.services.book_events import BookEventListener
 
 class CheckoutService:
     def __init__(
@@ -11,13 +13,28 @@ class CheckoutService:
     ):
         self.book_repo = book_repo
         self.history_repo = history_repo
+        self.listeners: list[BookEventListener] = []
+
+    def subscribe(self, listener: BookEventListener) -> None:
+        self.listeners.append(listener)
+
+    def _notify(self, books: list[Book]) -> None:
+        for listener in self.listeners:
+            for book in books:
+                listener.book_updated(book)
+
+    def _get_book(self, book_id: str) -> Book:
+        book = self.book_repo.get_book_by_id(book_id)
+        if book is None:
+            raise ValueError(f'Book {book_id} not found.')
+        return book
 
     def check_out(self, book_id: str) -> None:
-        books = self.book_repo.get_all_books()
-        book = next(b for b in books if b.book_id == book_id)
+        book = self._get_book(book_id)
 
         book.check_out()
-        self.book_repo.update_book(book)
+        self._store(book)
+        self._notify([book])
 
         event = CheckoutEvent(
             book_id=book.book_id,
@@ -27,11 +44,11 @@ class CheckoutService:
         self.history_repo.add_event(event)
 
     def check_in(self, book_id: str) -> None:
-        books = self.book_repo.get_all_books()
-        book = next(b for b in books if b.book_id == book_id)
+        book = self._get_book(book_id)
 
         book.check_in()
-        self.book_repo.update_book(book)
+        self._store(book)
+        self._notify([book])
 
         event = CheckoutEvent(
             book_id=book.book_id,
@@ -40,6 +57,65 @@ class CheckoutService:
         )
         self.history_repo.add_event(event)
 
+    def _store(self, book: Book) -> None:
+        # False: the book was deleted since _get_book read it
+        if not self.book_repo.update_book(book):
+            raise ValueError(f'Book {book.book_id} not found.')
+
+    def _store_batch(self, books: list[Book]) -> None:
+        if self.book_repo.update_books(books) != len(books):
+            ids = [b.book_id for b in books]
+            found = self.book_repo.get_books_by_ids(ids)
+            raise ValueError(f'Books not found: {", ".join(i for i in ids if i not in found)}')
+
+    def _get_books_for_batch(self, book_ids: list[str]) -> list[Book]:
+        if len(set(book_ids)) != len(book_ids):
+            raise ValueError('Batch contains duplicate book ids.')
+        found = self.book_repo.get_books_by_ids(book_ids)
+        missing = [i for i in book_ids if i not in found]
+        if missing:
+            raise ValueError(f'Books not found: {", ".join(missing)}')
+        return [found[i] for i in book_ids]
+
+    def check_out_many(self, book_ids: list[str]) -> None:
+        """Check out a batch of books with one book-store write and one history append.
+
+        Every book is validated before anything changes, so either the whole
+        batch is applied or none of it is.
+        """
+        books = self._get_books_for_batch(book_ids)
+        unavailable = [b.book_id for b in books if not b.available]
+        if unavailable:
+            raise ValueError(f'Books already checked out: {", ".join(unavailable)}')
+
+        now = datetime.now()
+        for book in books:
+            # stamped like the checkout events below
+            book.check_out(now)
+        self._store_batch(books)
+        self._notify(books)
+        self.history_repo.add_events([
+            CheckoutEvent(book_id=b.book_id, checkout_date=now, returned=False)
+            for b in books
+        ])
+
+    def check_in_many(self, book_ids: list[str]) -> None:
+        """Check in a batch of books; all-or-nothing like check_out_many."""
+        books = self._get_books_for_batch(book_ids)
+        available = [b.book_id for b in books if b.available]
+        if available:
+            raise ValueError(f'Books already available: {", ".join(available)}')
+
+        now = datetime.now()
+        for book in books:
+            book.check_in()
+        self._store_batch(books)
+        self._notify(books)
+        self.history_repo.add_events([
+            CheckoutEvent(book_id=b.book_id, return_date=now, returned=True)
+            for b in books
+        ])
+
     def get_history_for_book(self, book_id: str) -> list[CheckoutEvent]:
         return self.history_repo.get_history_for_book(book_id)
     
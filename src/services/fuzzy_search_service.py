@@ -0,0 +1,89 @@
+import heapq
+from typing import Iterable, Optional
+from src.domain.book import Book
+from src.services.book_search_service import tokenize
+
+FUZZY_FIELDS = ("title", "author")
+
+
+def trigrams(text: Optional[str]) -> frozenset[str]:
+    """Character trigrams of each word, padded like pg_trgm ("  ab", "ab ")."""
+    grams = set()
+    for word in tokenize(text):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+class TrigramIndex:
+    """Typo-tolerant lookup over titles and authors.
+
+    Every field value is broken into trigrams, and each trigram keeps the set
+    of books containing it. A query only visits the postings of its own
+    trigrams, counts shared trigrams per candidate and scores them with the
+    Dice coefficient 2 * shared / (|query| + |candidate|). The best field
+    decides a book's score. Kept in sync through the BookEventListener
+    methods.
+    """
+
+    def __init__(self):
+        self._postings: dict[str, dict[str, set[str]]] = {f: {} for f in FUZZY_FIELDS}
+        self._grams: dict[str, dict[str, frozenset[str]]] = {f: {} for f in FUZZY_FIELDS}
+
+    @classmethod
+    def from_books(cls, books: Iterable[Book]) -> 'TrigramIndex':
+        index = cls()
+        for book in books:
+            index.add(book)
+        return index
+
+    def add(self, book: Book) -> None:
+        self.remove(book.book_id)
+        for field in FUZZY_FIELDS:
+            grams = trigrams(getattr(book, field))
+            self._grams[field][book.book_id] = grams
+            postings = self._postings[field]
+            for gram in grams:
+                postings.setdefault(gram, set()).add(book.book_id)
+
+    def remove(self, book_id: str) -> None:
+        for field in FUZZY_FIELDS:
+            grams = self._grams[field].pop(book_id, None)
+            if grams is None:
+                continue
+            postings = self._postings[field]
+            for gram in grams:
+                ids = postings[gram]
+                ids.discard(book_id)
+                if not ids:
+                    del postings[gram]
+
+    def search(self, query: str, limit: int = 5, min_score: float = 0.3) -> list[tuple[str, float]]:
+        """Best (book_id, score) pairs for query, highest score first."""
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+
+        best: dict[str, float] = {}
+        for field in FUZZY_FIELDS:
+            postings = self._postings[field]
+            shared: dict[str, int] = {}
+            for gram in query_grams:
+                for book_id in postings.get(gram, ()):
+                    shared[book_id] = shared.get(book_id, 0) + 1
+            doc_grams = self._grams[field]
+            for book_id, n in shared.items():
+                score = 2 * n / (len(query_grams) + len(doc_grams[book_id]))
+                if score >= min_score and score > best.get(book_id, 0.0):
+                    best[book_id] = score
+
+        return heapq.nlargest(limit, best.items(), key=lambda item: (item[1], item[0]))
+
+    def book_added(self, book: Book) -> None:
+        self.add(book)
+
+    def book_updated(self, book: Book) -> None:
+        self.add(book)
+
+    def book_deleted(self, book_id: str) -> None:
+        self.remove(book_id)
@@ -0,0 +1,103 @@
+import numpy as np
+from src.services.book_frame import BookFrame, CATEGORICAL_FIELDS, FLAG_FIELDS
+
+AGGREGATIONS = ("count", "sum", "mean", "median", "min", "max")
+
+
+def _factorize(frame: BookFrame, key: str) -> tuple[np.ndarray, list]:
+    """Return (codes, labels) for a key column, codes -1 where missing.
+
+    Codes are ranked so that sorting by code sorts by label.
+    """
+    col = frame.column(key)
+    if key in CATEGORICAL_FIELDS:
+        labels = np.array(frame.categories[key], dtype=object)
+        order = np.argsort(labels, kind="stable") if len(labels) else np.array([], dtype=int)
+        rank = np.empty(len(labels), dtype=np.int64)
+        rank[order] = np.arange(len(labels))
+        codes = np.where(col >= 0, rank[np.maximum(col, 0)] if len(labels) else -1, -1)
+        return codes, labels[order].tolist()
+    if key in FLAG_FIELDS:
+        return col.astype(np.int64), [False, True]
+
+    valid = ~np.isnan(col)
+    uniques, inverse = np.unique(col[valid], return_inverse=True)
+    codes = np.full(len(col), -1, dtype=np.int64)
+    codes[valid] = inverse
+    return codes, uniques.tolist()
+
+
+def group_aggregate(
+    frame: BookFrame,
+    keys: str | list[str],
+    field: str | None = None,
+    aggs: list[str] = ("count",),
+) -> dict:
+    """Aggregate a numeric column grouped by one or more key columns.
+
+    Keys are factorized once, rows are sorted once by (group, value) and
+    every statistic is read off the sorted run boundaries, so the cost is
+    a single O(N log N) sort regardless of how many groups there are.
+    Rows with a missing key or a missing value are left out. With
+    field=None only "count" (rows per group) is available.
+
+    Returns {key: {agg: value}}, where key is the label for a single key
+    column and a tuple of labels for several, ordered by key.
+    """
+    single = isinstance(keys, str)
+    keys = [keys] if single else list(keys)
+    unknown = set(aggs) - set(AGGREGATIONS)
+    if unknown:
+        raise ValueError(f'Unknown aggregations: {", ".join(sorted(unknown))}')
+    if field is None and set(aggs) != {"count"}:
+        raise ValueError('Only "count" is available without a field.')
+
+    factorized = [_factorize(frame, k) for k in keys]
+    dims = tuple(max(len(labels), 1) for _, labels in factorized)
+    valid = np.ones(len(frame), dtype=bool)
+    for codes, _ in factorized:
+        valid &= codes >= 0
+
+    if field is None:
+        values = np.zeros(len(frame))
+    else:
+        values = frame.column(field).astype(float, copy=False)
+        valid &= ~np.isnan(values)
+
+    group = np.ravel_multi_index(tuple(codes[valid] for codes, _ in factorized), dims)
+    values = values[valid]
+    order = np.lexsort((values, group))
+    group = group[order]
+    values = values[order]
+
+    if len(group) == 0:
+        return {}
+    starts = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+    counts = np.diff(np.r_[starts, len(group)])
+    ends = starts + counts - 1
+
+    stats = {}
+    if "count" in aggs:
+        stats["count"] = counts
+    if "sum" in aggs or "mean" in aggs:
+        sums = np.add.reduceat(values, starts)
+        if "sum" in aggs:
+            stats["sum"] = sums
+        if "mean" in aggs:
+            stats["mean"] = sums / counts
+    if "median" in aggs:
+        stats["median"] = (values[starts + (counts - 1) // 2] + values[starts + counts // 2]) / 2
+    if "min" in aggs:
+        stats["min"] = values[starts]
+    if "max" in aggs:
+        stats["max"] = values[ends]
+
+    group_codes = np.unravel_index(group[starts], dims)
+    result = {}
+    for i in range(len(starts)):
+        labels = tuple(factorized[k][1][group_codes[k][i]] for k in range(len(keys)))
+        result[labels[0] if single else labels] = {
+            agg: int(stats[agg][i]) if agg == "count" else float(stats[agg][i])
+            for agg in aggs
+        }
+    return result
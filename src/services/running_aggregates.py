@@ -0,0 +1,141 @@
+from typing import Iterable, Optional
+from src.domain.book import Book
+
+
+class HistogramSketch:
+    """Fixed-bin histogram for approximate quantiles.
+
+    add/remove are O(1); quantile walks the bins, so its cost depends on
+    the bin count, not on how many values were added. Values outside
+    [lo, hi] are counted in the edge bins.
+    """
+
+    def __init__(self, lo: float = 0.0, hi: float = 300.0, bins: int = 3000):
+        self.lo = lo
+        self.hi = hi
+        self.width = (hi - lo) / bins
+        self.counts = [0] * bins
+        self.total = 0
+
+    def _bin(self, value: float) -> int:
+        idx = int((value - self.lo) / self.width)
+        return min(max(idx, 0), len(self.counts) - 1)
+
+    def add(self, value: float) -> None:
+        self.counts[self._bin(value)] += 1
+        self.total += 1
+
+    def remove(self, value: float) -> None:
+        self.counts[self._bin(value)] -= 1
+        self.total -= 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self.total == 0:
+            return None
+        target = q * self.total
+        seen = 0
+        for idx, count in enumerate(self.counts):
+            if count and seen + count >= target:
+                # interpolate inside the bin
+                frac = (target - seen) / count
+                return self.lo + (idx + frac) * self.width
+            seen += count
+        return self.hi
+
+
+class RunningAggregates:
+    """Catalog metrics maintained incrementally from book events.
+
+    Subscribe it to BookService and CheckoutService. Each add/update/delete
+    subtracts the book's previous contribution and adds the new one, so
+    average_price, genre_counts, mean_rating_by_genre and availability
+    are answered without reading the catalog. With price_sketch=True a
+    HistogramSketch per genre also gives approximate median prices.
+    """
+
+    def __init__(self, price_sketch: bool = False):
+        self.price_sketch = price_sketch
+        self._contributions: dict[str, tuple] = {}
+        self._price_sum = 0.0
+        self._price_count = 0
+        self._genre_counts: dict[str, int] = {}
+        self._genre_rating_sum: dict[str, float] = {}
+        self._genre_rating_count: dict[str, int] = {}
+        self._genre_prices: dict[str, HistogramSketch] = {}
+        self._available = 0
+        self._checked_out = 0
+
+    @classmethod
+    def from_books(cls, books: Iterable[Book], price_sketch: bool = False) -> 'RunningAggregates':
+        aggregates = cls(price_sketch)
+        for book in books:
+            aggregates.book_added(book)
+        return aggregates
+
+    def _apply(self, contribution: tuple, sign: int) -> None:
+        price, genre, rating, available = contribution
+        if price is not None:
+            self._price_sum += sign * price
+            self._price_count += sign
+        if genre is not None:
+            self._genre_counts[genre] = self._genre_counts.get(genre, 0) + sign
+            if not self._genre_counts[genre]:
+                del self._genre_counts[genre]
+            if rating is not None:
+                self._genre_rating_sum[genre] = self._genre_rating_sum.get(genre, 0.0) + sign * rating
+                self._genre_rating_count[genre] = self._genre_rating_count.get(genre, 0) + sign
+                if not self._genre_rating_count[genre]:
+                    del self._genre_rating_sum[genre]
+                    del self._genre_rating_count[genre]
+            if self.price_sketch and price is not None:
+                sketch = self._genre_prices.setdefault(genre, HistogramSketch())
+                if sign > 0:
+                    sketch.add(price)
+                else:
+                    sketch.remove(price)
+        if available:
+            self._available += sign
+        elif available is not None:
+            self._checked_out += sign
+
+    def book_added(self, book: Book) -> None:
+        self.book_updated(book)
+
+    def book_updated(self, book: Book) -> None:
+        previous = self._contributions.get(book.book_id)
+        if previous is not None:
+            self._apply(previous, -1)
+        contribution = (book.price_usd, book.genre, book.average_rating, book.available)
+        self._contributions[book.book_id] = contribution
+        self._apply(contribution, 1)
+
+    def book_deleted(self, book_id: str) -> None:
+        previous = self._contributions.pop(book_id, None)
+        if previous is not None:
+            self._apply(previous, -1)
+
+    def average_price(self) -> float:
+        if not self._price_count:
+            return float("nan")
+        return round(self._price_sum / self._price_count, 2)
+
+    def genre_counts(self) -> dict[str, int]:
+        return {genre: self._genre_counts[genre] for genre in sorted(self._genre_counts)}
+
+    def mean_rating_by_genre(self) -> dict[str, float]:
+        return {
+            genre: self._genre_rating_sum[genre] / self._genre_rating_count[genre]
+            for genre in sorted(self._genre_rating_count)
+        }
+
+    def availability_counts(self) -> dict[str, int]:
+        return {"available": self._available, "checked_out": self._checked_out}
+
+    def approx_median_price_by_genre(self) -> dict[str, float]:
+        if not self.price_sketch:
+            raise ValueError('Create RunningAggregates with price_sketch=True for medians.')
+        return {
+            genre: self._genre_prices[genre].quantile(0.5)
+            for genre in sorted(self._genre_prices)
+            if self._genre_prices[genre].total
+        }
@@ -0,0 +1,37 @@
+import pytest
+from src.domain.book import Book
+from src.domain.compact_book import CompactBook
+
+
+def test_round_trips_through_dict():
+    book = Book(title="T", author="A", genre="Fantasy", price_usd=9.5, in_print=True)
+    compact = CompactBook.from_dict(book.to_dict())
+
+    assert compact.to_dict() == book.to_dict()
+    assert compact.book_id == book.book_id
+    assert isinstance(compact._id, bytes) and len(compact._id) == 16
+    assert compact.to_book() == book
+
+def test_non_uuid_ids_are_kept_verbatim():
+    compact = CompactBook(title="T", author="A", book_id="nonexistent")
+    assert compact.book_id == "nonexistent"
+
+def test_check_out_and_check_in():
+    compact = CompactBook(title="T", author="A")
+
+    compact.check_out()
+    assert compact.available is False
+    assert compact.last_checkout is not None
+    with pytest.raises(Exception):
+        compact.check_out()
+    compact.check_in()
+    assert compact.available is True
+
+def test_categorical_strings_are_interned():
+    a = CompactBook.from_dict({"title": "A", "author": "X", "genre": "".join(["Sci", "-Fi"])})
+    b = Book.from_dict({"title": "B", "author": "Y", "genre": "".join(["Sci", "-F", "i"])})
+    assert a.genre is b.genre
+
+def test_has_no_instance_dict():
+    assert not hasattr(CompactBook(title="T", author="A"), "__dict__")
+    assert not hasattr(Book(title="T", author="A"), "__dict__")
@@ -1,30 +1,67 @@
 from src.domain.book import Book
+from src.repositories.book_repository_protocol import check_version
+from typing import Iterator
 import uuid
 
 class MockBookRepo:
     def __init__(self):
         self._books = []
+        self._version = 0
 
     def get_all_books(self) -> list[Book]:
         return self._books.copy()
 
+    def iter_books(self) -> Iterator[Book]:
+        return iter(self._books.copy())
+
     def add_book(self, book: Book) -> str:
         if not getattr(book, "book_id", None):
             book.book_id = str(uuid.uuid4())
         self._books.append(book)
+        self._version += 1
         return book.book_id
 
+    def add_books(self, books: list[Book]) -> list[str]:
+        seen = {b.book_id for b in self._books}
+        added = []
+        for book in books:
+            if book.book_id not in seen:
+                seen.add(book.book_id)
+                self._books.append(book)
+                added.append(book.book_id)
+        if added:
+            self._version += 1
+        return added
+
     def find_book_by_name(self, query: str) -> list[Book]:
         return [b for b in self._books if b.title == query]
 
+    def get_book_by_id(self, book_id: str) -> Book | None:
+        return next((b for b in self._books if b.book_id == book_id), None)
+
+    def get_books_by_ids(self, book_ids: list[str]) -> dict[str, Book]:
+        wanted = set(book_ids)
+        return {b.book_id: b for b in self._books if b.book_id in wanted}
+
     def update_book(self, updated_book: Book) -> bool:
         for i, b in enumerate(self._books):
             if b.book_id == updated_book.book_id:
+                check_version(b, updated_book)
+                updated_book.version += 1
                 self._books[i] = updated_book
+                self._version += 1
                 return True
         return False
 
+    def update_books(self, updated_books: list[Book]) -> int:
+        return sum(self.update_book(b) for b in updated_books)
+
     def delete_book(self, book_id: str) -> bool:
         initial_len = len(self._books)
         self._books = [b for b in self._books if b.book_id != book_id]
+        if len(self._books) < initial_len:
+            self._version += 1
         return len(self._books) < initial_len
+
+    def catalog_version(self) -> int:
+        return self._version
@@ -8,6 +8,9 @@ class MockCheckoutHistoryRepo:
     def add_event(self, event: CheckoutEvent) -> None:
         self._events.append(event)
 
+    def add_events(self, events: list[CheckoutEvent]) -> None:
+        self._events.extend(events)
+
     def get_history_for_book(self, book_id: str) -> list[CheckoutEvent]:
         return [e for e in self._events if e.book_id == book_id]
 
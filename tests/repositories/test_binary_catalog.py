@@ -0,0 +1,98 @@
+import math
+import pytest
+from array import array
+from src.domain.book import Book
+from src.repositories.binary_catalog import (
+    BinaryCatalog,
+    BinaryCatalogWriter,
+    binary_to_json,
+    json_to_binary,
+    write_binary_catalog,
+)
+from src.repositories.book_repository import BookRepository
+
+
+def sample_books():
+    return [
+        Book(title="Dune", author="Herbert", genre="Science Fiction", publication_year=1965,
+             price_usd=9.99, in_print=True, last_checkout="2024-01-02T10:30:00", available=False),
+        Book(title="Émile", author="Rousseau", genre=None, ratings_count=None,
+             publisher_email="x@example.com"),
+        Book(title="Emma", author="Austen", genre="Romance", average_rating=4.1, ratings_count=120),
+    ]
+
+def test_round_trips_books(tmp_path):
+    path = str(tmp_path / "books.bin")
+    books = sample_books()
+    assert write_binary_catalog(path, books, chunk_size=2) == 3
+
+    with BinaryCatalog(path) as catalog:
+        assert len(catalog) == 3
+        assert list(catalog.iter_books()) == books
+
+def test_columns_are_typed_views(tmp_path):
+    path = str(tmp_path / "books.bin")
+    write_binary_catalog(path, sample_books())
+
+    with BinaryCatalog(path) as catalog:
+        prices = catalog.column("price_usd")
+        assert prices.readonly and prices.format == "d"
+        assert prices[0] == 9.99 and math.isnan(prices[1])
+        assert catalog.column("in_print").tolist() == [1, -1, -1]
+        genres = catalog.column("genre").tolist()
+        assert [catalog.labels("genre")[c] if c >= 0 else None for c in genres] == \
+            ["Science Fiction", None, "Romance"]
+        del prices
+
+def test_lookup_by_id(tmp_path):
+    path = str(tmp_path / "books.bin")
+    books = sample_books()
+    write_binary_catalog(path, books)
+
+    with BinaryCatalog(path) as catalog:
+        for book in books:
+            assert catalog.get_book_by_id(book.book_id) == book
+        assert catalog.get_book_by_id("missing") is None
+
+def test_append_columns_accepts_buffers(tmp_path):
+    path = str(tmp_path / "books.bin")
+    with BinaryCatalogWriter(path) as writer:
+        writer.append_columns({
+            "book_id": ["a", "b"],
+            "title": ["A", "B"],
+            "author": ["X", "X"],
+            "price_usd": array("d", [1.5, 2.5]),
+            "available": array("b", [1, 0]),
+        })
+
+    with BinaryCatalog(path) as catalog:
+        a, b = catalog.iter_books()
+        assert (a.price_usd, a.available, b.price_usd, b.available) == (1.5, True, 2.5, False)
+        assert a.genre is None and a.publication_year is None
+
+def test_load_checks_version(tmp_path):
+    path = str(tmp_path / "books.bin")
+    write_binary_catalog(path, sample_books(), version=(1, 2))
+
+    assert BinaryCatalog.load(path, (1, 2)) is not None
+    assert BinaryCatalog.load(path, (1, 3)) is None
+    assert BinaryCatalog.load(str(tmp_path / "missing.bin"), (1, 2)) is None
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "books.json"
+    path.write_text("[]" * 10, encoding="utf-8")
+    with pytest.raises(ValueError):
+        BinaryCatalog(str(path))
+
+def test_json_export_and_import(tmp_path):
+    json_path = str(tmp_path / "books.json")
+    bin_path = str(tmp_path / "books.bin")
+    repo = BookRepository(json_path)
+    repo._write_books(sample_books())
+
+    assert json_to_binary(json_path, bin_path) == 3
+    assert BinaryCatalog.load(bin_path, repo.catalog_version()) is not None
+
+    out_path = str(tmp_path / "out.json")
+    assert binary_to_json(bin_path, out_path) == 3
+    assert BookRepository(out_path).get_all_books() == repo.get_all_books()
@@ -0,0 +1,102 @@
+import json
+import os
+import pytest
+from src.repositories.book_repository import BookRepository
+from src.repositories.cached_book_repository import CachedBookRepository
+from src.domain.book import Book
+
+
+def make_repo(tmp_path, books=()):
+    path = tmp_path / "books.json"
+    path.write_text(json.dumps([b.to_dict() for b in books]), encoding="utf-8")
+    return CachedBookRepository(str(path))
+
+def test_find_book_by_name_uses_title_index(tmp_path):
+    repo = make_repo(tmp_path, [Book(title="A", author="X"), Book(title="B", author="Y")])
+
+    found = repo.find_book_by_name("B")
+    assert len(found) == 1
+    assert found[0].author == "Y"
+
+def test_mutations_are_persisted_and_indexed(tmp_path):
+    repo = make_repo(tmp_path)
+
+    book = Book(title="Old", author="X")
+    repo.add_book(book)
+    book.title = "New"
+    assert repo.update_book(book) is True
+
+    assert repo.find_book_by_name("Old") == []
+    assert len(repo.find_book_by_name("New")) == 1
+
+    reopened = CachedBookRepository(repo.filepath)
+    assert [b.title for b in reopened.get_all_books()] == ["New"]
+
+def test_returned_books_do_not_alias_cache(tmp_path):
+    repo = make_repo(tmp_path, [Book(title="A", author="X")])
+
+    repo.get_all_books()[0].title = "Changed"
+    assert repo.get_all_books()[0].title == "A"
+
+def test_reloads_when_file_changes_externally(tmp_path):
+    repo = make_repo(tmp_path, [Book(title="A", author="X")])
+    assert len(repo.get_all_books()) == 1
+
+    with open(repo.filepath, "w", encoding="utf-8") as f:
+        json.dump([Book(title="A", author="X").to_dict(), Book(title="B", author="Y").to_dict()], f)
+    st = os.stat(repo.filepath)
+    os.utime(repo.filepath, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    assert len(repo.get_all_books()) == 2
+    assert len(repo.find_book_by_name("B")) == 1
+
+def test_get_book_by_id(tmp_path):
+    book = Book(title="A", author="X")
+    repo = make_repo(tmp_path, [book])
+
+    assert repo.get_book_by_id(book.book_id).title == "A"
+    assert repo.get_book_by_id("missing") is None
+
+def test_catalog_version_changes_on_mutation(tmp_path):
+    repo = make_repo(tmp_path)
+    before = repo.catalog_version()
+
+    repo.add_book(Book(title="A", author="X"))
+
+    assert repo.catalog_version() != before
+
+def test_can_hold_compact_books(tmp_path):
+    from src.domain.compact_book import CompactBook
+    path = tmp_path / "books.json"
+    path.write_text(json.dumps([Book(title="A", author="X").to_dict()]), encoding="utf-8")
+    repo = CachedBookRepository(str(path), book_cls=CompactBook)
+
+    repo.add_book(Book(title="B", author="Y"))
+
+    assert all(isinstance(b, CompactBook) for b in repo.get_all_books())
+    assert len(CachedBookRepository(str(path)).get_all_books()) == 2
+
+def test_add_books_skips_known_and_repeated_ids_in_one_write(tmp_path):
+    repo = make_repo(tmp_path, [Book(title="A", author="X", book_id="a")])
+    batch = [
+        Book(title="A2", author="X", book_id="a"),
+        Book(title="B", author="Y", book_id="b"),
+        Book(title="B2", author="Y", book_id="b"),
+    ]
+
+    assert repo.add_books(batch) == ["b"]
+    assert repo.add_books([]) == []
+
+    reopened = CachedBookRepository(repo.filepath)
+    assert sorted(b.title for b in reopened.get_all_books()) == ["A", "B"]
+    assert len(reopened.find_book_by_name("B")) == 1
+
+@pytest.mark.parametrize("repo_cls", [BookRepository, CachedBookRepository])
+def test_get_books_by_ids_reads_a_batch(tmp_path, repo_cls):
+    books = [Book(title=f"B{i}", author="A", book_id=f"b{i}") for i in range(3)]
+    repo = repo_cls(make_repo(tmp_path, books).filepath)
+
+    found = repo.get_books_by_ids(["b2", "missing", "b0"])
+
+    assert sorted(found) == ["b0", "b2"]
+    assert found["b2"].title == "B2"
@@ -0,0 +1,93 @@
+import json
+import pytest
+from datetime import datetime
+from src.domain.book import Book
+from src.domain.checkout_history import CheckoutEvent
+from src.domain.compact_book import CompactBook
+from src.repositories import codecs
+from src.repositories.book_repository import BookRepository
+from src.repositories.checkout_history_repository import CheckoutHistoryRepository
+from src.repositories.codecs import CompactJsonCodec, FastJsonCodec, JsonCodec, get_codec
+from src.repositories.logged_book_repository import LoggedBookRepository
+
+
+ALL_CODECS = [JsonCodec, CompactJsonCodec, FastJsonCodec]
+
+def sample_books():
+    return [
+        Book(title="Dune", author="Herbert", genre="Science Fiction", price_usd=9.99,
+             in_print=True, last_checkout="2024-01-02"),
+        Book(title="Emma", author="Austen", genre="Romance", publication_year=1815),
+    ]
+
+@pytest.mark.parametrize("codec_cls", ALL_CODECS)
+def test_books_round_trip(codec_cls):
+    codec = codec_cls()
+    books = sample_books()
+    assert codec.decode_books(codec.encode_books(books)) == books
+
+@pytest.mark.parametrize("codec_cls", ALL_CODECS)
+def test_output_is_plain_json(codec_cls):
+    data = codec_cls().encode_books(sample_books())
+    assert [d["title"] for d in json.loads(data)] == ["Dune", "Emma"]
+
+def test_compact_codec_is_smaller_than_indented():
+    books = sample_books()
+    assert len(CompactJsonCodec().encode_books(books)) < len(JsonCodec().encode_books(books))
+
+def test_fast_decode_interns_categoricals():
+    data = JsonCodec().encode_books(sample_books() + sample_books())
+    books = FastJsonCodec().decode_books(data)
+    assert books[0].genre is books[2].genre
+
+def test_fast_decode_falls_back_on_untyped_records():
+    # price as a string doesn't fit Book's schema; the dict path accepts it
+    data = json.dumps([{"title": "T", "author": "A", "price_usd": "12.50"}]).encode()
+    books = FastJsonCodec().decode_books(data)
+    assert books[0].price_usd == "12.50"
+
+def test_fast_decode_honours_book_cls():
+    data = FastJsonCodec().encode_books(sample_books())
+    books = FastJsonCodec().decode_books(data, CompactBook)
+    assert all(isinstance(b, CompactBook) for b in books)
+
+def test_fast_codec_without_optional_libraries(monkeypatch):
+    monkeypatch.setattr(codecs, "orjson", None)
+    monkeypatch.setattr(codecs, "msgspec", None)
+    codec = FastJsonCodec()
+    books = sample_books()
+    assert codec.encode_books(books) == CompactJsonCodec().encode_books(books)
+    assert codec.decode_books(codec.encode_books(books)) == books
+
+def test_get_codec():
+    assert isinstance(get_codec("compact"), CompactJsonCodec)
+    with pytest.raises(ValueError):
+        get_codec("yaml")
+
+def test_default_codec_keeps_indented_layout(tmp_path):
+    repo = BookRepository(str(tmp_path / "books.json"))
+    repo._write_books(sample_books())
+    assert (tmp_path / "books.json").read_text(encoding="utf-8").startswith('[\n  {')
+
+@pytest.mark.parametrize("repo_cls", [BookRepository, LoggedBookRepository])
+def test_repositories_read_files_written_by_another_codec(tmp_path, repo_cls):
+    path = str(tmp_path / "books.json")
+    BookRepository(path, codec=JsonCodec())._write_books(sample_books())
+    repo = repo_cls(path, codec=FastJsonCodec())
+    book = repo.find_book_by_name("Emma")[0]
+    book.price_usd = 4.5
+    repo.update_book(book)
+    if isinstance(repo, LoggedBookRepository):
+        repo.compact()
+    assert BookRepository(path).find_book_by_name("Emma")[0].price_usd == 4.5
+
+def test_checkout_history_with_compact_codec(tmp_path):
+    path = tmp_path / "history.json"
+    repo = CheckoutHistoryRepository(str(path), codec=CompactJsonCodec())
+    repo.add_events([
+        CheckoutEvent(book_id="b1", checkout_date=datetime(2024, 1, 1)),
+        CheckoutEvent(book_id="b2", checkout_date=datetime(2024, 1, 2),
+                      return_date=datetime(2024, 1, 9), returned=True),
+    ])
+    assert "\n" not in path.read_text(encoding="utf-8")
+    assert [e.book_id for e in repo.get_history_for_book("b2")] == ["b2"]
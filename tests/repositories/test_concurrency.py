@@ -0,0 +1,152 @@
+import json
+import multiprocessing
+import os
+import sqlite3
+import pytest
+from datetime import datetime
+from src.domain.book import Book
+from src.domain.checkout_history import CheckoutEvent
+from src.repositories.book_repository import BookRepository
+from src.repositories.book_repository_protocol import ConcurrentModificationError
+from src.repositories.cached_book_repository import CachedBookRepository
+from src.repositories.checkout_history_repository import CheckoutHistoryRepository
+from src.repositories.file_lock import FileLock, atomic_write
+from src.repositories.indexed_checkout_history_repository import IndexedCheckoutHistoryRepository
+from src.repositories.jsonl_checkout_history_repository import JsonlCheckoutHistoryRepository
+from src.repositories.logged_book_repository import LoggedBookRepository
+from src.repositories.sqlite_book_repository import SqliteBookRepository
+
+
+def json_repo(path, repo_cls):
+    if repo_cls is LoggedBookRepository:
+        return LoggedBookRepository(path, fsync=False)
+    return repo_cls(path)
+
+def seeded_json_path(tmp_path, book):
+    path = tmp_path / "books.json"
+    path.write_text(json.dumps([book.to_dict()]), encoding="utf-8")
+    return str(path)
+
+@pytest.mark.parametrize("repo_cls", [BookRepository, CachedBookRepository, LoggedBookRepository])
+def test_stale_update_is_rejected(tmp_path, repo_cls):
+    path = seeded_json_path(tmp_path, Book(title="T", author="A", price_usd=1.0, book_id="b1"))
+    first, second = json_repo(path, repo_cls), json_repo(path, repo_cls)
+    mine, theirs = first.get_book_by_id("b1"), second.get_book_by_id("b1")
+
+    mine.price_usd = 2.0
+    assert first.update_book(mine) is True
+    assert mine.version == 1
+
+    theirs.price_usd = 3.0
+    with pytest.raises(ConcurrentModificationError):
+        second.update_book(theirs)
+    assert json_repo(path, repo_cls).get_book_by_id("b1").price_usd == 2.0
+
+def test_sqlite_stale_update_is_rejected(tmp_path):
+    db_path = str(tmp_path / "library.db")
+    first, second = SqliteBookRepository(db_path), SqliteBookRepository(db_path)
+    first.add_book(Book(title="T", author="A", book_id="b1"))
+    other = Book(title="U", author="A", book_id="b2")
+    first.add_book(other)
+    mine, theirs = first.get_book_by_id("b1"), second.get_book_by_id("b1")
+
+    assert first.update_book(mine) is True
+    with pytest.raises(ConcurrentModificationError):
+        second.update_books([second.get_book_by_id("b2"), theirs])
+    # the batch was rolled back, including the non-conflicting book
+    assert second.get_book_by_id("b2").version == 0
+    assert second.get_book_by_id("b1").version == 1
+
+def test_sqlite_adds_version_column_to_old_databases(tmp_path):
+    db_path = str(tmp_path / "library.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE books (book_id TEXT PRIMARY KEY, title TEXT NOT NULL, "
+                 "author TEXT NOT NULL, genre TEXT, publication_year INTEGER, "
+                 "page_count INTEGER, average_rating REAL, ratings_count INTEGER, "
+                 "price_usd REAL, publisher TEXT, language TEXT, format TEXT, "
+                 "in_print INTEGER, sales_millions REAL, last_checkout TEXT, "
+                 "available INTEGER, publisher_email TEXT)")
+    conn.execute("INSERT INTO books (book_id, title, author) VALUES ('b1', 'T', 'A')")
+    conn.commit()
+    conn.close()
+
+    repo = SqliteBookRepository(db_path)
+    book = repo.get_book_by_id("b1")
+    assert book.version == 0
+    assert repo.update_book(book) is True
+
+def test_atomic_write_replaces_without_leftovers(tmp_path):
+    path = str(tmp_path / "data.json")
+    atomic_write(path, b"old")
+    atomic_write(path, b"new")
+    assert open(path, "rb").read() == b"new"
+    assert os.listdir(tmp_path) == ["data.json"]
+
+def test_file_lock_is_reentrant(tmp_path):
+    lock = FileLock(str(tmp_path / "x.lock"))
+    with lock:
+        with lock:
+            pass
+    with lock:
+        pass
+
+def _bump_prices(path: str, rounds: int) -> None:
+    repo = CachedBookRepository(path)
+    for _ in range(rounds):
+        while True:
+            book = repo.get_book_by_id("b1")
+            book.price_usd += 1
+            try:
+                repo.update_book(book)
+                break
+            except ConcurrentModificationError:
+                continue
+
+def _add_events(path: str, book_id: str, count: int) -> None:
+    repo = CheckoutHistoryRepository(path)
+    for _ in range(count):
+        repo.add_event(CheckoutEvent(book_id=book_id, checkout_date=datetime(2026, 1, 1)))
+
+def test_parallel_processes_lose_no_updates(tmp_path):
+    path = seeded_json_path(tmp_path, Book(title="T", author="A", price_usd=0.0, book_id="b1"))
+    history_path = str(tmp_path / "history.json")
+    workers = [multiprocessing.Process(target=_bump_prices, args=(path, 25)) for _ in range(3)]
+    workers += [
+        multiprocessing.Process(target=_add_events, args=(history_path, f"b{i}", 25))
+        for i in range(3)
+    ]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+    book = BookRepository(path).get_book_by_id("b1")
+    assert (book.price_usd, book.version) == (75.0, 75)
+    assert len(CheckoutHistoryRepository(history_path).get_history_all()) == 75
+
+def _add_jsonl_events(path: str, repo_cls: type, book_id: str, count: int) -> None:
+    repo = repo_cls(path)
+    for _ in range(count):
+        repo.add_event(CheckoutEvent(book_id=book_id, checkout_date=datetime(2026, 1, 1)))
+        # reads catch the index up with the other writers' appends
+        repo.get_history_for_book(book_id)
+
+def test_parallel_processes_share_a_jsonl_history(tmp_path):
+    path = str(tmp_path / "history.jsonl")
+    workers = [
+        multiprocessing.Process(target=_add_jsonl_events, args=(path, IndexedCheckoutHistoryRepository, f"b{i}", 25))
+        for i in range(3)
+    ]
+    workers.append(
+        multiprocessing.Process(target=_add_jsonl_events, args=(path, JsonlCheckoutHistoryRepository, "b3", 25))
+    )
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+    assert len(JsonlCheckoutHistoryRepository(path).get_history_all()) == 100
+    repo = IndexedCheckoutHistoryRepository(path)
+    assert [len(repo.get_history_for_book(f"b{i}")) for i in range(4)] == [25, 25, 25, 25]
+    # header plus exactly one entry per event
+    assert len(open(repo.index_path, encoding="utf-8").readlines()) == 101
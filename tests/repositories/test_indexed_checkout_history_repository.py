@@ -0,0 +1,76 @@
+import os
+from datetime import datetime
+from src.repositories.indexed_checkout_history_repository import IndexedCheckoutHistoryRepository
+from src.repositories.jsonl_checkout_history_repository import JsonlCheckoutHistoryRepository
+from src.domain.checkout_history import CheckoutEvent
+
+
+def test_history_for_book_reads_indexed_events(tmp_path):
+    repo = IndexedCheckoutHistoryRepository(str(tmp_path / "history.jsonl"))
+    repo.add_event(CheckoutEvent(book_id="a", checkout_date=datetime(2026, 1, 1)))
+    repo.add_event(CheckoutEvent(book_id="b", checkout_date=datetime(2026, 1, 2)))
+    repo.add_event(CheckoutEvent(book_id="a", return_date=datetime(2026, 1, 3), returned=True))
+
+    events = repo.get_history_for_book("a")
+    assert [e.returned for e in events] == [False, True]
+    assert events[1].return_date == datetime(2026, 1, 3)
+    assert repo.get_history_for_book("missing") == []
+    # a header line naming the log, then one line per event
+    assert len(open(repo.index_path, encoding="utf-8").readlines()) == 4
+
+def test_index_catches_up_with_unindexed_appends(tmp_path):
+    path = str(tmp_path / "history.jsonl")
+    JsonlCheckoutHistoryRepository(path).add_event(
+        CheckoutEvent(book_id="a", checkout_date=datetime(2026, 1, 1))
+    )
+
+    repo = IndexedCheckoutHistoryRepository(path)
+    repo.add_event(CheckoutEvent(book_id="a", return_date=datetime(2026, 1, 2), returned=True))
+    JsonlCheckoutHistoryRepository(path).add_event(
+        CheckoutEvent(book_id="a", checkout_date=datetime(2026, 1, 3))
+    )
+
+    assert len(repo.get_history_for_book("a")) == 3
+    assert len(IndexedCheckoutHistoryRepository(path).get_history_for_book("a")) == 3
+
+def test_index_is_rebuilt_when_log_is_replaced(tmp_path):
+    path = str(tmp_path / "history.jsonl")
+    repo = IndexedCheckoutHistoryRepository(path)
+    repo.add_event(CheckoutEvent(book_id="a", checkout_date=datetime(2026, 1, 1)))
+    repo.add_event(CheckoutEvent(book_id="a", checkout_date=datetime(2026, 1, 2)))
+
+    os.remove(path)
+    JsonlCheckoutHistoryRepository(path).add_event(
+        CheckoutEvent(book_id="b", checkout_date=datetime(2026, 1, 1))
+    )
+
+    reopened = IndexedCheckoutHistoryRepository(path)
+    assert reopened.get_history_for_book("a") == []
+    assert len(reopened.get_history_for_book("b")) == 1
+
+def test_instances_sharing_a_log_do_not_duplicate_index_entries(tmp_path):
+    path = str(tmp_path / "history.jsonl")
+    first, second = IndexedCheckoutHistoryRepository(path), IndexedCheckoutHistoryRepository(path)
+    second.add_event(CheckoutEvent(book_id="b", checkout_date=datetime(2026, 1, 1)))
+    first.add_event(CheckoutEvent(book_id="a", checkout_date=datetime(2026, 1, 2)))
+
+    assert len(second.get_history_for_book("a")) == 1
+    assert len(first.get_history_for_book("b")) == 1
+    assert len(IndexedCheckoutHistoryRepository(path).get_history_for_book("a")) == 1
+    entries = open(first.index_path, encoding="utf-8").readlines()[1:]
+    assert sorted(line.split("\t")[0] for line in entries) == ["a", "b"]
+
+def test_index_is_rebuilt_when_log_is_replaced_by_a_larger_one(tmp_path):
+    path = str(tmp_path / "history.jsonl")
+    repo = IndexedCheckoutHistoryRepository(path)
+    repo.add_event(CheckoutEvent(book_id="a", checkout_date=datetime(2026, 1, 1)))
+
+    other = str(tmp_path / "other.jsonl")
+    JsonlCheckoutHistoryRepository(other).add_events([
+        CheckoutEvent(book_id="b", checkout_date=datetime(2026, 1, d)) for d in range(1, 4)
+    ])
+    os.replace(other, path)
+
+    assert repo.get_history_for_book("a") == []
+    assert len(repo.get_history_for_book("b")) == 3
+    assert len(IndexedCheckoutHistoryRepository(path).get_history_for_book("b")) == 3
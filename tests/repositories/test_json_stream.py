@@ -0,0 +1,45 @@
+import io
+import json
+import pytest
+from src.repositories.json_stream import iter_json_array, iter_json_array_chunks, iter_jsonl
+from src.repositories.book_repository import BookRepository
+from src.domain.book import Book
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64 * 1024])
+def test_iter_json_array_matches_json_load(chunk_size):
+    data = [{"a": 1, "b": "x]"}, 1.5, -2e-3, None, True, [1, 2], "tail"]
+    text = json.dumps(data, indent=2)
+
+    assert list(iter_json_array(io.StringIO(text), chunk_size)) == data
+
+def test_iter_json_array_rejects_truncated_input():
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO('[{"a": 1}, {"b"'), 4))
+
+def test_iter_jsonl_skips_torn_last_line():
+    assert list(iter_jsonl(io.StringIO('{"a": 1}\n{"b": 2}\n{"c"'))) == [{"a": 1}, {"b": 2}]
+
+def test_book_repository_iter_books_streams_file(tmp_path):
+    path = tmp_path / "books.json"
+    books = [Book(title=f"Book {i}", author="A") for i in range(5)]
+    path.write_text(json.dumps([b.to_dict() for b in books], indent=2), encoding="utf-8")
+    repo = BookRepository(str(path))
+
+    assert [b.book_id for b in repo.iter_books()] == [b.book_id for b in books]
+    assert repo.get_book_by_id(books[3].book_id).title == "Book 3"
+
+@pytest.mark.parametrize("chunk_size", [5, 64, 64 * 1024])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_iter_json_array_chunks_matches_json_load(chunk_size, indent):
+    data = [{"title": f"Book {i}", "tags": "a},{b", "n": i} for i in range(50)]
+    data.append({"nested": {"x": [1, {"y": 2}]}, "title": "odd one"})
+    text = json.dumps(data, indent=indent)
+
+    chunks = list(iter_json_array_chunks(io.StringIO(text), chunk_size))
+    assert [item for chunk in chunks for item in chunk] == data
+
+def test_iter_json_array_chunks_handles_empty_array_and_truncation():
+    assert list(iter_json_array_chunks(io.StringIO(" [ ] "))) == []
+    with pytest.raises(ValueError):
+        list(iter_json_array_chunks(io.StringIO('[{"a": 1}, {"b"'), 4))
@@ -0,0 +1,36 @@
+import json
+from datetime import datetime
+from src.repositories.jsonl_checkout_history_repository import (
+    JsonlCheckoutHistoryRepository,
+    convert_json_history,
+)
+from src.domain.checkout_history import CheckoutEvent
+
+
+def test_add_event_appends_one_line(tmp_path):
+    repo = JsonlCheckoutHistoryRepository(str(tmp_path / "history.jsonl"))
+
+    repo.add_event(CheckoutEvent(book_id="a", checkout_date=datetime(2026, 1, 1)))
+    repo.add_event(CheckoutEvent(book_id="a", return_date=datetime(2026, 1, 2), returned=True))
+
+    lines = open(repo.filepath, encoding="utf-8").read().splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[1])["returned"] is True
+    assert [e.returned for e in repo.get_history_for_book("a")] == [False, True]
+
+def test_missing_file_has_no_history(tmp_path):
+    repo = JsonlCheckoutHistoryRepository(str(tmp_path / "history.jsonl"))
+    assert repo.get_history_all() == []
+
+def test_convert_json_history(tmp_path):
+    src = tmp_path / "history.json"
+    src.write_text(json.dumps([
+        {"book_id": "a", "checkout_date": "2026-02-04T01:03:21", "return_date": None, "returned": False},
+        {"book_id": "b", "checkout_date": None, "return_date": "2026-02-05T01:03:21", "returned": True},
+    ]), encoding="utf-8")
+    dest = str(tmp_path / "history.jsonl")
+
+    assert convert_json_history(str(src), dest) == 2
+    events = JsonlCheckoutHistoryRepository(dest).get_history_all()
+    assert [e.book_id for e in events] == ["a", "b"]
+    assert events[0].checkout_date == datetime(2026, 2, 4, 1, 3, 21)
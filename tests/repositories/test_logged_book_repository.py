@@ -0,0 +1,71 @@
+import json
+from src.repositories.logged_book_repository import LoggedBookRepository
+from src.domain.book import Book
+
+
+def make_repo(tmp_path, **kwargs):
+    path = tmp_path / "books.json"
+    path.write_text(json.dumps([Book(title="Seed", author="S").to_dict()]), encoding="utf-8")
+    return LoggedBookRepository(str(path), fsync=False, **kwargs)
+
+def test_mutations_append_to_log_and_leave_snapshot_alone(tmp_path):
+    repo = make_repo(tmp_path)
+    snapshot = open(repo.filepath, encoding="utf-8").read()
+
+    book = Book(title="New", author="A")
+    repo.add_book(book)
+    book.price_usd = 9.99
+    repo.update_book(book)
+
+    assert open(repo.filepath, encoding="utf-8").read() == snapshot
+    assert len(open(repo.log_path, encoding="utf-8").readlines()) == 2
+
+def test_startup_replays_log_over_snapshot(tmp_path):
+    repo = make_repo(tmp_path)
+    seed = repo.get_all_books()[0]
+    book = Book(title="New", author="A", price_usd=5.0)
+    repo.add_book(book)
+    repo.delete_book(seed.book_id)
+
+    reopened = LoggedBookRepository(repo.filepath, fsync=False)
+    books = reopened.get_all_books()
+    assert [b.title for b in books] == ["New"]
+    assert books[0].price_usd == 5.0
+
+def test_torn_last_record_is_ignored(tmp_path):
+    repo = make_repo(tmp_path)
+    repo.add_book(Book(title="New", author="A"))
+    with open(repo.log_path, "a", encoding="utf-8") as f:
+        f.write('{"op": "put", "book": {"tit')
+
+    reopened = LoggedBookRepository(repo.filepath, fsync=False)
+    assert sorted(b.title for b in reopened.get_all_books()) == ["New", "Seed"]
+
+def test_append_after_torn_record_keeps_log_readable(tmp_path):
+    repo = make_repo(tmp_path)
+    repo.add_book(Book(title="New", author="A"))
+    with open(repo.log_path, "a", encoding="utf-8") as f:
+        f.write('{"op": "put", "book": {"tit')
+
+    repo.add_book(Book(title="After", author="A"))
+
+    reopened = LoggedBookRepository(repo.filepath, fsync=False)
+    assert sorted(b.title for b in reopened.get_all_books()) == ["After", "New", "Seed"]
+    assert len(open(repo.log_path, encoding="utf-8").readlines()) == 2
+
+def test_compaction_folds_log_into_snapshot(tmp_path):
+    repo = make_repo(tmp_path, compact_threshold=1)
+    repo.add_book(Book(title="New", author="A"))
+
+    assert open(repo.log_path, encoding="utf-8").read() == ""
+    with open(repo.filepath, encoding="utf-8") as f:
+        assert sorted(b["title"] for b in json.load(f)) == ["New", "Seed"]
+
+def test_add_books_appends_one_log_record_per_book(tmp_path):
+    repo = make_repo(tmp_path)
+
+    added = repo.add_books([Book(title=f"B{i}", author="A") for i in range(3)])
+
+    assert len(added) == 3
+    assert len(open(repo.log_path, encoding="utf-8").readlines()) == 3
+    assert len(LoggedBookRepository(repo.filepath).get_all_books()) == 4
@@ -0,0 +1,86 @@
+import json
+from datetime import datetime
+from src.repositories.sqlite_book_repository import SqliteBookRepository
+from src.repositories.sqlite_checkout_history_repository import SqliteCheckoutHistoryRepository
+from src.migrate_to_sqlite import migrate
+from src.domain.book import Book
+from src.domain.checkout_history import CheckoutEvent
+
+
+def test_book_crud_roundtrip(tmp_path):
+    repo = SqliteBookRepository(str(tmp_path / "library.db"))
+
+    book = Book(title="Title", author="Author", in_print=True, price_usd=12.5)
+    repo.add_book(book)
+    book.available = False
+    assert repo.update_book(book) is True
+
+    found = repo.find_book_by_name("Title")
+    assert len(found) == 1
+    assert found[0].available is False
+    assert found[0].in_print is True
+    assert found[0].price_usd == 12.5
+
+    assert repo.delete_book(book.book_id) is True
+    assert repo.delete_book(book.book_id) is False
+    assert repo.get_all_books() == []
+
+def test_update_missing_book_returns_false(tmp_path):
+    repo = SqliteBookRepository(str(tmp_path / "library.db"))
+    assert repo.update_book(Book(title="X", author="Y", book_id="missing")) is False
+
+def test_add_books_ignores_existing_ids(tmp_path):
+    repo = SqliteBookRepository(str(tmp_path / "library.db"))
+    repo.add_book(Book(title="Old", author="A", book_id="a"))
+
+    added = repo.add_books([
+        Book(title="New", author="A", book_id="a"),
+        Book(title="B", author="B", book_id="b"),
+    ])
+
+    assert added == ["b"]
+    assert repo.get_book_by_id("a").title == "Old"
+    assert len(repo.get_all_books()) == 2
+
+def test_get_books_by_ids_spans_parameter_chunks(tmp_path):
+    repo = SqliteBookRepository(str(tmp_path / "library.db"))
+    repo.add_books([Book(title=f"B{i}", author="A", book_id=f"b{i}") for i in range(1200)])
+
+    found = repo.get_books_by_ids([f"b{i}" for i in range(0, 1200, 2)] + ["missing"])
+
+    assert len(found) == 600
+    assert found["b1198"].title == "B1198"
+
+def test_history_for_book(tmp_path):
+    repo = SqliteCheckoutHistoryRepository(str(tmp_path / "library.db"))
+    repo.add_event(CheckoutEvent(book_id="a", checkout_date=datetime(2026, 1, 1)))
+    repo.add_event(CheckoutEvent(book_id="b", checkout_date=datetime(2026, 1, 2)))
+    repo.add_event(CheckoutEvent(book_id="a", return_date=datetime(2026, 1, 3), returned=True))
+
+    events = repo.get_history_for_book("a")
+    assert [e.returned for e in events] == [False, True]
+    assert events[0].checkout_date == datetime(2026, 1, 1)
+    assert len(repo.get_history_all()) == 3
+
+def test_migrate_imports_json_stores(tmp_path):
+    books_path = tmp_path / "books.json"
+    history_path = tmp_path / "checkout_history.json"
+    book = Book(title="Migrated", author="A")
+    books_path.write_text(json.dumps([book.to_dict()]), encoding="utf-8")
+    history_path.write_text(json.dumps([{
+        "book_id": book.book_id,
+        "checkout_date": "2026-02-04T01:03:21",
+        "return_date": None,
+        "returned": False,
+    }]), encoding="utf-8")
+    db_path = str(tmp_path / "library.db")
+
+    assert migrate(str(books_path), str(history_path), db_path) == (1, 1)
+    assert SqliteBookRepository(db_path).find_book_by_name("Migrated")[0].book_id == book.book_id
+    assert len(SqliteCheckoutHistoryRepository(db_path).get_history_for_book(book.book_id)) == 1
+
+    book.price_usd = 9.5
+    books_path.write_text(json.dumps([book.to_dict()]), encoding="utf-8")
+    assert migrate(str(books_path), str(history_path), db_path) == (1, 1)
+    assert SqliteBookRepository(db_path).get_book_by_id(book.book_id).price_usd == 9.5
+    assert len(SqliteCheckoutHistoryRepository(db_path).get_history_all()) == 1
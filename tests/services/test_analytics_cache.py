@@ -0,0 +1,64 @@
+from src.services.analytics_cache import AnalyticsCache
+from src.services.book_analytics_service import BookAnalyticsService
+from src.services.book_frame import BookFrame
+from src.services.book_service import BookService
+from tests.mocks.mock_book_repository import MockBookRepo
+from src.domain.book import Book
+
+
+def make_cache(maxsize=128):
+    svc = BookService(MockBookRepo())
+    svc.add_book(Book(title="A", author="X", price_usd=10.0))
+    return AnalyticsCache(BookAnalyticsService(), svc, maxsize=maxsize), svc
+
+def test_repeated_query_is_served_from_cache():
+    cache, _ = make_cache()
+
+    assert cache.get("average_price") == 10.0
+    assert cache.get("average_price") == 10.0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_mutation_invalidates_results():
+    cache, svc = make_cache()
+    cache.get("average_price")
+
+    svc.add_book(Book(title="B", author="Y", price_usd=20.0))
+
+    assert cache.get("average_price") == 15.0
+    assert cache.misses == 2
+
+def test_arguments_are_part_of_the_key_and_lru_evicts():
+    cache, _ = make_cache(maxsize=1)
+
+    cache.get("top_rated", min_ratings=0)
+    cache.get("top_rated", min_ratings=5)
+    cache.get("top_rated", min_ratings=0)
+
+    assert (cache.hits, cache.misses) == (0, 3)
+
+def test_misses_are_computed_over_the_frame_provider():
+    svc = BookService(MockBookRepo())
+    book = Book(title="A", author="X", price_usd=10.0)
+    svc.add_book(book)
+    frame = BookFrame.from_books([book])
+    svc.subscribe(frame)
+    calls = []
+    cache = AnalyticsCache(BookAnalyticsService(), svc, frame=lambda: calls.append(1) or frame)
+    svc.get_all_books = None  # the catalog must not be reloaded
+
+    assert cache.get("average_price") == 10.0
+    svc.add_book(Book(title="B", author="Y", price_usd=20.0))
+    assert cache.get("average_price") == 15.0
+    assert len(calls) == 2
+
+def test_list_arguments_are_cached_by_value():
+    cache, svc = make_cache()
+    svc.add_book(Book(title="B", author="Y", genre="Horror", price_usd=20.0))
+
+    first = cache.get("grouped_stats", keys=["genre", "format"], field="price_usd", aggs=["mean"])
+    again = cache.get("grouped_stats", ["genre", "format"], field="price_usd", aggs=["mean"])
+    same = cache.get("grouped_stats", keys=["genre", "format"], field="price_usd", aggs=["mean"])
+
+    assert first == again == same
+    assert first == BookAnalyticsService().grouped_stats(svc.get_all_books(), ["genre", "format"], "price_usd", ["mean"])
+    assert (cache.hits, cache.misses) == (1, 2)
@@ -0,0 +1,123 @@
+import json
+from pathlib import Path
+from src.domain.book import Book
+from src.services.book_cleaning_service import BookCleaningService
+
+
+def record(**overrides):
+    base = {"book_id": "b1", "title": "T", "author": "A"}
+    base.update(overrides)
+    return base
+
+def clean(*records):
+    return BookCleaningService().clean_records(list(records))
+
+def test_numeric_fields_are_coerced_and_range_checked():
+    rows, report = clean(
+        record(price_usd="12.50", page_count=300, average_rating=4.5),
+        record(price_usd="N/A", page_count=-5, average_rating=6.1),
+        record(price_usd=True, page_count="Unknown", average_rating="abc"),
+        record(price_usd=None, page_count=12.5, average_rating=None),
+    )
+
+    assert [r["price_usd"] for r in rows] == [12.5, None, None, None]
+    assert [r["page_count"] for r in rows] == [300, None, None, None]
+    assert [r["average_rating"] for r in rows] == [4.5, None, None, None]
+    assert report.rejections["price_usd"] == {"placeholder": 1, "not_numeric": 1}
+    assert report.rejections["page_count"] == {"out_of_range": 1, "placeholder": 1, "not_integer": 1}
+    assert report.rejections["average_rating"] == {"out_of_range": 1, "not_numeric": 1}
+    assert sorted(map(str, report.examples["average_rating"])) == ["6.1", "abc"]
+
+def test_booleans_and_categorical_synonyms_are_normalized():
+    rows, report = clean(
+        record(in_print="true", available="FALSE", language="english", format="Audio Book"),
+        record(in_print=False, available="maybe", language=" Eng ", format="audiobook"),
+        record(in_print=None, available=1, language="Klingon", format="N/A"),
+    )
+
+    assert [r["in_print"] for r in rows] == [True, False, None]
+    assert [r["available"] for r in rows] == [False, None, True]
+    assert [r["language"] for r in rows] == ["English", "English", "Klingon"]
+    assert [r["format"] for r in rows] == ["Audiobook", "Audiobook", None]
+    assert report.rejections["available"] == {"not_boolean": 1}
+
+def test_dates_and_emails():
+    rows, report = clean(
+        record(last_checkout="2024-05-01T10:00:00", publisher_email=" Info@Press.COM "),
+        record(last_checkout="N/A", publisher_email="not-an-email"),
+        record(last_checkout="yesterday", publisher_email=""),
+    )
+
+    assert [r["last_checkout"] for r in rows] == ["2024-05-01T10:00:00.000000", None, None]
+    assert [r["publisher_email"] for r in rows] == ["info@press.com", None, None]
+    assert report.rejections["last_checkout"] == {"placeholder": 1, "not_date": 1}
+    assert report.rejections["publisher_email"] == {"invalid_email": 1}
+
+def test_dates_with_mixed_utc_offsets_are_converted_to_utc():
+    rows, report = clean(
+        record(last_checkout="2024-05-01T10:00:00+02:00"),
+        record(last_checkout="2024-05-01T10:00:00-05:00"),
+        record(last_checkout="2024-05-01T10:00:00"),
+    )
+
+    assert [r["last_checkout"] for r in rows] == [
+        "2024-05-01T08:00:00.000000",
+        "2024-05-01T15:00:00.000000",
+        "2024-05-01T10:00:00.000000",
+    ]
+    assert "last_checkout" not in report.rejections
+
+def test_nested_values_in_text_fields_are_rejected():
+    rows, report = clean(
+        record(title=["T"], genre={"name": "Fantasy"}, language=["en"]),
+        record(book_id=["b2"]),
+        record(book_id="b3", publisher=["P"], in_print=[True], price_usd={"usd": 1}),
+    )
+
+    assert [r["book_id"] for r in rows] == ["b3"]
+    assert (rows[0]["publisher"], rows[0]["in_print"], rows[0]["price_usd"]) == (None, None, None)
+    assert report.rejections["title"] == {"not_text": 1, "missing": 1}
+    assert report.rejections["genre"] == {"not_text": 1}
+    assert report.rejections["language"] == {"not_text": 1}
+    assert report.rejections["book_id"] == {"not_text": 1, "missing": 1}
+    assert report.rejections["publisher"] == {"not_text": 1}
+    assert report.rejections["in_print"] == {"not_boolean": 1}
+    assert report.rejections["price_usd"] == {"not_numeric": 1}
+
+def test_all_bool_numeric_column_is_rejected_not_converted():
+    rows, report = clean(record(price_usd=True), record(book_id="b2", price_usd=False))
+
+    assert [r["price_usd"] for r in rows] == [None, None]
+    assert report.rejections["price_usd"] == {"not_numeric": 2}
+
+def test_version_is_carried_through():
+    rows, report = clean(record(version=7), record(book_id="b2"), record(book_id="b3", version=-1))
+
+    assert [r["version"] for r in rows] == [7, 0, 0]
+    assert report.rejections["version"] == {"out_of_range": 1}
+    assert Book.from_dict(rows[0]).version == 7
+
+def test_rows_missing_required_fields_are_dropped():
+    rows, report = clean(record(), record(book_id="b2", title="N/A"), record(book_id="b3", author=None))
+
+    assert [r["book_id"] for r in rows] == ["b1"]
+    assert (report.rows_in, report.rows_out, report.rows_dropped) == (3, 1, 2)
+    assert report.rejections["title"] == {"missing": 1}
+    assert report.rejections["author"] == {"missing": 1}
+
+def test_clean_file_streams_in_chunks(tmp_path):
+    with open(Path(__file__).parents[2] / "books_dirty.json", "r", encoding="utf-8") as f:
+        dirty = json.load(f)
+    src = tmp_path / "dirty.json"
+    src.write_text(json.dumps(dirty, indent=2), encoding="utf-8")
+    dest = tmp_path / "clean.json"
+
+    report = BookCleaningService().clean_file(str(src), str(dest), chunk_size=64)
+    _, whole = clean(*dirty)
+
+    books = [Book.from_dict(d) for d in json.loads(dest.read_text(encoding="utf-8"))]
+    assert len(books) == report.rows_out == whole.rows_out
+    assert report.rejections == whole.rejections
+    assert all(b.price_usd is None or b.price_usd >= 0 for b in books)
+    assert all(isinstance(b.publication_year, (int, type(None))) for b in books)
+    assert {b.language for b in books} <= {"English", "French", "Spanish", "German"}
@@ -0,0 +1,99 @@
+import math
+from src.services.book_frame import BookFrame
+from src.services.book_service import BookService
+from src.services.checkout_service import CheckoutService
+from src.services.book_analytics_service import BookAnalyticsService
+from tests.mocks.mock_book_repository import MockBookRepo
+from tests.mocks.mock_checkout_history_repository import MockCheckoutHistoryRepo
+from src.domain.book import Book
+
+
+def test_from_books_builds_typed_columns():
+    frame = BookFrame.from_books([
+        Book(title="A", author="X", genre="Fantasy", price_usd=10.0, in_print=True),
+        Book(title="B", author="Y", genre=None, price_usd=None),
+    ])
+
+    assert len(frame) == 2
+    assert frame.column("price_usd")[0] == 10.0
+    assert math.isnan(frame.column("price_usd")[1])
+    assert frame.column("genre").tolist() == [0, -1]
+    assert frame.categories["genre"] == ["Fantasy"]
+    assert frame.column("in_print").tolist() == [1, -1]
+
+def test_frame_follows_service_mutations():
+    repo = MockBookRepo()
+    book_svc = BookService(repo)
+    checkout_svc = CheckoutService(repo, MockCheckoutHistoryRepo())
+    frame = BookFrame.from_books([])
+    book_svc.subscribe(frame)
+    checkout_svc.subscribe(frame)
+
+    books = [Book(title=f"Book {i}", author="A", price_usd=float(i + 1)) for i in range(3)]
+    for b in books:
+        book_svc.add_book(b)
+    book_svc.delete_book(books[0].book_id)
+    checkout_svc.check_out(books[2].book_id)
+
+    assert sorted(frame.book_ids) == sorted([books[1].book_id, books[2].book_id])
+    assert BookAnalyticsService().average_price(frame) == 2.5
+    row = frame.book_ids.index(books[2].book_id)
+    assert frame.column("available")[row] == 0
+
+def test_analytics_accepts_frame_or_list():
+    books = [
+        Book(title="A", author="X", genre="Fantasy", average_rating=4.0, ratings_count=10, price_usd=5.0),
+        Book(title="B", author="Y", genre="Mystery", average_rating=3.0, ratings_count=20, price_usd=15.0),
+        Book(title="C", author="Z", genre="Fantasy", average_rating=2.0, ratings_count=30, price_usd=25.0),
+    ]
+    svc = BookAnalyticsService()
+    frame = BookFrame.from_books(books)
+
+    assert svc.median_price_by_genre(frame) == svc.median_price_by_genre(books) == {"Fantasy": 15.0, "Mystery": 15.0}
+    assert svc.genre_counts(frame) == {"Fantasy": 2, "Mystery": 1}
+    assert [b.title for b in svc.top_rated(frame, min_ratings=15)] == ["B", "C"]
+
+def test_frame_over_binary_catalog_copies_on_first_write(tmp_path):
+    from src.repositories.binary_catalog import BinaryCatalog, write_binary_catalog
+
+    books = [
+        Book(title="A", author="X", genre="Fantasy", price_usd=10.0, last_checkout="2024-03-01"),
+        Book(title="B", author="Y", genre="Horror", price_usd=20.0),
+    ]
+    path = str(tmp_path / "books.bin")
+    write_binary_catalog(path, books)
+    catalog = BinaryCatalog(path)
+    frame = BookFrame.from_binary_catalog(catalog)
+
+    assert not frame.column("price_usd").flags.writeable
+    assert BookAnalyticsService().average_price(frame) == 15.0
+    assert str(frame.column("last_checkout")[0]) == "2024-03-01T00:00:00.000000"
+    assert frame.book_ids == [b.book_id for b in books]
+    assert frame.book_at(1) == books[1]
+
+    frame.remove(books[0].book_id)
+    frame.upsert(Book(title="C", author="Z", genre="Fantasy", price_usd=30.0))
+    assert frame.column("price_usd").tolist() == [20.0, 30.0]
+    assert frame.labels("genre")[frame.column("genre")].tolist() == ["Horror", "Fantasy"]
+
+def test_last_checkout_keeps_wall_clock_time_and_skips_bad_values(tmp_path):
+    import warnings
+    from src.repositories.binary_catalog import BinaryCatalog, write_binary_catalog
+
+    books = [
+        Book(title="A", author="X", genre="Fantasy", last_checkout="2026-12-31T23:30:00-05:00"),
+        Book(title="B", author="Y", genre="Horror", last_checkout="2026-01-01T00:30:00+02:00"),
+        Book(title="C", author="Z", genre="Horror", last_checkout="last tuesday"),
+    ]
+    path = str(tmp_path / "books.bin")
+    write_binary_catalog(path, books)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        frames = [BookFrame.from_books(books), BookFrame.from_binary_catalog(BinaryCatalog(path))]
+    for frame in frames:
+        assert [str(t) for t in frame.column("last_checkout")] == [
+            "2026-12-31T23:30:00.000000", "2026-01-01T00:30:00.000000", "NaT",
+        ]
+        # both checkouts are in 2026 where they happened, not in UTC
+        assert BookAnalyticsService().median_genre_current_year(frame) == "Fantasy"
@@ -0,0 +1,43 @@
+import json
+import uuid
+from datetime import datetime
+import pytest
+from src.domain.book import Book
+from src.repositories.binary_catalog import BinaryCatalog
+from src.services.book_generator_service_V2 import GENRES, generate_books_json
+
+NOW = datetime(2025, 6, 1, 12, 0, 0)
+
+
+def generate(path, **kwargs):
+    kwargs = {"count": 250, "seed": 7, "chunk_size": 100, "now": NOW, **kwargs}
+    generate_books_json(str(path), **kwargs)
+    return path
+
+def test_seeded_runs_are_identical_and_ids_are_uuid4(tmp_path):
+    first = generate(tmp_path / "a.json").read_bytes()
+    second = generate(tmp_path / "b.json").read_bytes()
+    assert first == second
+
+    books = json.loads(first)
+    assert len(books) == 250
+    assert len({b["book_id"] for b in books}) == 250
+    assert all(uuid.UUID(b["book_id"]).version == 4 for b in books)
+    assert [b["title"] for b in books[99:101]] == ["Book Title 100", "Book Title 101"]
+    assert {b["genre"] for b in books} <= set(GENRES)
+    assert all(1.0 <= b["average_rating"] <= 5.0 for b in books)
+    assert all(isinstance(b["in_print"], bool) for b in books)
+    Book.from_dict(books[0])
+
+def test_formats_hold_the_same_books(tmp_path):
+    books = json.loads(generate(tmp_path / "books.json").read_text(encoding="utf-8"))
+    lines = generate(tmp_path / "books.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == books
+
+    with BinaryCatalog(str(generate(tmp_path / "books.bin"))) as catalog:
+        stored = [b.to_dict() for b in catalog.iter_books()]
+    assert [{k: b[k] for k in books[0]} for b in stored] == books
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        generate(tmp_path / "books.json", format="xml")
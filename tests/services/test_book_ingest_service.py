@@ -0,0 +1,88 @@
+import io
+import json
+import pytest
+from src.domain.book import Book
+from src.repositories.cached_book_repository import CachedBookRepository
+from src.repositories.json_stream import iter_json_array_texts, iter_jsonl_texts
+from src.services.book_ingest_service import BookIngestService
+from tests.mocks.mock_book_repository import MockBookRepo
+
+
+def raw_records(count):
+    return [
+        {"book_id": f"id-{i}", "title": f"Title {i}", "author": "Author", "price_usd": str(i), "language": "eng"}
+        for i in range(count)
+    ]
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1024])
+def test_text_splitters_cut_between_whole_records(chunk_size):
+    records = raw_records(20) + [{"book_id": "tricky", "title": 'a "},{" b \\', "author": "x"}]
+
+    texts = list(iter_json_array_texts(io.StringIO(json.dumps(records, indent=2)), chunk_size))
+    assert [r for t in texts for r in json.loads(t)] == records
+
+    jsonl = "\n".join(json.dumps(r) for r in records)  # no trailing newline
+    texts = list(iter_jsonl_texts(io.StringIO(jsonl), chunk_size))
+    assert [json.loads(line) for t in texts for line in t.splitlines()] == records
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("suffix", [".json", ".jsonl"])
+def test_ingest_cleans_dedupes_and_adds_in_one_batch(tmp_path, workers, suffix):
+    records = raw_records(50)
+    records.append(dict(records[3], title="Duplicate"))
+    records.append({"book_id": "no-title", "title": "N/A", "author": "A"})
+    path = tmp_path / f"dump{suffix}"
+    if suffix == ".json":
+        path.write_text(json.dumps(records), encoding="utf-8")
+    else:
+        path.write_text("".join(json.dumps(r) + "\n" for r in records), encoding="utf-8")
+    repo = MockBookRepo()
+    repo.add_book(Book(title="Stored", author="A", book_id="id-0"))
+    version = repo.catalog_version()
+
+    report = BookIngestService(repo, workers=workers, chunk_size=512).ingest_file(str(path))
+
+    assert repo.catalog_version() == version + 1
+    assert report.records_in == 52
+    assert report.cleaning.rows_dropped == 1
+    assert report.duplicates == 1
+    assert report.already_stored == 1
+    assert report.books_added == 49
+    book = repo.get_book_by_id("id-3")
+    assert book.title == "Title 3"
+    assert book.price_usd == 3.0
+    assert book.language == "English"
+    assert repo.get_book_by_id("id-0").title == "Stored"
+
+def test_ingest_into_json_catalog(tmp_path):
+    src = tmp_path / "dump.jsonl"
+    src.write_text("".join(json.dumps(r) + "\n" for r in raw_records(10)), encoding="utf-8")
+    repo = CachedBookRepository(str(tmp_path / "books.json"))
+
+    BookIngestService(repo, workers=1).ingest_file(str(src))
+
+    assert len(CachedBookRepository(repo.filepath).get_all_books()) == 10
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("suffix", [".json", ".jsonl"])
+def test_malformed_records_are_rejected_without_aborting_the_ingest(tmp_path, workers, suffix):
+    texts = [json.dumps(r) for r in raw_records(30)]
+    texts[4] = '{"book_id": "bad", "title": }'
+    texts[11] = '["not", "an", "object"]'
+    texts[20] = '{"book_id": "unquoted", "title": x}'
+    path = tmp_path / f"dump{suffix}"
+    if suffix == ".json":
+        path.write_text("[" + ",\n".join(texts) + "]", encoding="utf-8")
+    else:
+        path.write_text("".join(t + "\n" for t in texts), encoding="utf-8")
+    repo = MockBookRepo()
+
+    report = BookIngestService(repo, workers=workers, chunk_size=256).ingest_file(str(path))
+
+    assert report.records_in == 30
+    assert report.cleaning.rejections["record"]["malformed"] == 3
+    assert report.cleaning.rows_dropped == 3
+    assert report.books_added == 27
+    assert repo.get_book_by_id("id-5").title == "Title 5"
+    assert repo.get_book_by_id("id-4") is None
+    assert "record: malformed=3" in report.summary()
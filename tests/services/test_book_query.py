@@ -0,0 +1,73 @@
+import pytest
+from src.services.book_query import BookIndexes, BookQuery, QueryPlanner
+from src.services.book_service import BookService
+from tests.mocks.mock_book_repository import MockBookRepo
+from src.domain.book import Book
+
+
+def make_books():
+    return [
+        Book(title="A", author="X", genre="Fantasy", publication_year=1990, price_usd=10.0, available=True),
+        Book(title="B", author="Y", genre="Fantasy", publication_year=2005, price_usd=25.0, available=False),
+        Book(title="C", author="X", genre="Mystery", publication_year=2010, price_usd=5.0, available=True),
+        Book(title="D", author="Z", genre="Fantasy", publication_year=2020, price_usd=None, available=True),
+    ]
+
+def make_services():
+    books = make_books()
+    scan_svc = BookService(MockBookRepo())
+    for b in books:
+        scan_svc.add_book(b)
+    indexes = BookIndexes.from_books(books)
+    indexed_svc = BookService(scan_svc.repo, QueryPlanner(indexes))
+    indexed_svc.subscribe(indexes)
+    return scan_svc, indexed_svc
+
+@pytest.mark.parametrize("filters, expected", [
+    ({"genre": "Fantasy"}, ["A", "B", "D"]),
+    ({"genre": "Fantasy", "min_year": 2000}, ["B", "D"]),
+    ({"author": "X", "max_price": 8}, ["C"]),
+    ({"min_price": 5, "max_price": 10}, ["A", "C"]),
+    ({"available": True, "sort_by": "price_usd"}, ["C", "A", "D"]),
+    ({"sort_by": "publication_year", "descending": True, "limit": 2}, ["D", "C"]),
+    ({"genre": "Horror"}, []),
+])
+def test_index_and_scan_paths_agree(filters, expected):
+    scan_svc, indexed_svc = make_services()
+
+    scan = [b.title for b in scan_svc.query(**filters)]
+    indexed = [b.title for b in indexed_svc.query(**filters)]
+    if "sort_by" not in filters:
+        scan, indexed = sorted(scan), sorted(indexed)
+    assert scan == indexed == expected
+
+def test_explain_reports_pushdown():
+    indexes = BookIndexes.from_books(make_books())
+
+    assert QueryPlanner().explain(BookQuery(genre="Fantasy")) == "column scan"
+    assert QueryPlanner(indexes).explain(BookQuery(genre="Fantasy", min_year=2000)) == "index genre, publication_year"
+
+def test_indexes_follow_updates():
+    _, svc = make_services()
+    book = svc.query(genre="Mystery")[0]
+    book.genre = "Fantasy"
+    svc.update_book(book)
+
+    assert svc.query(genre="Mystery") == []
+    assert "C" in [b.title for b in svc.query(genre="Fantasy", max_year=2010)]
+    assert "Mystery" not in svc.query_planner.indexes.equality["genre"]
+
+def test_bulk_build_matches_incremental_build():
+    books = make_books()
+    books.append(Book(title="A2", author="W", genre="Mystery", publication_year=1800, book_id=books[0].book_id))
+    bulk = BookIndexes.from_books(books)
+    incremental = BookIndexes()
+    for b in books:
+        incremental.book_added(b)
+
+    assert bulk.books == incremental.books
+    assert bulk.equality == incremental.equality
+    for field, index in bulk.ranges.items():
+        assert index._entries == incremental.ranges[field]._entries
+    bulk.book_deleted(books[1].book_id)
+    assert bulk.ranges["publication_year"].between(None, None) == {books[2].book_id, books[3].book_id, books[4].book_id}
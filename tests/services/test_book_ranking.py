@@ -0,0 +1,41 @@
+from src.services.book_ranking import BookRanking, rating_score
+from src.services.book_analytics_service import BookAnalyticsService
+from src.services.book_service import BookService
+from tests.mocks.mock_book_repository import MockBookRepo
+from src.domain.book import Book
+
+
+def make_books():
+    return [
+        Book(title=f"Book {i}", author="A", average_rating=r, ratings_count=c, price_usd=10.0)
+        for i, (r, c) in enumerate([(4.5, 2000), (4.9, 10), (3.1, 5000), (4.0, 1500), (None, 9000)])
+    ]
+
+def test_ranking_matches_top_rated():
+    books = make_books()
+    ranking = BookRanking.from_books(books, rating_score(1000))
+
+    expected = BookAnalyticsService().top_rated(books, min_ratings=1000, limit=2)
+    assert [b.title for b in ranking.top(2)] == [b.title for b in expected] == ["Book 0", "Book 3"]
+
+def test_ranking_follows_updates():
+    svc = BookService(MockBookRepo())
+    ranking = BookRanking.from_books([], rating_score(1000))
+    svc.subscribe(ranking)
+
+    books = make_books()
+    for b in books:
+        svc.add_book(b)
+    books[2].average_rating = 5.0
+    svc.update_book(books[2])
+    svc.delete_book(books[0].book_id)
+
+    assert [b.title for b in ranking.top(3)] == ["Book 2", "Book 3"]
+
+def test_top_value_scores_matches_full_sort():
+    books = make_books()
+    svc = BookAnalyticsService()
+
+    scores = svc.value_scores(books)
+    expected = sorted(scores, key=scores.get, reverse=True)[:2]
+    assert list(svc.top_value_scores(books, limit=2)) == expected
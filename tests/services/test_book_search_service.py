@@ -0,0 +1,57 @@
+from src.services.book_search_service import BookSearchIndex, tokenize
+from src.services.book_service import BookService
+from tests.mocks.mock_book_repository import MockBookRepo
+from src.domain.book import Book
+
+
+def make_books():
+    return [
+        Book(title="The Left Hand of Darkness", author="Ursula K. Le Guin", publisher="Ace"),
+        Book(title="A Wizard of Earthsea", author="Ursula K. Le Guin", publisher="Parnassus"),
+        Book(title="Darkness at Noon", author="Arthur Koestler", publisher="Macmillan"),
+    ]
+
+def test_tokenize_is_case_insensitive():
+    assert tokenize("The LEFT-Hand") == ["the", "left", "hand"]
+
+def test_token_and_prefix_search():
+    books = make_books()
+    index = BookSearchIndex.from_books(books)
+
+    assert index.search("darkness") == [books[2].book_id, books[0].book_id]
+    assert index.search("wiz earth") == [books[1].book_id]
+    assert set(index.search("ursula")) == {books[0].book_id, books[1].book_id}
+    assert index.search("darkness", prefix=False) == index.search("darkness")
+    assert index.search("dark", prefix=False) == []
+    assert index.search("nothing here") == []
+
+def test_title_prefix_ranks_first():
+    books = make_books()
+    index = BookSearchIndex.from_books(books)
+
+    assert index.search("darkness at")[0] == books[2].book_id
+
+def test_index_follows_service_writes():
+    svc = BookService(MockBookRepo())
+    index = BookSearchIndex()
+    svc.subscribe(index)
+
+    book = Book(title="Old Name", author="A")
+    svc.add_book(book)
+    book.title = "New Name"
+    svc.update_book(book)
+
+    assert index.search("old") == []
+    assert index.search("new") == [book.book_id]
+    svc.delete_book(book.book_id)
+    assert index.search("name") == []
+
+def test_save_and_load_checks_version(tmp_path):
+    books = make_books()
+    path = str(tmp_path / "index.json")
+    BookSearchIndex.from_books(books).save(path, (1, 2))
+
+    assert BookSearchIndex.load(path, (1, 3)) is None
+    loaded = BookSearchIndex.load(path, (1, 2))
+    assert loaded.search("koestler") == [books[2].book_id]
+    assert BookSearchIndex.load(str(tmp_path / "missing.json"), (1, 2)) is None
@@ -16,6 +16,25 @@ def test_add_book_creates_book():
     assert books[0].book_id == book_id
     assert books[0].title == "New Book"
 
+def test_add_books_notifies_listeners_for_added_books_only():
+    class Recorder:
+        def __init__(self):
+            self.added = []
+
+        def book_added(self, book):
+            self.added.append(book.book_id)
+
+    repo = MockBookRepo()
+    repo.add_book(Book(title="Old", author="A", book_id="a"))
+    svc = BookService(repo)
+    recorder = Recorder()
+    svc.subscribe(recorder)
+
+    added = svc.add_books([Book(title="A", author="A", book_id="a"), Book(title="B", author="B", book_id="b")])
+
+    assert added == ["b"]
+    assert recorder.added == ["b"]
+
 def test_find_book_by_name_positive():
     repo = MockBookRepo()
     svc = BookService(repo)
@@ -76,3 +95,12 @@ def test_delete_nonexistent_book_returns_false():
 
     result = svc.delete_book("fake_id")
     assert result is False
+
+def test_get_book_by_id():
+    repo = MockBookRepo()
+    svc = BookService(repo)
+
+    book_id = svc.add_book(Book(title="Keyed", author="Author D"))
+
+    assert svc.get_book_by_id(book_id).title == "Keyed"
+    assert svc.get_book_by_id("missing") is None
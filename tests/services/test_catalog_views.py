@@ -0,0 +1,58 @@
+from src.repositories.cached_book_repository import CachedBookRepository
+from src.services.book_query import BookIndexes, QueryPlanner
+from src.services.book_service import BookService
+from src.services.catalog_views import CatalogViews
+from src.services.running_aggregates import RunningAggregates
+from tests.mocks.mock_book_repository import MockBookRepo
+from src.domain.book import Book
+
+
+def make_views():
+    svc = BookService(MockBookRepo())
+    svc.add_book(Book(title="A", author="X", price_usd=10.0))
+    views = CatalogViews(svc)
+    views.register("aggregates", lambda version: RunningAggregates.from_books(svc.iter_books()))
+    svc.subscribe(views)
+    return views, svc
+
+def test_own_writes_are_forwarded_without_a_rebuild():
+    views, svc = make_views()
+    assert views.get("aggregates").average_price() == 10.0
+
+    views.sync()
+    svc.add_book(Book(title="B", author="Y", price_usd=20.0))
+
+    assert views.get("aggregates").average_price() == 15.0
+    assert views.rebuilds == 1
+    assert views.version == svc.catalog_version()
+
+def test_external_writes_trigger_a_rebuild():
+    views, svc = make_views()
+    first = views.get("aggregates")
+
+    # another process writing the same store: no event reaches the views
+    svc.repo.add_book(Book(title="B", author="Y", price_usd=20.0))
+
+    rebuilt = views.get("aggregates")
+    assert rebuilt is not first
+    assert rebuilt.average_price() == 15.0
+    assert views.rebuilds == 2
+
+def test_query_indexes_follow_another_process(tmp_path):
+    path = str(tmp_path / "books.json")
+    svc = BookService(CachedBookRepository(path), QueryPlanner())
+    svc.add_book(Book(title="A", author="X", genre="Fantasy"))
+    views = CatalogViews(svc)
+
+    def build(version):
+        svc.query_planner.indexes = BookIndexes.from_books(svc.iter_books())
+        return svc.query_planner.indexes
+
+    views.register("indexes", build)
+    svc.subscribe(views)
+    views.sync()
+    svc.add_book(Book(title="B", author="Y", genre="Fantasy"))
+    CachedBookRepository(path).add_book(Book(title="C", author="Z", genre="Fantasy"))
+
+    views.get("indexes")
+    assert sorted(b.title for b in svc.query(genre="Fantasy")) == ["A", "B", "C"]
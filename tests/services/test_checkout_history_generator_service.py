@@ -0,0 +1,62 @@
+from collections import Counter
+from datetime import datetime
+import numpy as np
+from src.domain.book import Book
+from src.services.checkout_history_generator_service import (
+    generate_checkout_history,
+    lognormal_loan_days,
+    simulate_loans,
+)
+from tests.mocks.mock_book_repository import MockBookRepo
+from tests.mocks.mock_checkout_history_repository import MockCheckoutHistoryRepo
+
+END = datetime(2025, 6, 1)
+
+
+def make_repos(count=200):
+    book_repo = MockBookRepo()
+    for i in range(count):
+        book_repo.add_book(Book(title=f"T{i}", author="A", genre=["Fantasy", "History"][i % 2], book_id=f"b{i}"))
+    return book_repo, MockCheckoutHistoryRepo()
+
+def test_history_pairs_events_and_matches_book_state():
+    book_repo, history_repo = make_repos()
+
+    count = generate_checkout_history(book_repo, history_repo, days=180, end=END, seed=1, chunk_size=500)
+
+    events = history_repo.get_history_all()
+    assert count == len(events) > 0
+    times = [e.checkout_date or e.return_date for e in events]
+    assert times == sorted(times) and times[-1] < END
+    for book in book_repo.get_all_books():
+        history = history_repo.get_history_for_book(book.book_id)
+        # strictly alternating checkout / return, starting with a checkout
+        assert [e.returned for e in history] == [i % 2 == 1 for i in range(len(history))]
+        out = bool(history) and not history[-1].returned
+        assert book.available is not out
+        if history:
+            last = [e for e in history if not e.returned][-1]
+            assert book.last_checkout == last.checkout_date.isoformat()
+            assert book.version == 1
+
+def test_seeded_runs_repeat():
+    runs = []
+    for _ in range(2):
+        book_repo, history_repo = make_repos(50)
+        generate_checkout_history(book_repo, history_repo, days=90, end=END, seed=7)
+        runs.append(history_repo.get_history_all())
+    assert runs[0] == runs[1]
+
+def test_genre_skew_seasonality_and_loan_length():
+    genres = ["Fantasy", "History"] * 2000
+    books, checkouts, returns = simulate_loans(
+        genres, datetime(2024, 1, 1), datetime(2025, 1, 1), np.random.default_rng(3),
+        loan_days=lognormal_loan_days(median_days=7, sigma=0.1, max_days=30),
+    )
+
+    per_genre = Counter(genres[i] for i in books.tolist())
+    assert per_genre["Fantasy"] > 2 * per_genre["History"]
+    hours = (checkouts // 3_600_000_000) % 24
+    assert (hours < 6).mean() < 0.02
+    days = (returns - checkouts) / 86_400_000_000
+    assert 6 < np.median(days) < 8 and days.max() <= 30
@@ -79,3 +79,79 @@ def test_get_history_all_books():
     all_events = svc.get_history_all()
     assert len(all_events) == 2
     assert all(e.book_id in [book1.book_id, book2.book_id] for e in all_events)
+
+def test_check_out_unknown_book_raises():
+    svc = CheckoutService(MockBookRepo(), MockCheckoutHistoryRepo())
+
+    with pytest.raises(ValueError) as e:
+        svc.check_out("missing")
+    assert str(e.value) == "Book missing not found."
+
+def test_check_out_many_and_check_in_many():
+    book_repo = MockBookRepo()
+    history_repo = MockCheckoutHistoryRepo()
+    svc = CheckoutService(book_repo, history_repo)
+
+    books = [Book(title=f"Book {i}", author="Author") for i in range(3)]
+    for b in books:
+        book_repo.add_book(b)
+    ids = [b.book_id for b in books]
+
+    svc.check_out_many(ids)
+    assert all(b.available is False for b in book_repo.get_all_books())
+    events = history_repo.get_history_all()
+    assert len(events) == 3
+    assert {b.last_checkout for b in book_repo.get_all_books()} == {events[0].checkout_date.isoformat()}
+
+    svc.check_in_many(ids)
+    assert all(b.available is True for b in book_repo.get_all_books())
+    assert sum(e.returned for e in history_repo.get_history_all()) == 3
+
+def test_check_out_many_is_all_or_nothing():
+    book_repo = MockBookRepo()
+    history_repo = MockCheckoutHistoryRepo()
+    svc = CheckoutService(book_repo, history_repo)
+
+    free = Book(title="Free", author="A")
+    taken = Book(title="Taken", author="B", available=False)
+    book_repo.add_book(free)
+    book_repo.add_book(taken)
+
+    with pytest.raises(ValueError):
+        svc.check_out_many([free.book_id, taken.book_id])
+    with pytest.raises(ValueError):
+        svc.check_out_many([free.book_id, "missing"])
+
+    assert book_repo.get_book_by_id(free.book_id).available is True
+    assert history_repo.get_history_all() == []
+
+class DeletedAfterReadRepo(MockBookRepo):
+    """Hands out books, then loses them before the update (a concurrent delete)."""
+
+    def get_book_by_id(self, book_id):
+        book = super().get_book_by_id(book_id)
+        self.delete_book(book_id)
+        return book
+
+    def get_books_by_ids(self, book_ids):
+        found = super().get_books_by_ids(book_ids)
+        self.delete_book(book_ids[-1])
+        return found
+
+def test_checkout_of_a_book_deleted_meanwhile_raises_before_notifying():
+    book_repo = DeletedAfterReadRepo()
+    history_repo = MockCheckoutHistoryRepo()
+    svc = CheckoutService(book_repo, history_repo)
+    updated = []
+    svc.subscribe(type("Listener", (), {"book_updated": lambda self, b: updated.append(b)})())
+    books = [Book(title="A", author="X"), Book(title="B", author="Y")]
+    for b in books:
+        book_repo.add_book(b)
+
+    with pytest.raises(ValueError, match=books[0].book_id):
+        svc.check_out(books[0].book_id)
+    with pytest.raises(ValueError, match=books[1].book_id):
+        svc.check_out_many([b.book_id for b in books[1:]])
+
+    assert updated == []
+    assert history_repo.get_history_all() == []
@@ -0,0 +1,32 @@
+from src.services.fuzzy_search_service import TrigramIndex, trigrams
+from src.domain.book import Book
+
+
+def make_books():
+    return [
+        Book(title="Dune", author="Frank Herbert"),
+        Book(title="Neuromancer", author="William Gibson"),
+        Book(title="Foundation", author="Isaac Asimov"),
+    ]
+
+def test_trigrams_pad_words():
+    assert trigrams("Ab") == {"  a", " ab", "ab "}
+
+def test_typo_finds_title_and_author():
+    books = make_books()
+    index = TrigramIndex.from_books(books)
+
+    assert index.search("Nueromancer")[0][0] == books[1].book_id
+    assert index.search("Isac Asimow")[0][0] == books[2].book_id
+    assert index.search("zzzz") == []
+
+def test_exact_match_scores_one_and_removal():
+    books = make_books()
+    index = TrigramIndex.from_books(books)
+
+    book_id, score = index.search("Foundation")[0]
+    assert book_id == books[2].book_id
+    assert score == 1.0
+
+    index.book_deleted(books[2].book_id)
+    assert all(b != books[2].book_id for b, _ in index.search("Foundation"))
@@ -0,0 +1,38 @@
+import pytest
+from src.services.book_frame import BookFrame
+from src.services.grouped_aggregation import group_aggregate
+from src.domain.book import Book
+
+
+def make_frame():
+    return BookFrame.from_books([
+        Book(title="A", author="X", genre="Mystery", format="Ebook", price_usd=4.0),
+        Book(title="B", author="X", genre="Fantasy", format="Ebook", price_usd=10.0),
+        Book(title="C", author="X", genre="Fantasy", format="Paperback", price_usd=2.0),
+        Book(title="D", author="X", genre="Fantasy", format="Ebook", price_usd=6.0),
+        Book(title="E", author="X", genre="Fantasy", format="Ebook", price_usd=None),
+        Book(title="F", author="X", genre=None, format="Ebook", price_usd=1.0),
+    ])
+
+def test_single_key_all_aggregations():
+    stats = group_aggregate(make_frame(), "genre", "price_usd", ["count", "sum", "mean", "median", "min", "max"])
+
+    assert list(stats) == ["Fantasy", "Mystery"]
+    assert stats["Fantasy"] == {"count": 3, "sum": 18.0, "mean": 6.0, "median": 6.0, "min": 2.0, "max": 10.0}
+    assert stats["Mystery"]["median"] == 4.0
+
+def test_multiple_keys():
+    stats = group_aggregate(make_frame(), ["genre", "format"], "price_usd", ["median"])
+
+    assert stats == {
+        ("Fantasy", "Ebook"): {"median": 8.0},
+        ("Fantasy", "Paperback"): {"median": 2.0},
+        ("Mystery", "Ebook"): {"median": 4.0},
+    }
+
+def test_row_counts_without_field():
+    assert group_aggregate(make_frame(), "genre") == {"Fantasy": {"count": 4}, "Mystery": {"count": 1}}
+
+def test_unknown_aggregation_raises():
+    with pytest.raises(ValueError):
+        group_aggregate(make_frame(), "genre", "price_usd", ["mode"])
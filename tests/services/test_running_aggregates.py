@@ -0,0 +1,58 @@
+import pytest
+from src.services.running_aggregates import RunningAggregates, HistogramSketch
+from src.services.book_analytics_service import BookAnalyticsService
+from src.services.book_service import BookService
+from src.services.checkout_service import CheckoutService
+from tests.mocks.mock_book_repository import MockBookRepo
+from tests.mocks.mock_checkout_history_repository import MockCheckoutHistoryRepo
+from src.domain.book import Book
+
+
+def make_books():
+    return [
+        Book(title="A", author="X", genre="Fantasy", price_usd=10.0, average_rating=4.0),
+        Book(title="B", author="X", genre="Mystery", price_usd=20.0, average_rating=3.0),
+        Book(title="C", author="X", genre="Fantasy", price_usd=None, average_rating=2.0),
+    ]
+
+def test_matches_batch_analytics():
+    books = make_books()
+    aggregates = RunningAggregates.from_books(books)
+    analytics = BookAnalyticsService()
+
+    assert aggregates.average_price() == analytics.average_price(books)
+    assert aggregates.genre_counts() == analytics.genre_counts(books)
+    assert aggregates.mean_rating_by_genre() == analytics.mean_rating_by_genre(books)
+
+def test_follows_book_and_checkout_events():
+    repo = MockBookRepo()
+    book_svc = BookService(repo)
+    checkout_svc = CheckoutService(repo, MockCheckoutHistoryRepo())
+    aggregates = RunningAggregates()
+    book_svc.subscribe(aggregates)
+    checkout_svc.subscribe(aggregates)
+
+    books = make_books()
+    for b in books:
+        book_svc.add_book(b)
+    books[1].genre = "Fantasy"
+    book_svc.update_book(books[1])
+    book_svc.delete_book(books[0].book_id)
+    checkout_svc.check_out(books[2].book_id)
+
+    assert aggregates.average_price() == 20.0
+    assert aggregates.genre_counts() == {"Fantasy": 2}
+    assert aggregates.mean_rating_by_genre() == {"Fantasy": 2.5}
+    assert aggregates.availability_counts() == {"available": 1, "checked_out": 1}
+
+def test_histogram_sketch_median_is_close():
+    sketch = HistogramSketch(0.0, 100.0, bins=1000)
+    for v in range(1, 100):
+        sketch.add(float(v))
+    sketch.remove(99.0)
+
+    assert sketch.quantile(0.5) == pytest.approx(49.5, abs=0.5)
+
+def test_median_requires_sketch():
+    with pytest.raises(ValueError):
+        RunningAggregates().approx_median_price_by_genre()